@@ -0,0 +1,23 @@
+#!/usr/bin/env python
+# -*- mode: python; coding: utf-8; fill-column: 80; -*-
+#
+# __main__.py
+# Copyright (c) 2026 The attmon contributors.
+#
+
+"""
+__main__.py
+Run the command-line interface (see `cli`) as `python -m attmon`.
+"""
+
+__author__  = 'The attmon contributors'
+__version__ = '1.0'
+__license__ = 'MIT'
+
+
+from . import cli
+import sys
+
+
+if __name__ == '__main__':
+    sys.exit(cli.main())
@@ -0,0 +1,158 @@
+#!/usr/bin/env python
+# -*- mode: python; coding: utf-8; fill-column: 80; -*-
+#
+# archive.py
+# Copyright (c) 2026 The attmon contributors.
+#
+
+"""
+archive.py
+Archive of snapshots packed into a single file: each snapshot (or only its table
+of values) is compressed separately and appended to the archive, identical
+snapshots share the same compressed data, and an index maps the name of each
+snapshot to the offset and length of its data.
+"""
+
+__author__  = 'The attmon contributors'
+__version__ = '1.0'
+__license__ = 'MIT'
+
+
+from . import constants as const
+from . import dedup
+from . import utils
+import io
+import os
+import zlib
+
+
+# Extension of the index of an archive.
+INDEX_EXT = '.idx'
+
+# Level of compression of the snapshots.
+COMPRESS_LEVEL = 9
+
+
+def is_archive(path):
+    """Check if the path is an archive.
+    """
+    return os.path.isfile(path) and os.path.isfile(path + INDEX_EXT)
+
+
+class Archive(object):
+    """Snapshots, by name, packed into a single file.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        # Snapshot names, in the order in which they were added, and the hash
+        #  of the content of each.
+        self.names = []
+        self.digests = {}
+        # Offset and length of the compressed content, by hash.
+        self.blobs = {}
+        self.fd = None
+
+        if not is_archive(path):
+            io.open(path, 'ab').close()
+            io.open(path + INDEX_EXT, 'a').close()
+
+        for line in utils.f_rd(path + INDEX_EXT):
+            name, dig, off, size = line.rstrip(const.NEWLINE).split(const.TAB)
+            self._index(name, dig, int(off), int(size))
+
+    def _index(self, name, dig, off, size):
+        if name not in self.digests:
+            self.names.append(name)
+        self.digests[name] = dig
+        self.blobs[dig] = (off, size)
+
+    def __contains__(self, name):
+        return name in self.digests
+
+    def __len__(self):
+        return len(self.names)
+
+    def add(self, name, page, table=None):
+        """Add the snapshot, or only its table of values if `table` is given;
+        return the hash of the content, and whether the content was new to the
+        archive.
+        """
+        content = dedup.extract(page, table) if table else page
+        dig = dedup.digest(content)
+
+        is_new = dig not in self.blobs
+        if is_new:
+            data = zlib.compress(content.encode('utf-8'), COMPRESS_LEVEL)
+            with io.open(self.path, 'ab') as f:
+                off = f.tell()
+                f.write(data)
+            size = len(data)
+        else:
+            off, size = self.blobs[dig]
+
+        with io.open(self.path + INDEX_EXT, 'a', encoding='utf-8') as f:
+            f.write(const.TAB.join((name, dig, str(off), str(size))) +
+                    const.NEWLINE)
+        self._index(name, dig, off, size)
+        return dig, is_new
+
+    def digest_of(self, name):
+        return self.digests[name]
+
+    def load(self, name):
+        """Load the content of the snapshot.
+        """
+        off, size = self.blobs[self.digests[name]]
+        if self.fd is None:
+            self.fd = os.open(self.path, os.O_RDONLY)
+        # Reads do not move the file offset, which is shared by processes
+        #  forked after the archive is opened.
+        data = os.pread(self.fd, size, off)
+        return zlib.decompress(data).decode('utf-8')
+
+    def close(self):
+        if self.fd is not None:
+            os.close(self.fd)
+            self.fd = None
+
+
+# Archives and stores opened by `open_container`, by path.
+_containers = {}
+
+
+def is_container(path):
+    """Check if the path is an archive or a store (see `dedup`) of snapshots.
+    """
+    return is_archive(path) or dedup.is_store(path)
+
+
+def open_container(path):
+    """Open an archive or a store, reusing the archive or store if it was opened
+    earlier.
+    """
+    if path not in _containers:
+        if is_archive(path):
+            _containers[path] = Archive(path)
+        elif dedup.is_store(path):
+            _containers[path] = dedup.Store(path)
+        else:
+            raise IOError("No such file or archive: %s" % (path))
+    return _containers[path]
+
+
+def load_member(fpath):
+    """Load a snapshot in an archive or a store, referred to by the path of the
+    archive or store and the name of the snapshot.
+    """
+    return open_container(os.path.dirname(fpath)).load(os.path.basename(fpath))
+
+
+def snapshot_digest(fpath):
+    """Return the hash of the snapshot's content, if it is in an archive or a
+    store, without reading the content.
+    """
+    in_path, name = os.path.split(fpath)
+    if is_container(in_path):
+        return open_container(in_path).digests.get(name)
+    return None
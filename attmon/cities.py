@@ -0,0 +1,105 @@
+#!/usr/bin/env python
+# -*- mode: python; coding: utf-8; fill-column: 80; -*-
+#
+# cities.py
+# Copyright (c) 2026 The attmon contributors.
+#
+
+"""
+cities.py
+Registry of cities: an integer ID for each city code, the (interned) codes, and
+case-insensitive maps from the aliases of a city (code, abbreviation, or name)
+to its code and ID.
+"""
+
+__author__  = 'The attmon contributors'
+__version__ = '1.0'
+__license__ = 'MIT'
+
+
+from itertools import chain
+import sys
+
+
+class Registry(object):
+    """Cities, given the mappings from (upper-case) abbreviations and names to
+    city codes; the ID of a city is the position of its code among the sorted
+    codes, as in a `dense.CityIndex`.
+
+    The registry unpacks as the two mappings, and so can be used wherever the
+    city data (see `utils.load_city_data`) is expected.
+    """
+
+    def __init__(self, abbrvs, cnames):
+        intern = sys.intern
+        self.abbrvs = {intern(a): intern(c) for a, c in abbrvs.items()}
+        self.cnames = {intern(n): intern(c) for n, c in cnames.items()}
+        self.codes = tuple(sorted(set(self.abbrvs.values()) |
+                                  set(self.cnames.values())))
+        self.ids = {c: i for i, c in enumerate(self.codes)}
+
+        # ID of each alias; a code takes precedence over an abbreviation, and
+        #  an abbreviation over a name.
+        self.aliases = {}
+        for alias, code in chain(((c, c) for c in self.codes),
+                                 self.abbrvs.items(), self.cnames.items()):
+            self.aliases.setdefault(alias, self.ids[code])
+
+        # Code of each abbreviation and name, as spelled in the pages; filled
+        #  as they are encountered, so that each spelling is upper-cased once.
+        self._abbrvs = dict(self.abbrvs)
+        self._cnames = dict(self.cnames)
+
+    def __iter__(self):
+        return iter((self.abbrvs, self.cnames))
+
+    def __len__(self):
+        return len(self.codes)
+
+    def __getstate__(self):
+        return (self.abbrvs, self.cnames)
+
+    def __setstate__(self, state):
+        self.__init__(*state)
+
+    def abbrv(self, s):
+        """Return the code of the city with abbreviation `s` (in any case).
+        """
+        try:
+            return self._abbrvs[s]
+        except KeyError:
+            code = self._abbrvs[s] = self.abbrvs[s.upper()]
+            return code
+
+    def city(self, s):
+        """Return the code of the city with name `s` (in any case).
+        """
+        try:
+            return self._cnames[s]
+        except KeyError:
+            code = self._cnames[s] = self.cnames[s.upper()]
+            return code
+
+    def lookup(self, alias):
+        """Return the ID of the city with code, abbreviation, or name `alias`
+        (in any case).
+        """
+        try:
+            return self.aliases[alias]
+        except KeyError:
+            cid = self.aliases[alias] = self.aliases[alias.upper()]
+            return cid
+
+    def code(self, cid):
+        """Return the code of the city with ID `cid`.
+        """
+        return self.codes[cid]
+
+
+def registry(city_data):
+    """Return the registry of the cities in the city data, which may already be
+    a registry.
+    """
+    if isinstance(city_data, Registry):
+        return city_data
+    return Registry(*city_data)
@@ -0,0 +1,738 @@
+#!/usr/bin/env python
+# -*- mode: python; coding: utf-8; fill-column: 80; -*-
+#
+# cli.py
+# Copyright (c) 2026 The attmon contributors.
+#
+
+"""
+cli.py
+Command-line interface of attmon, with a sub-command for each task: parse a
+snapshot, parse all snapshots in a directory (batch), merge the data of links,
+compute statistics of links, plot a snapshot, query a cube, and serve the most
+recent snapshots.
+
+Each sub-command imports only the modules it needs, when it runs; since shell
+loops invoke the tool once per file, the startup time often dominates the
+running time (see `ext/bench.py --startup-budget`).
+"""
+
+__author__  = 'The attmon contributors'
+__version__ = '1.0'
+__license__ = 'MIT'
+
+
+from . import profiling
+import argparse
+import os
+import sys
+
+
+# Sub-commands.
+PARSE = 'parse'
+BATCH = 'batch'
+MERGE = 'merge'
+STATS = 'stats'
+PLOT  = 'plot'
+QUERY = 'query'
+SERVE = 'serve'
+WATCH = 'watch'
+
+# Metrics to analyze (see `tables`).
+DELAY = 'delay'
+LOSS  = 'loss'
+METRICS = (DELAY, LOSS)
+
+# Output formats; all but text are written by `columnar`.
+TEXT = 'text'
+FORMATS = (TEXT, 'npz', 'arrow', 'parquet')
+
+# Gnuplot scripts to plot delays, and inflation of delays (with the locations
+#  of cities); there is none, yet, for losses.
+PLOTS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                         os.pardir, 'plots')
+PLOT_SCRIPTS = {
+    DELAY: 'plot-rtt-matrix.gp',
+    'inflation': 'plot-inf-matrix.gp',
+}
+
+
+def parse_delay(html_file, city_data, locs_file=None, complete=False,
+                cache_path=None):
+    """Parse network delay matrix from the HTML file; the parsed matrix is
+    cached in `cache_path`, if specified.
+    """
+    from . import pcache
+    from . import rttmon
+    from . import tables
+    from . import utils
+    cache = pcache.open_cache(city_data, cache_path) if cache_path else None
+    m, stats = pcache.parse_page(utils.load_content(html_file), city_data,
+                                 tables.DELAY, cache)
+    if locs_file:
+        from . import ingest
+        m = ingest.inflate(m, ingest.load_distances(city_data, locs_file))
+
+    # Complete matrix.
+    fm = rttmon.complete_matrix(m) if complete else m
+
+    return fm, stats
+
+
+def parse_loss(html_file, city_data, locs_file=None, complete=False,
+               cache_path=None):
+    """Parse network loss matrix from the HTML file; the parsed matrix is cached
+    in `cache_path`, if specified.
+    """
+    from . import lossmon
+    from . import pcache
+    from . import tables
+    from . import utils
+    cache = pcache.open_cache(city_data, cache_path) if cache_path else None
+    m, stats = pcache.parse_page(utils.load_content(html_file), city_data,
+                                 tables.LOSS, cache)
+
+    # Complete matrix.
+    fm = lossmon.complete_matrix(m) if complete else m
+
+    return fm, stats
+
+
+# Parser of each metric.
+PARSERS = {
+    DELAY: parse_delay,
+    LOSS: parse_loss,
+}
+
+
+def cache_path(args):
+    """Return the directory of the cache of parsed matrices (see `pcache`), or
+    `None` if the cache is not enabled.
+    """
+    if args.parse_cache is None:
+        return None
+    from . import pcache
+    return args.parse_cache or pcache.default_path()
+
+
+def missing_val(metric):
+    """Return the value of blank cells in the matrix of the metric.
+    """
+    from . import tables
+    return tables.missing_val(tables.TABLES[metric])
+
+
+def parse(args):
+    """Parse a snapshot, and write the (complete) matrix in a gnuplot-friendly
+    format, or the adjacency list.
+    """
+    from . import utils
+
+    if args.metric not in METRICS:
+        raise ValueError("Unsupported Metric: %s" % (args.metric))
+
+    city_data = utils.load_city_data(args.city_file)
+
+    # In a columnar format, the links of the lower-left triangle are written,
+    #  as in batch.
+    complete = not args.as_adj_list and args.fmt == TEXT
+    no_val = missing_val(args.metric)
+    fm, stats = PARSERS[args.metric](args.html_file, city_data, args.locs_file,
+                                     complete, cache_path(args))
+
+    if args.fmt != TEXT:
+        if not args.out_file:
+            raise ValueError("Output file required for format %s!" % (args.fmt))
+        # NumPy is required only for the columnar formats.
+        from . import columnar
+        # Time stamp of the snapshot, if the file is named after it.
+        info = utils.snapshot_info(args.html_file)
+        tstamp = info[2] if info else 0
+        inflated = args.metric == DELAY and bool(args.locs_file)
+        with columnar.ColumnWriter(args.out_file, args.fmt, args.metric,
+                                   inflated) as w:
+            w.write(tstamp, utils.adj_list(fm, no_val), stats)
+        return
+
+    out = args.out_file
+    if not args.out_file:
+        out = sys.stdout
+    else:
+        out = utils.f_wr(args.out_file)
+
+    with out:
+        if args.as_adj_list:
+            alist = utils.adj_list(fm, no_val)
+            utils.write_adj_list(alist, stats, out)
+        else:
+            utils.gen_gp_data(fm, stats, out)
+
+
+def batch(args):
+    """Parse all snapshots of a metric in a directory in one go, and write the
+    time-stamped adjacency lists (one file per snapshot) and the statistics (one
+    line per snapshot) in the formats of `ext/parse-*-{data,stats}.sh`; in a
+    columnar format, the adjacency lists of all snapshots are written to a
+    single file instead.
+    """
+    from . import archive
+    from . import ingest
+    from . import manifest
+    from . import utils
+    import io
+    import multiprocessing as mp
+
+    if args.metric not in METRICS:
+        raise ValueError("Unsupported Metric: %s" % (args.metric))
+
+    if not (os.path.isdir(args.in_path) or archive.is_archive(args.in_path)):
+        raise ValueError("Invalid input path!")
+
+    if not (args.out_path or args.stats_file or args.cube_path):
+        raise ValueError("Neither output path, statistics file " +
+                         "nor cube specified!")
+
+    city_data = utils.load_city_data(args.city_file)
+    dist = (ingest.load_distances(city_data, args.locs_file)
+            if args.locs_file else None)
+
+    writer = None
+    if args.out_path and args.fmt != TEXT:
+        # NumPy is required only for the columnar formats.
+        from . import columnar
+        writer = columnar.ColumnWriter(args.out_path, args.fmt, args.metric,
+                                       args.metric == DELAY and
+                                       dist is not None)
+    elif args.out_path and not os.path.isdir(args.out_path):
+        os.makedirs(args.out_path)
+    no_val = missing_val(args.metric)
+    jobs = args.jobs if args.jobs > 0 else mp.cpu_count()
+
+    fnames = (archive.open_container(args.in_path).names
+              if archive.is_container(args.in_path) else None)
+    snaps = utils.list_snapshots(args.in_path, args.metric, fnames)
+
+    # Process only the snapshots not parsed in earlier runs.
+    mf = None
+    if args.manifest:
+        mf = manifest.Manifest(args.manifest)
+        # A snapshot modified since it was parsed is skipped, rather than
+        #  appending its statistics twice.
+        fpaths = [s[0] for s in snaps]
+        modified = mf.modified(fpaths)
+        if modified:
+            sys.stderr.write(("warning: %d snapshot(s) modified since " +
+                              "parsed (e.g., %s); skipped, run without " +
+                              "--incremental to parse them again\n") %
+                             (len(modified), os.path.basename(modified[0])))
+        pending = set(mf.pending(fpaths))
+        snaps = [s for s in snaps if s[0] in pending]
+
+    store = None
+    if args.cube_path:
+        # NumPy is required only for the cube.
+        from . import cube
+        from . import dense
+        index = dense.city_index(city_data)
+        store = cube.open_or_create(args.cube_path, index)
+        # Skip the snapshots already in the cube.
+        if len(store):
+            last_ts = store.tstamps[-1]
+            snaps = [s for s in snaps if s[2] > last_ts]
+
+    sumf = None
+    if args.stats_file:
+        sumf = (io.open(args.stats_file, 'a', encoding='utf-8') if mf
+                else utils.f_wr(args.stats_file))
+    try:
+        for fpath, ts_dt, tstamp, m, stats in ingest.ingest(snaps,
+                                                            args.metric,
+                                                            city_data,
+                                                            dist,
+                                                            jobs,
+                                                            cache_path(args)):
+            if writer is not None:
+                writer.write(tstamp, utils.adj_list(m, no_val), stats)
+            elif args.out_path:
+                out_file = os.path.sep.join((args.out_path, ts_dt + '.txt'))
+                with utils.f_wr(out_file) as out:
+                    utils.write_tstamped_adj_list(utils.adj_list(m, no_val),
+                                                  tstamp, out)
+                print("%s  => %s" % (fpath, out_file))
+
+            if sumf:
+                utils.write_tstamped_stats(stats, tstamp, sumf)
+
+            if store is not None:
+                store.append(tstamp, dense.from_dict(m, index, no_val))
+
+            if mf:
+                if sumf:
+                    sumf.flush()
+                mf.add([fpath])
+    finally:
+        if sumf:
+            sumf.close()
+
+    if writer is not None:
+        writer.close()
+        print("%d snapshots  => %s" % (len(writer.stats), args.out_path))
+
+
+def merge(args):
+    """Merge the data files written by `batch`, one file per link.
+    """
+    from . import merge
+    merge.main(args)
+
+
+def link_stats(args):
+    """Compute statistics of the latency data of links.
+    """
+    from . import variation
+    variation.main(args)
+
+
+def plot(args):
+    """Plot the (complete) matrix of a snapshot as a heat map, using gnuplot.
+    """
+    from . import utils
+    import io
+    import subprocess
+    import tempfile
+
+    if args.metric not in METRICS:
+        raise ValueError("Unsupported Metric: %s" % (args.metric))
+
+    script = args.script
+    if not script:
+        name = PLOT_SCRIPTS.get('inflation' if args.locs_file else args.metric)
+        if not name:
+            raise ValueError("No plot script for %s; use --script!" %
+                             (args.metric))
+        script = os.path.join(PLOTS_DIR, name)
+
+    city_data = utils.load_city_data(args.city_file)
+    fm, stats = PARSERS[args.metric](args.html_file, city_data, args.locs_file,
+                                     True, cache_path(args))
+
+    fd, data_file = tempfile.mkstemp(prefix='attmon-', suffix='.csv')
+    try:
+        with io.open(fd, 'w', encoding='utf-8') as out:
+            utils.gen_gp_data(fm, stats, out)
+        subprocess.check_call(['gnuplot', '-e',
+                               "IN_FILE='%s'; OUT_FILE='%s'" %
+                               (data_file, args.out_file),
+                               script])
+    finally:
+        os.remove(data_file)
+    print("%s  => %s" % (args.html_file, args.out_file))
+
+
+def query(args):
+    """Print the time series of a link, or the top links by a statistic, over
+    a time window, from a cube.
+    """
+    from . import utils
+
+    if not (args.link or args.top):
+        raise ValueError("Neither link nor top links specified!")
+
+    # NumPy is required only for the cube.
+    from . import query
+
+    beg_ts = utils.parse_time(args.beg_time) if args.beg_time else None
+    end_ts = utils.parse_time(args.end_time) if args.end_time else None
+    # Only the ranking of links requires the summary to be up to date; a link
+    #  is read from the summary, if it exists (see `query`).
+    store, summary = query.open_cube(args.cube_path, bool(args.top))
+
+    if args.link:
+        src, dst = args.link
+        # Cities may also be given by abbreviation or name, if the city data
+        #  is available.
+        reg = (utils.load_city_data(args.city_file)
+               if os.path.isfile(args.city_file) else None)
+        try:
+            series = query.link_series(store, src, dst, beg_ts, end_ts, reg,
+                                       summary)
+        except ValueError as e:
+            sys.stderr.write("error: %s\n" % (e))
+            return 1
+        for ts, v in zip(*series):
+            print("%d %s" % (ts, v))
+
+    if args.top:
+        for v, (src, dst) in query.top_links(store, args.top, args.rank_by,
+                                             beg_ts, end_ts, summary):
+            print("    %4.2f %20s => %s" % (v, src, dst))
+
+
+def serve(args):
+    """Keep the most recent snapshots parsed, and answer requests for them (see
+    `server`).
+    """
+    from . import ingest
+    from . import server
+    from . import utils
+    import asyncio
+    import signal
+
+    if not os.path.isdir(args.data_path):
+        raise ValueError("Invalid data path!")
+
+    city_data = utils.load_city_data(args.city_file)
+    dist = (ingest.load_distances(city_data, args.locs_file)
+            if args.locs_file else None)
+    port = args.port
+    if port is None and not args.socket_path:
+        port = server.PORT
+
+    srv = server.Server(server.data_paths(args.data_path, args.metrics),
+                        city_data, dist, args.interval,
+                        cache_path=cache_path(args))
+    loop = asyncio.new_event_loop()
+    asyncio.set_event_loop(loop)
+    task = loop.create_task(srv.run(args.host, port, args.socket_path,
+                                    args.poll))
+    # Stop (and remove the socket) on termination or interrupt.
+    for signum in (signal.SIGTERM, signal.SIGINT):
+        loop.add_signal_handler(signum, task.cancel)
+    try:
+        loop.run_until_complete(task)
+    except asyncio.CancelledError:
+        pass
+    finally:
+        loop.close()
+
+
+def follow(args):
+    """Ingest new snapshots as soon as they are written (see `watch`).
+    """
+    from . import ingest
+    from . import server
+    from . import utils
+    from . import watch
+    import signal
+
+    if not os.path.isdir(args.data_path):
+        raise ValueError("Invalid data path!")
+    if not args.cube_root and not args.links_root:
+        raise ValueError("Neither cube nor links path specified!")
+
+    city_data = utils.load_city_data(args.city_file)
+    dist = (ingest.load_distances(city_data, args.locs_file)
+            if args.locs_file else None)
+    state_file = args.state_file or os.path.join(args.data_path, '.watch.json')
+    state = watch.load_state(state_file)
+
+    for path in (args.cube_root, args.links_root):
+        if path and not os.path.isdir(path):
+            os.makedirs(path)
+
+    ingesters = {}
+    for metric in args.metrics:
+        cube_path = (os.path.join(args.cube_root, metric) if args.cube_root
+                     else None)
+        links_file = (os.path.join(args.links_root, metric + '.links')
+                      if args.links_root else None)
+        ingesters[metric] = watch.Ingester(metric, city_data, dist, cube_path,
+                                           links_file, state.get(metric),
+                                           cache_path(args))
+
+    follower = watch.Follower(server.data_paths(args.data_path, args.metrics),
+                              ingesters, state_file, args.interval, args.poll)
+    # Stop on termination, as on an interrupt.
+    signal.signal(signal.SIGTERM, signal.default_int_handler)
+    try:
+        follower.run()
+    except KeyboardInterrupt:
+        pass
+
+
+def add_parse_args(parser):
+    parser.add_argument('metric', metavar='metric',
+                        type=str,
+                        help=("'delay' or 'loss'"))
+    parser.add_argument('html_file', metavar='input',
+                        type=str,
+                        help=('HTML file containing ' +
+                              'the network delay/loss measurements'))
+    add_city_args(parser)
+    parser.add_argument('--as-adj-list', dest='as_adj_list',
+                        action='store_true',
+                        default=False,
+                        help='Generate output as an adjacency list')
+    parser.add_argument('--out', dest='out_file', metavar='output',
+                        type=str,
+                        help=('File to which ' +
+                              'the network delay/loss data will be written'))
+    parser.add_argument('--format', dest='fmt', metavar='format',
+                        type=str,
+                        choices=FORMATS,
+                        default=TEXT,
+                        help=('Output format: %s (default: %s); ' %
+                              (', '.join(FORMATS), TEXT) +
+                              'other than text, values are written as typed ' +
+                              'columns (time stamp, source, destination, ' +
+                              'value), with the statistics as metadata'))
+
+
+def add_city_args(parser):
+    parser.add_argument('--city-data', dest='city_file', metavar='city_file',
+                        type=str,
+                        default='data/city-code-abbrev-name.txt',
+                        help=('Text file containing ' +
+                              'city codes, abbreviations and names'))
+    parser.add_argument('--locs', dest='locs_file', metavar='city-locations',
+                        type=str,
+                        help=('File containing ' +
+                              'latitude-longitude coordinates for cities'))
+    parser.add_argument('--parse-cache', dest='parse_cache', metavar='DIR',
+                        type=str, nargs='?',
+                        const='',
+                        help=('Cache parsed matrices in DIR (default: ' +
+                              'parsed/ in $ATTMON_CACHE_DIR or ' +
+                              '~/.cache/attmon), and reuse them when the ' +
+                              'snapshots are parsed again'))
+
+
+def add_batch_args(parser):
+    parser.add_argument('metric', metavar='metric',
+                        type=str,
+                        help=("'delay' or 'loss'"))
+    parser.add_argument('in_path', metavar='in_path',
+                        type=str,
+                        help=('Input path containing HTML files ' +
+                              'named att-network-<metric>--HHMM-MMDDYYYY.html' +
+                              ', or an archive or a store of snapshots'))
+    parser.add_argument('out_path', metavar='out_path',
+                        type=str, nargs='?',
+                        help=('Output path to which ' +
+                              'the time-stamped adjacency lists are written'))
+    parser.add_argument('--stats', dest='stats_file', metavar='stats_file',
+                        type=str,
+                        help=('File to which ' +
+                              'the time-stamped statistics are written'))
+    parser.add_argument('--cube', dest='cube_path', metavar='cube_path',
+                        type=str,
+                        help=('Path of the (time x source x destination) ' +
+                              'cube to which the matrices are appended'))
+    add_city_args(parser)
+    parser.add_argument('--incremental', dest='manifest', metavar='manifest',
+                        type=str,
+                        help=('Parse only the snapshots not recorded in ' +
+                              'the manifest, and append to the statistics ' +
+                              'file; snapshots modified since they were ' +
+                              'parsed are skipped'))
+    parser.add_argument('--jobs', dest='jobs', metavar='N',
+                        type=int,
+                        default=1,
+                        help=('Number of worker processes ' +
+                              '(0 to use all available cores)'))
+    parser.add_argument('--format', dest='fmt', metavar='format',
+                        type=str,
+                        choices=FORMATS,
+                        default=TEXT,
+                        help=('Output format: %s (default: %s); ' %
+                              (', '.join(FORMATS), TEXT) +
+                              'other than text, values are written as typed ' +
+                              'columns (time stamp, source, destination, ' +
+                              'value), with the statistics as metadata ' +
+                              'to a single file, out_path'))
+
+
+def add_merge_args(parser):
+    parser.add_argument('metric', metavar='metric',
+                        type=str,
+                        choices=METRICS,
+                        help=("'delay' or 'loss'"))
+    # Arguments shared with `ext/merge-*.py`; the module is small, and imports
+    #  only the standard library.
+    from . import merge
+    merge.add_arguments(parser)
+
+
+def add_stats_args(parser):
+    # Arguments shared with `ext/get-latency-stats.py`; NumPy is imported only
+    #  when a cube is analyzed.
+    from . import variation
+    variation.add_arguments(parser)
+
+
+def add_plot_args(parser):
+    parser.add_argument('metric', metavar='metric',
+                        type=str,
+                        help=("'delay' or 'loss'"))
+    parser.add_argument('html_file', metavar='input',
+                        type=str,
+                        help=('HTML file containing ' +
+                              'the network delay/loss measurements'))
+    parser.add_argument('out_file', metavar='output',
+                        type=str,
+                        help='PDF file to which the plot is written')
+    add_city_args(parser)
+    parser.add_argument('--script', dest='script', metavar='gnuplot_script',
+                        type=str,
+                        help=('Gnuplot script, reading the variables ' +
+                              'IN_FILE and OUT_FILE (default: a script in ' +
+                              "'plots/' for delays or, with --locs, for " +
+                              'the inflation of delays)'))
+
+
+def add_query_args(parser):
+    parser.add_argument('cube_path', metavar='cube_path',
+                        type=str,
+                        help=('Path of the cube written by ' +
+                              "'%s --cube'" % (BATCH)))
+    parser.add_argument('--link', dest='link', metavar=('SRC', 'DST'),
+                        type=str, nargs=2,
+                        help=('Print the time stamps and values of the ' +
+                              'link; cities are given by code, ' +
+                              'abbreviation or name'))
+    parser.add_argument('--city-data', dest='city_file', metavar='city_file',
+                        type=str,
+                        default='data/city-code-abbrev-name.txt',
+                        help=('Text file containing ' +
+                              'city codes, abbreviations and names, to ' +
+                              'resolve the cities of --link'))
+    parser.add_argument('--top', dest='top', metavar='K',
+                        type=int,
+                        help='Print the K links with the highest statistic')
+    parser.add_argument('--by', dest='rank_by', metavar='stat',
+                        type=str,
+                        choices=('avg', 'std', 'max'),
+                        default='avg',
+                        help=("Statistic by which links are ranked: " +
+                              "'avg', 'std' or 'max' (default: avg)"))
+    parser.add_argument('--from', dest='beg_time', metavar='time',
+                        type=str,
+                        help=('Beginning of the window (inclusive), as ' +
+                              'seconds since the epoch, or YYYY-MM-DD' +
+                              '[THH:MM[:SS]] in UTC'))
+    parser.add_argument('--to', dest='end_time', metavar='time',
+                        type=str,
+                        help='End of the window (inclusive)')
+
+
+def add_serve_args(parser):
+    parser.add_argument('data_path', metavar='data_path',
+                        type=str, nargs='?',
+                        default='data',
+                        help=('Path containing the snapshots, or the ' +
+                              'latency and loss sub-directories holding ' +
+                              'them (default: data)'))
+    parser.add_argument('--metrics', dest='metrics', metavar='metric',
+                        type=str, nargs='+',
+                        choices=METRICS,
+                        default=list(METRICS),
+                        help="Metrics: 'delay' and/or 'loss' (default: both)")
+    add_city_args(parser)
+    parser.add_argument('--host', dest='host', metavar='host',
+                        type=str,
+                        default='127.0.0.1',
+                        help='Address to listen on (default: 127.0.0.1)')
+    parser.add_argument('--port', dest='port', metavar='port',
+                        type=int,
+                        help=('Port to listen on for HTTP requests ' +
+                              '(default: 8421, unless --socket is specified)'))
+    parser.add_argument('--socket', dest='socket_path', metavar='socket_path',
+                        type=str,
+                        help='Unix socket to listen on for HTTP requests')
+    add_watch_opts(parser)
+
+
+def add_watch_opts(parser):
+    parser.add_argument('--interval', dest='interval', metavar='seconds',
+                        type=float,
+                        default=2,
+                        help=('Interval between polls for new snapshots, ' +
+                              'if inotify is unavailable (default: 2)'))
+    parser.add_argument('--poll', dest='poll',
+                        action='store_true',
+                        default=False,
+                        help='Poll for new snapshots, instead of using inotify')
+
+
+def add_watch_args(parser):
+    parser.add_argument('data_path', metavar='data_path',
+                        type=str, nargs='?',
+                        default='data',
+                        help=('Path containing the snapshots, or the ' +
+                              'latency and loss sub-directories holding ' +
+                              'them (default: data)'))
+    parser.add_argument('--metrics', dest='metrics', metavar='metric',
+                        type=str, nargs='+',
+                        choices=METRICS,
+                        default=list(METRICS),
+                        help="Metrics: 'delay' and/or 'loss' (default: both)")
+    add_city_args(parser)
+    parser.add_argument('--cube-root', dest='cube_root', metavar='cube_root',
+                        type=str,
+                        help=('Path holding a cube for each metric, named ' +
+                              'after it, to which the snapshots are appended'))
+    parser.add_argument('--links-root', dest='links_root',
+                        metavar='links_root',
+                        type=str,
+                        help=('Path holding the running statistics of links ' +
+                              'of each metric, in <metric>.links'))
+    parser.add_argument('--state', dest='state_file', metavar='state_file',
+                        type=str,
+                        help=('File recording the last snapshot ingested of ' +
+                              'each metric (default: data_path/.watch.json)'))
+    add_watch_opts(parser)
+
+
+# Sub-commands, as (name, function, function adding the arguments, description)
+#  tuples.
+COMMANDS = (
+    (PARSE, parse, add_parse_args,
+     'Retrieve network delay/loss matrix from HTML file'),
+    (BATCH, batch, add_batch_args,
+     'Retrieve network delay/loss matrices from all HTML files in a directory'),
+    (MERGE, merge, add_merge_args,
+     'Merge the data of links, written by batch, into one file per link'),
+    (STATS, link_stats, add_stats_args,
+     'Compute basic statistics to measure delay variations of links'),
+    (PLOT, plot, add_plot_args,
+     'Plot the delay/loss matrix from HTML file, using gnuplot'),
+    (QUERY, query, add_query_args,
+     'Query the time series of a link, or the top links, from a cube'),
+    (SERVE, serve, add_serve_args,
+     'Keep the most recent snapshots parsed, and answer requests for them'),
+    (WATCH, follow, add_watch_args,
+     'Ingest new snapshots into cubes and link statistics as they arrive'),
+)
+
+
+def parse_args(argv):
+    prog = os.path.basename(sys.argv[0])
+    if prog in ('__main__.py', ''):
+        prog = 'attmon'
+    parser = argparse.ArgumentParser(
+        prog=prog,
+        description='Parse, merge, analyze and plot AT&T network data')
+    subparsers = parser.add_subparsers(dest='command', metavar='command')
+    subparsers.required = True
+
+    # Arguments of a sub-command are added only if it is invoked, since some
+    #  are shared with (and imported from) other modules.
+    name = argv[0] if argv else None
+    for cmd, fn, add_args, desc in COMMANDS:
+        p = subparsers.add_parser(cmd, help=desc, description=desc)
+        if cmd == name:
+            add_args(p)
+            profiling.add_options(p)
+        p.set_defaults(func=fn)
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    """Run the sub-command; for compatibility, a snapshot is parsed if the
+    metric, instead of a sub-command, is the first argument.
+    """
+    argv = sys.argv[1:] if argv is None else argv
+    if argv and argv[0] in METRICS:
+        argv = [PARSE] + argv
+    args = parse_args(argv)
+    return profiling.run(args, args.func, args) or 0
@@ -0,0 +1,334 @@
+#!/usr/bin/env python
+# -*- mode: python; coding: utf-8; fill-column: 80; -*-
+#
+# collector.py
+# Copyright (c) 2026 The attmon contributors.
+#
+
+"""
+collector.py
+Fetch the network delay and loss pages published by AT&T concurrently, over
+persistent connections, and parse each page as soon as it is downloaded.
+"""
+
+__author__  = 'The attmon contributors'
+__version__ = '1.0'
+__license__ = 'MIT'
+
+
+from . import ingest
+from . import tables
+from . import utils
+import asyncio
+import io
+import json
+import os
+import ssl
+import sys
+import time
+import urllib.parse
+
+
+# Location of the pages, and the page of each metric.
+BASE_URL = 'http://ipnetwork.bgtmo.ip.att.net/pws/'
+PAGES = {
+    ingest.DELAY: 'network_delay.html',
+    ingest.LOSS: 'network_loss.html',
+}
+
+# Time (in seconds) allowed for a request to complete.
+TIMEOUT = 30.0
+
+# Number of attempts to fetch a page, and the delay (in seconds) before the
+#  first retry; the delay doubles with every retry.
+ATTEMPTS = 3
+BACKOFF = 2.0
+
+# Interval (in seconds) between polls.
+INTERVAL = 15 * 60
+
+# Format of the time stamp in the names of snapshot files.
+TS_DT_FMT = '%H%M-%m%d%Y'
+
+CRLF = b'\r\n'
+
+
+class HTTPError(Exception):
+    pass
+
+
+class Connection(object):
+    """Persistent (HTTP/1.1) connection to a server.
+    """
+
+    def __init__(self, host, port, use_ssl):
+        self.host = host
+        self.port = port
+        self.use_ssl = use_ssl
+        self.reader = None
+        self.writer = None
+
+    def is_open(self):
+        return self.writer is not None
+
+    async def open(self):
+        ctx = ssl.create_default_context() if self.use_ssl else None
+        self.reader, self.writer = await asyncio.open_connection(
+            self.host, self.port, ssl=ctx)
+
+    def close(self):
+        if self.writer:
+            self.writer.close()
+        self.reader, self.writer = None, None
+
+    async def request(self, path, headers):
+        """Issue a GET request, and return the status, the headers (with names
+        in lower case), and the body of the response.
+        """
+        if not self.is_open():
+            await self.open()
+
+        lines = ["GET %s HTTP/1.1" % (path),
+                 "Host: %s" % (self.host),
+                 "User-Agent: attmon/%s" % (__version__),
+                 "Accept-Encoding: identity",
+                 "Connection: keep-alive"]
+        lines += ["%s: %s" % (k, v) for k, v in headers.items()]
+        self.writer.write(CRLF.join(l.encode('latin-1') for l in lines) +
+                          CRLF + CRLF)
+        await self.writer.drain()
+
+        status_line = await self.reader.readline()
+        if not status_line:
+            raise HTTPError('Connection closed by server!')
+        parts = status_line.decode('latin-1').split(None, 2)
+        version, status = parts[0], int(parts[1])
+
+        hdrs = {}
+        while True:
+            line = await self.reader.readline()
+            if line in (CRLF, b'\n', b''):
+                break
+            name, val = line.decode('latin-1').split(':', 1)
+            hdrs[name.strip().lower()] = val.strip()
+
+        keep_alive = (hdrs.get('connection', '').lower() != 'close' and
+                      version != 'HTTP/1.0')
+        if status in (204, 304) or 100 <= status < 200:
+            body = b''
+        elif 'chunked' in hdrs.get('transfer-encoding', '').lower():
+            body = await self._read_chunked()
+        elif 'content-length' in hdrs:
+            body = await self.reader.readexactly(int(hdrs['content-length']))
+        else:
+            body = await self.reader.read()
+            keep_alive = False
+
+        if not keep_alive:
+            self.close()
+        return status, hdrs, body
+
+    async def _read_chunked(self):
+        chunks = []
+        while True:
+            size = int((await self.reader.readline()).split(b';')[0], 16)
+            if not size:
+                break
+            chunks.append(await self.reader.readexactly(size))
+            await self.reader.readline()
+        # Skip trailers.
+        while (await self.reader.readline()) not in (CRLF, b'\n', b''):
+            pass
+        return b''.join(chunks)
+
+
+class Pool(object):
+    """Pool of persistent connections to a server, reused across polls.
+    """
+
+    def __init__(self, host, port, use_ssl, size=2):
+        self.idle = [Connection(host, port, use_ssl) for _ in range(size)]
+        self.sem = asyncio.Semaphore(size)
+
+    async def request(self, path, headers, timeout=TIMEOUT):
+        async with self.sem:
+            conn = self.idle.pop()
+            try:
+                return await asyncio.wait_for(conn.request(path, headers),
+                                              timeout)
+            except:
+                # Do not reuse a connection in an unknown state.
+                conn.close()
+                raise
+            finally:
+                self.idle.append(conn)
+
+    def close(self):
+        for conn in self.idle:
+            conn.close()
+
+
+class Collector(object):
+    """Poll the delay and loss pages, and save and parse every new snapshot.
+
+    Validators (`ETag` and `Last-Modified`) of the last snapshot of each page
+    are saved in `state_file`, and sent with the next request so that unchanged
+    pages are not downloaded again. Snapshots are written to files or, if
+    `store` is given, only their tables of values are added to the store (see
+    `dedup`). Each parsed snapshot is handed, as an `ingest.Snapshot`, along
+    with the metric, to every function in `sinks`; a sink that fails (e.g., a
+    cube rejecting a snapshot of the same minute as its last) is logged, and
+    the snapshot is still kept.
+    """
+
+    def __init__(self, out_paths, city_data, state_file=None,
+                 base_url=BASE_URL, sinks=(), timeout=TIMEOUT,
+                 attempts=ATTEMPTS, store=None, log=sys.stderr):
+        url = urllib.parse.urlsplit(base_url)
+        use_ssl = url.scheme == 'https'
+        self.base_path = url.path if url.path.endswith('/') else url.path + '/'
+        self.pool = Pool(url.hostname, url.port or (443 if use_ssl else 80),
+                         use_ssl, len(PAGES))
+        self.out_paths = out_paths
+        self.city_data = city_data
+        self.state_file = state_file
+        self.sinks = sinks
+        self.store = store
+        self.timeout = timeout
+        self.attempts = attempts
+        self.log = log
+
+        self.state = {}
+        if state_file and os.path.isfile(state_file):
+            with utils.f_rd(state_file) as f:
+                self.state = json.load(f)
+
+    def _log(self, msg):
+        self.log.write("%s %s\n" % (time.strftime('%Y-%m-%d %H:%M:%S'), msg))
+        self.log.flush()
+
+    def _save_state(self):
+        if not self.state_file:
+            return
+        tmp_path = "%s.tmp" % (self.state_file)
+        with utils.f_wr(tmp_path) as f:
+            json.dump(self.state, f, sort_keys=True)
+        os.replace(tmp_path, self.state_file)
+
+    async def fetch(self, metric):
+        """Fetch the page of the metric; return `None` if the page is unchanged
+        since the last snapshot.
+        """
+        page = PAGES[metric]
+        validators = self.state.get(page, {})
+        headers = {}
+        if 'etag' in validators:
+            headers['If-None-Match'] = validators['etag']
+        if 'last-modified' in validators:
+            headers['If-Modified-Since'] = validators['last-modified']
+
+        delay = BACKOFF
+        for attempt in range(1, self.attempts + 1):
+            try:
+                status, hdrs, body = await self.pool.request(
+                    self.base_path + page, headers, self.timeout)
+                if status == 304:
+                    return None
+                if status != 200:
+                    raise HTTPError("Unexpected status %d" % (status))
+                self.state[page] = {k: hdrs[k]
+                                    for k in ('etag', 'last-modified')
+                                    if k in hdrs}
+                return body
+            except (HTTPError, OSError, asyncio.TimeoutError,
+                    asyncio.IncompleteReadError, ValueError) as e:
+                self._log("%s: attempt %d failed: %r" % (page, attempt, e))
+                if attempt == self.attempts:
+                    raise
+                await asyncio.sleep(delay)
+                delay *= 2
+
+    def process(self, metric, body, ts):
+        """Parse the page, and save it as a snapshot taken at `ts` (in UTC) if
+        it holds a valid table of values.
+        """
+        table = tables.TABLES[metric]
+        page = body.decode('utf-8', 'replace')
+        m, stats = tables.parse(page, self.city_data, table)
+
+        ts_dt = time.strftime(TS_DT_FMT, ts)
+        fname = "att-network-%s--%s.html" % (metric, ts_dt)
+        if self.store is not None:
+            fpath = os.path.sep.join((self.store.path, fname))
+            self.store.add(fname, page, table)
+        else:
+            fpath = os.path.sep.join((self.out_paths[metric], fname))
+            tmp_path = "%s.tmp" % (fpath)
+            with io.open(tmp_path, 'wb') as f:
+                f.write(body)
+            os.replace(tmp_path, fpath)
+
+        return ingest.Snapshot(fpath, ts_dt, utils.snapshot_info(fname)[2],
+                               m, stats)
+
+    def deliver(self, metric, snap):
+        """Hand the snapshot to every sink; return whether all succeeded.
+        """
+        ok = True
+        for sink in self.sinks:
+            try:
+                sink(metric, snap)
+            except Exception as e:
+                self._log("%s: %s: sink failed: %r" % (metric, snap.path, e))
+                ok = False
+        return ok
+
+    async def _poll_page(self, metric, ts):
+        try:
+            body = await self.fetch(metric)
+        except Exception as e:
+            self._log("%s: fetch failed: %r" % (metric, e))
+            return None
+
+        if body is None:
+            self._log("%s: unchanged" % (metric))
+            return None
+
+        try:
+            snap = self.process(metric, body, ts)
+        except (KeyError, ValueError) as e:
+            # Do not save the validators of a page that could not be parsed.
+            self.state.pop(PAGES[metric], None)
+            self._log("%s: invalid page: %r" % (metric, e))
+            return None
+
+        self._log("%s: %s (min./max./avg. : %s, %s, %s)" %
+                  ((metric, snap.path) + tuple(snap.stats)))
+        self.deliver(metric, snap)
+        return snap
+
+    async def poll(self):
+        """Fetch all pages concurrently, and return the new snapshots.
+        """
+        # All snapshots of a poll share the same time stamp, in UTC, as read
+        #  from the names of snapshot files (see `utils.to_epoch`).
+        ts = time.gmtime()
+        snaps = await asyncio.gather(*[self._poll_page(metric, ts)
+                                       for metric in sorted(PAGES)])
+        self._save_state()
+        return [s for s in snaps if s]
+
+    async def run(self, interval=INTERVAL, count=None):
+        """Poll at the start of every interval (aligned to the wall clock), for
+        `count` polls or forever.
+        """
+        try:
+            while count is None or count > 0:
+                await self.poll()
+                if count is not None:
+                    count -= 1
+                    if not count:
+                        break
+                await asyncio.sleep(interval - time.time() % interval)
+        finally:
+            self.pool.close()
@@ -0,0 +1,299 @@
+#!/usr/bin/env python
+# -*- mode: python; coding: utf-8; fill-column: 80; -*-
+#
+# columnar.py
+# Copyright (c) 2026 The attmon contributors.
+#
+
+"""
+columnar.py
+Write adjacency lists of one or more snapshots as typed columns (time stamp,
+source, destination, and value) to NumPy (`.npz`), Arrow (IPC file) or Parquet
+files, with the statistics of each snapshot as metadata.
+"""
+
+__author__  = 'The attmon contributors'
+__version__ = '1.0'
+__license__ = 'MIT'
+
+
+import json
+import numpy as np
+import shutil
+import tempfile
+import zipfile
+
+
+# Output formats.
+NPZ = 'npz'
+ARROW = 'arrow'
+PARQUET = 'parquet'
+FORMATS = (NPZ, ARROW, PARQUET)
+
+# Key of the metadata in the schema of Arrow and Parquet files, and name of the
+#  array holding the metadata in NumPy files.
+META_KEY = 'attmon'
+
+# Suffix of the key of the statistics, in the metadata of Arrow record batches
+#  and of Parquet files.
+STATS_SUFFIX = '.stats'
+
+# Number of rows written at once: as a record batch (in Arrow files), as a row
+#  group (in Parquet files), or to the temporary files (for NumPy files).
+CHUNK_ROWS = 1 << 20
+
+# Names of the columns in NumPy files.
+NPZ_COLS = ('timestamp', 'src', 'dst', 'value')
+
+# Names of the statistics of a snapshot.
+STATS_COLS = ('min', 'max', 'avg')
+
+# Type of the values of each metric.
+VALUE_TYPES = {
+    'delay': np.int32,
+    'loss': np.float64,
+}
+
+# Type of the values if delays are converted to inflation values.
+INFLATION_TYPE = np.float64
+
+
+class ColumnWriter(object):
+    """Write the adjacency lists of snapshots as typed columns to a file, in
+    chunks of about `chunk_rows` rows: Arrow record batches and Parquet row
+    groups are written as they fill, and the columns of NumPy files are spooled
+    to temporary files, and copied into the file on `close`.
+
+    Source and destination cities are stored as indices into the list of
+    cities (in the `cities` array, in NumPy files, and dictionary-encoded, in
+    Arrow and Parquet files), and time stamps as seconds since the epoch (UTC).
+    Values are stored as floats if `inflated` (i.e., delays were converted to
+    inflation values).
+
+    The statistics of the snapshots are known only once all are written, and so
+    are stored, in Arrow files, with each record batch (for the snapshots in
+    the batch) and, in Parquet files, in the metadata of the file instead of
+    that of the schema (see `load_arrow` and `load_parquet`).
+    """
+
+    def __init__(self, fpath, fmt, metric, inflated=False,
+                 chunk_rows=CHUNK_ROWS):
+        if fmt not in FORMATS:
+            raise ValueError("Unsupported format: %s" % (fmt))
+        self.fpath = fpath
+        self.fmt = fmt
+        self.metric = metric
+        self.inflated = inflated
+        self.vtype = INFLATION_TYPE if inflated else VALUE_TYPES[metric]
+        self.chunk_rows = chunk_rows
+        # City code to index.
+        self.cities = {}
+        self.stats = []
+        # Columns, and statistics, of the snapshots not yet written.
+        self.chunks = []
+        self.num_rows = 0
+        self.num_stats = 0
+        # Writer of the Arrow or Parquet file, created on the first flush.
+        self.writer = None
+        # Temporary files holding the columns of the NumPy file, and the number
+        #  of rows in them.
+        self.spool = None
+        self.size = 0
+
+    def _city(self, code):
+        if code not in self.cities:
+            self.cities[code] = len(self.cities)
+        return self.cities[code]
+
+    def write(self, tstamp, alist, stats):
+        """Add the adjacency list and the statistics of a snapshot taken at
+        `tstamp` (seconds since the epoch).
+        """
+        n = len(alist)
+        src = np.fromiter((self._city(r[0]) for r in alist), np.int32, n)
+        dst = np.fromiter((self._city(r[1]) for r in alist), np.int32, n)
+        vals = np.fromiter((r[2] for r in alist), self.vtype, n)
+        self.chunks.append((np.full(n, tstamp, np.int64), src, dst, vals))
+        self.stats.append([tstamp] + list(stats))
+        self.num_rows += n
+        if self.num_rows >= self.chunk_rows:
+            self.flush()
+
+    def metadata(self, stats=True):
+        """Metric, and statistics (min./max./avg.) by snapshot, if `stats`.
+        """
+        meta = {'metric': self.metric,
+                'inflated': self.inflated,
+                'stats_columns': ('timestamp',) + STATS_COLS}
+        if stats:
+            meta['stats'] = self.stats
+        return meta
+
+    def columns(self):
+        """Return the time stamps, the source and destination (as indices into
+        the list of cities), and the values, of the snapshots not yet written,
+        as arrays, and the list of cities.
+        """
+        if self.chunks:
+            cols = [np.concatenate(c) for c in zip(*self.chunks)]
+        else:
+            cols = [np.empty(0, t)
+                    for t in (np.int64, np.int32, np.int32, self.vtype)]
+        cities = sorted(self.cities, key=self.cities.get)
+        return cols, cities
+
+    def flush(self):
+        """Write the snapshots added since the last flush.
+        """
+        if not self.chunks:
+            return
+        cols, cities = self.columns()
+        if self.fmt == NPZ:
+            if self.spool is None:
+                self.spool = [tempfile.TemporaryFile() for _c in NPZ_COLS]
+            for f, col in zip(self.spool, cols):
+                f.write(col.tobytes())
+            self.size += len(cols[0])
+        else:
+            self._write_batch(cols, cities)
+        self.chunks = []
+        self.num_rows = 0
+        self.num_stats = len(self.stats)
+
+    def close(self):
+        self.flush()
+        if self.fmt == NPZ:
+            self._write_npz()
+            return
+        if self.writer is None:
+            # No snapshots; the file holds only the schema.
+            self._open()
+        if self.fmt == PARQUET:
+            self.writer.add_key_value_metadata(
+                {META_KEY + STATS_SUFFIX: json.dumps(self.stats)})
+            self.writer.close()
+        else:
+            self.writer.close()
+            self.sink.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        if exc_type is None:
+            self.close()
+
+    def _write_npz(self):
+        _cols, cities = self.columns()
+        stats = np.array([s[1:] for s in self.stats], np.float64)
+        dtypes = (np.int64, np.int32, np.int32, self.vtype)
+        with zipfile.ZipFile(self.fpath, 'w', zipfile.ZIP_STORED,
+                             allowZip64=True) as zf:
+            # The columns are copied from the temporary files, after the header
+            #  written by `np.save`, with the number of rows.
+            for i, (name, dtype) in enumerate(zip(NPZ_COLS, dtypes)):
+                with zf.open(name + '.npy', 'w', force_zip64=True) as out:
+                    np.lib.format.write_array_header_1_0(out, {
+                        'descr': np.lib.format.dtype_to_descr(np.dtype(dtype)),
+                        'fortran_order': False,
+                        'shape': (self.size,)})
+                    if self.spool is not None:
+                        self.spool[i].seek(0)
+                        shutil.copyfileobj(self.spool[i], out)
+            arrays = {
+                'cities': np.array(cities, dtype=str),
+                'stats_timestamp': np.array([s[0] for s in self.stats],
+                                            np.int64),
+                'stats': stats.reshape(-1, len(STATS_COLS)),
+                META_KEY: np.array(json.dumps(self.metadata())),
+            }
+            for name, arr in arrays.items():
+                with zf.open(name + '.npy', 'w', force_zip64=True) as out:
+                    np.lib.format.write_array(out, arr)
+        for f in self.spool or ():
+            f.close()
+        self.spool = None
+
+    def _open(self):
+        # PyArrow is required only for the Arrow and Parquet formats.
+        import pyarrow as pa
+
+        self.schema = pa.schema(
+            [('timestamp', pa.timestamp('s', tz='UTC')),
+             ('src', pa.dictionary(pa.int32(), pa.string())),
+             ('dst', pa.dictionary(pa.int32(), pa.string())),
+             ('value', pa.from_numpy_dtype(self.vtype))],
+            metadata={META_KEY: json.dumps(self.metadata(False))})
+        if self.fmt == PARQUET:
+            import pyarrow.parquet as pq
+            self.writer = pq.ParquetWriter(self.fpath, self.schema)
+        else:
+            # Cities are numbered in order of appearance, and so the list of
+            #  cities of a batch extends those of earlier batches.
+            self.sink = pa.OSFile(self.fpath, 'wb')
+            self.writer = pa.ipc.new_file(
+                self.sink, self.schema,
+                options=pa.ipc.IpcWriteOptions(emit_dictionary_deltas=True))
+
+    def _write_batch(self, cols, cities):
+        import pyarrow as pa
+
+        if self.writer is None:
+            self._open()
+        ts, src, dst, vals = cols
+        cities = pa.array(cities, pa.string())
+        batch = pa.record_batch(
+            [pa.array(ts, pa.timestamp('s', tz='UTC')),
+             pa.DictionaryArray.from_arrays(pa.array(src), cities),
+             pa.DictionaryArray.from_arrays(pa.array(dst), cities),
+             pa.array(vals)],
+            schema=self.schema)
+        if self.fmt == PARQUET:
+            self.writer.write_table(pa.Table.from_batches([batch]))
+        else:
+            stats = self.stats[self.num_stats:]
+            self.writer.write_batch(
+                batch, custom_metadata={META_KEY + STATS_SUFFIX:
+                                        json.dumps(stats)})
+
+
+def load_npz(fpath):
+    """Load the columns and the metadata written to a NumPy file; the source
+    and destination are indices into the `cities` array.
+    """
+    with np.load(fpath) as data:
+        cols = {k: data[k] for k in data.files if k != META_KEY}
+        return cols, json.loads(str(data[META_KEY]))
+
+
+def load_arrow(fpath):
+    """Load the table and the metadata, with the statistics of all snapshots,
+    written to an Arrow file.
+    """
+    import pyarrow as pa
+
+    batches, stats = [], []
+    with pa.OSFile(fpath, 'rb') as f:
+        reader = pa.ipc.open_file(f)
+        for i in range(reader.num_record_batches):
+            batch, meta = reader.get_batch_with_custom_metadata(i)
+            batches.append(batch)
+            stats.extend(json.loads(meta[META_KEY + STATS_SUFFIX]))
+        table = pa.Table.from_batches(batches, reader.schema)
+    meta = json.loads(table.schema.metadata[META_KEY.encode('utf-8')])
+    meta['stats'] = stats
+    return table, meta
+
+
+def load_parquet(fpath):
+    """Load the table and the metadata, with the statistics of all snapshots,
+    written to a Parquet file.
+    """
+    import pyarrow.parquet as pq
+
+    pf = pq.ParquetFile(fpath)
+    table = pf.read()
+    meta = json.loads(table.schema.metadata[META_KEY.encode('utf-8')])
+    meta['stats'] = json.loads(
+        pf.metadata.metadata[(META_KEY + STATS_SUFFIX).encode('utf-8')])
+    return table, meta
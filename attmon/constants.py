@@ -22,6 +22,7 @@ import re
 COLON = u':'
 COMMA = u','
 NEWLINE = u'\n'
+SPACE = u' '
 TAB = u'\t'
 
 # Precision (in terms of number of decimal places)
@@ -46,3 +47,22 @@ TD_VAL_PAT = re.compile(r'<TD .*?>' +
 
 # String used to identify the start of the table of values.
 DATA_BEG_PAT = re.compile(r'<TD.*?>.*?CITY\s+PAIRS.*?</TD>')
+
+# Regular expression to tokenize the table of values in a single pass; each
+#  match is a cell with a value, a blank cell, or the beginning or ending of a
+#  table row.
+TOKEN_PAT = re.compile(r'<TD [^>]*>' +
+                       r'(?:<FONT[^>]*>([^<]*)</FONT>|'
+                       r'(' + NO_VAL + r'))</TD>|'
+                       r'(<TR>)|(</TR>)')
+
+# Extension of gzip-compressed files.
+GZ_EXT = '.gz'
+
+# Regular expression to parse the names of the snapshot files written by the
+#  fetch scripts, e.g., `att-network-delay--0217-06232017.html`, and optionally
+#  compressed with gzip.
+SNAPSHOT_PAT = re.compile(r'^att-network-(?P<metric>[a-z]+)--' +
+                          r'(?P<ts_dt>(?P<hr>\d{2})(?P<min>\d{2})-' +
+                          r'(?P<mon>\d{2})(?P<day>\d{2})(?P<yr>\d{4}))' +
+                          r'\.html(?:' + re.escape(GZ_EXT) + r')?$')
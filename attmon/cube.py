@@ -0,0 +1,160 @@
+#!/usr/bin/env python
+# -*- mode: python; coding: utf-8; fill-column: 80; -*-
+#
+# cube.py
+# Copyright (c) 2026 The attmon contributors.
+#
+
+"""
+cube.py
+Store the matrices of all snapshots of a metric as a (time x source x
+destination) cube.
+
+A cube is a directory with three files: the city codes along the source and
+destination axes (one per line), the time stamps (seconds since the epoch, as
+raw 64-bit integers) and the values (raw 32-bit floats, one matrix per
+snapshot). Snapshots are appended to the end of the files, and the files are
+read back as memory-mapped arrays. A snapshot only partially written (e.g., by
+an interrupted run) is ignored, and overwritten by the next snapshot appended.
+"""
+
+__author__  = 'The attmon contributors'
+__version__ = '1.0'
+__license__ = 'MIT'
+
+
+from . import constants as const
+from . import dense
+from . import utils
+import io
+import numpy as np
+import os
+
+
+# Files of a cube.
+CITIES_FILE = 'cities.txt'
+TSTAMPS_FILE = 'tstamps.i8'
+VALUES_FILE = 'values.f4'
+
+TSTAMP_TYPE = np.dtype('<i8')
+VALUE_TYPE = np.dtype('<f4')
+
+
+class Cube(object):
+    """Time series of the matrices of a metric.
+    """
+
+    def __init__(self, path, index):
+        self.path = path
+        self.index = index
+        self.tstamps = None
+        self.values = None
+        # Whether any partially written snapshot has been removed.
+        self.trimmed = False
+        self.refresh()
+
+    def _fpath(self, fname):
+        return os.path.sep.join((self.path, fname))
+
+    def __len__(self):
+        return len(self.tstamps)
+
+    def refresh(self):
+        """Map the time stamps and values, including any snapshots appended
+        since the cube was opened.
+        """
+        n = len(self.index)
+        tsf, valf = self._fpath(TSTAMPS_FILE), self._fpath(VALUES_FILE)
+        # Ignore a snapshot only partially written.
+        num = min(os.path.getsize(tsf) // TSTAMP_TYPE.itemsize,
+                  os.path.getsize(valf) // (n * n * VALUE_TYPE.itemsize))
+        if not num:
+            self.tstamps = np.empty(0, TSTAMP_TYPE)
+            self.values = np.empty((0, n, n), VALUE_TYPE)
+            return
+
+        self.tstamps = np.memmap(tsf, TSTAMP_TYPE, 'r', shape=(num,))
+        self.values = np.memmap(valf, VALUE_TYPE, 'r', shape=(num, n, n))
+
+    def trim(self):
+        """Truncate the files to the snapshots completely written, so that
+        snapshots are appended after them.
+        """
+        self.refresh()
+        n = len(self.index)
+        for fname, size in ((TSTAMPS_FILE, len(self) * TSTAMP_TYPE.itemsize),
+                            (VALUES_FILE,
+                             len(self) * n * n * VALUE_TYPE.itemsize)):
+            fpath = self._fpath(fname)
+            if os.path.getsize(fpath) > size:
+                with io.open(fpath, 'ab') as f:
+                    f.truncate(size)
+        self.trimmed = True
+
+    def append(self, ts, dm):
+        """Append the matrix of a snapshot taken at `ts` (seconds since the
+        epoch); snapshots must be appended in chronological order.
+        """
+        if dm.index != self.index:
+            raise ValueError('Mismatch in the cities of snapshot and cube!')
+        if not self.trimmed:
+            self.trim()
+        if len(self) and ts <= self.tstamps[-1]:
+            raise ValueError("Snapshot at %d is older than the cube!" % (ts))
+
+        with io.open(self._fpath(VALUES_FILE), 'ab') as f:
+            f.write(dm.values.astype(VALUE_TYPE).tobytes())
+        with io.open(self._fpath(TSTAMPS_FILE), 'ab') as f:
+            f.write(np.array([ts], TSTAMP_TYPE).tobytes())
+        self.refresh()
+
+    def span(self, beg_ts=None, end_ts=None):
+        """Return the range of positions, along the time axis, of the snapshots
+        taken between `beg_ts` and `end_ts` (both inclusive).
+        """
+        beg = (0 if beg_ts is None
+               else int(np.searchsorted(self.tstamps, beg_ts, 'left')))
+        end = (len(self) if end_ts is None
+               else int(np.searchsorted(self.tstamps, end_ts, 'right')))
+        return beg, end
+
+    def link(self, src, dst, beg_ts=None, end_ts=None):
+        """Return the time stamps and values of a link, as views of the cube.
+        """
+        pos = self.index.pos
+        beg, end = self.span(beg_ts, end_ts)
+        return (self.tstamps[beg:end],
+                self.values[beg:end, pos[src], pos[dst]])
+
+    def snapshot(self, i):
+        """Return the matrix of the `i`-th snapshot, as a view of the cube.
+        """
+        return dense.DenseMatrix(self.index, self.values[i])
+
+
+def create(path, index):
+    """Create an empty cube for the cities in the index.
+    """
+    if not os.path.isdir(path):
+        os.makedirs(path)
+    with utils.f_wr(os.path.sep.join((path, CITIES_FILE))) as f:
+        f.write(const.NEWLINE.join(index.codes) + const.NEWLINE)
+    for fname in (TSTAMPS_FILE, VALUES_FILE):
+        io.open(os.path.sep.join((path, fname)), 'wb').close()
+    return Cube(path, index)
+
+
+def load(path):
+    """Open an existing cube.
+    """
+    with utils.f_rd(os.path.sep.join((path, CITIES_FILE))) as f:
+        codes = [line.strip() for line in f if line.strip()]
+    return Cube(path, dense.CityIndex(codes))
+
+
+def open_or_create(path, index):
+    """Open the cube if it exists, or create an empty one.
+    """
+    if os.path.isfile(os.path.sep.join((path, CITIES_FILE))):
+        return load(path)
+    return create(path, index)
@@ -0,0 +1,117 @@
+#!/usr/bin/env python
+# -*- mode: python; coding: utf-8; fill-column: 80; -*-
+#
+# dedup.py
+# Copyright (c) 2026 The attmon contributors.
+#
+
+"""
+dedup.py
+Content-addressed store of snapshots: only the table of values is kept from each
+snapshot, identical tables are stored once, and an index maps the name of each
+snapshot to (the hash of) its table.
+"""
+
+__author__  = 'The attmon contributors'
+__version__ = '1.0'
+__license__ = 'MIT'
+
+
+from . import constants as const
+from . import tables
+from . import tokenizer
+from . import utils
+import hashlib
+import io
+import os
+
+
+# Files of a store.
+INDEX_FILE = 'index.txt'
+OBJECTS_DIR = 'objects'
+
+
+def extract(page, table=tables.DELAY):
+    """Extract the region of the page containing the table of values.
+    """
+    beg, end = tokenizer.table_region(page, table.beg_pat)
+    return page[beg:end]
+
+
+def digest(region):
+    """Hash of the table of values.
+    """
+    return hashlib.sha1(region.encode('utf-8')).hexdigest()
+
+
+def is_store(path):
+    """Check if the path is a store.
+    """
+    return os.path.isfile(os.path.sep.join((path, INDEX_FILE)))
+
+
+class Store(object):
+    """Snapshots, by name, and the tables of values, by hash.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        # Snapshot names, in the order in which they were added, and the hash
+        #  of the table of each.
+        self.names = []
+        self.digests = {}
+
+        if not os.path.isdir(self._fpath(OBJECTS_DIR)):
+            os.makedirs(self._fpath(OBJECTS_DIR))
+        if not is_store(path):
+            io.open(self._fpath(INDEX_FILE), 'w').close()
+
+        for line in utils.f_rd(self._fpath(INDEX_FILE)):
+            name, dig = line.rstrip(const.NEWLINE).split(const.TAB)
+            self._index(name, dig)
+
+    def _fpath(self, *names):
+        return os.path.sep.join((self.path,) + names)
+
+    def _obj_path(self, dig):
+        return self._fpath(OBJECTS_DIR, dig[:2], dig)
+
+    def _index(self, name, dig):
+        if name not in self.digests:
+            self.names.append(name)
+        self.digests[name] = dig
+
+    def __contains__(self, name):
+        return name in self.digests
+
+    def add(self, name, page, table=tables.DELAY):
+        """Add the snapshot's table of values; return the hash of the table, and
+        whether the table was new to the store.
+        """
+        region = extract(page, table)
+        dig = digest(region)
+
+        obj_path = self._obj_path(dig)
+        is_new = not os.path.isfile(obj_path)
+        if is_new:
+            if not os.path.isdir(os.path.dirname(obj_path)):
+                os.makedirs(os.path.dirname(obj_path))
+            tmp_path = "%s.%d.tmp" % (obj_path, os.getpid())
+            with utils.f_wr(tmp_path) as f:
+                f.write(region)
+            os.replace(tmp_path, obj_path)
+
+        with io.open(self._fpath(INDEX_FILE), 'a', encoding='utf-8') as f:
+            f.write(name + const.TAB + dig + const.NEWLINE)
+        self._index(name, dig)
+        return dig, is_new
+
+    def digest_of(self, name):
+        return self.digests[name]
+
+    def load(self, name):
+        """Load the table of values of the snapshot.
+        """
+        with utils.f_rd(self._obj_path(self.digests[name])) as f:
+            return f.read()
+
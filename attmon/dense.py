@@ -0,0 +1,99 @@
+#!/usr/bin/env python
+# -*- mode: python; coding: utf-8; fill-column: 80; -*-
+#
+# dense.py
+# Copyright (c) 2026 The attmon contributors.
+#
+
+"""
+dense.py
+Dense (NumPy-backed) representation of the delay or loss matrices, with missing
+values represented as NaNs, for the computations vectorized over all cells of a
+matrix (e.g., inflation of RTTs) and for the cube (see `cube`); snapshots are
+parsed, completed, and written as dictionaries of dictionaries (see `utils`).
+"""
+
+__author__  = 'The attmon contributors'
+__version__ = '1.0'
+__license__ = 'MIT'
+
+
+from . import cities
+from . import geo
+import numpy as np
+
+
+class CityIndex(object):
+    """Fixed (sorted) list of city codes, and the row (or column) position of
+    each city in a matrix.
+    """
+    __slots__ = ('codes', 'pos')
+
+    def __init__(self, codes):
+        self.codes = tuple(sorted(set(codes)))
+        self.pos = {c: i for i, c in enumerate(self.codes)}
+
+    def __len__(self):
+        return len(self.codes)
+
+    def __eq__(self, other):
+        return self.codes == other.codes
+
+    def __ne__(self, other):
+        return not self == other
+
+
+def city_index(city_data):
+    """Build the city index from the city data (see `utils.load_city_data`);
+    the position of each city is its ID in the registry (see `cities`).
+    """
+    return CityIndex(cities.registry(city_data).codes)
+
+
+class DenseMatrix(object):
+    """Matrix of values, with rows and columns ordered as in the city index.
+    """
+    __slots__ = ('index', 'values')
+
+    def __init__(self, index, values=None):
+        n = len(index)
+        self.index = index
+        self.values = (np.full((n, n), np.nan)
+                       if values is None else values)
+
+
+def from_dict(m, index, missing_val):
+    """Convert a matrix represented as a dictionary of dictionaries.
+    """
+    dm = DenseMatrix(index)
+    pos = index.pos
+    for r in m:
+        i = pos[r]
+        for c in m[r]:
+            dm.values[i, pos[c]] = m[r][c]
+    dm.values[dm.values == missing_val] = np.nan
+    return dm
+
+
+def to_dict(dm, cells=None, missing_val=None):
+    """Convert to a dictionary of dictionaries, leaving out the missing values;
+    if `cells` (a dictionary of dictionaries) is specified, every cell in it is
+    kept instead, with `missing_val` for the missing values.
+    """
+    codes = dm.index.codes
+    vals = dm.values.tolist()
+    if cells is not None:
+        pos = dm.index.pos
+        return {r: {c: (missing_val if v != v else v)
+                    for c, v in ((c, vals[pos[r]][pos[c]]) for c in cells[r])}
+                for r in cells}
+    return {codes[i]: {codes[j]: vals[i][j] for j in np.flatnonzero(row)}
+            for i, row in enumerate(~np.isnan(dm.values))
+            if row.any()}
+
+
+def compute_inf(dm, dist, speed=300.0):
+    """Convert observed RTTs into inflation values using the distance matrix
+    (see `geo.load_distances`).
+    """
+    return DenseMatrix(dm.index, geo.inflation(dm.values, dist, speed))
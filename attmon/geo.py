@@ -0,0 +1,96 @@
+#!/usr/bin/env python
+# -*- mode: python; coding: utf-8; fill-column: 80; -*-
+#
+# geo.py
+# Copyright (c) 2026 The attmon contributors.
+#
+
+"""
+geo.py
+Distances between cities, computed once (vectorized) for all pairs of cities
+and cached on disk, for converting RTTs into inflation values.
+"""
+
+__author__  = 'The attmon contributors'
+__version__ = '1.0'
+__license__ = 'MIT'
+
+
+from . import constants as const
+from . import utils
+import hashlib
+import numpy as np
+import os
+
+
+# Mean Earth radius (in km).
+EARTH_RADIUS = 6371.0
+
+
+def haversine(lat_x, lon_x, lat_y, lon_y):
+    """Calculate the distances (in km) between points, given as arrays of
+    latitudes and longitudes (in degrees), using the Haversine formula.
+    """
+    lat_x, lon_x, lat_y, lon_y = [np.radians(v)
+                                  for v in (lat_x, lon_x, lat_y, lon_y)]
+    a = (np.sin((lat_x - lat_y)/2) ** 2 +
+         np.cos(lat_x) * np.cos(lat_y) * np.sin((lon_x - lon_y)/2) ** 2)
+    return 2 * EARTH_RADIUS * np.arctan2(np.sqrt(a), np.sqrt(1 - a))
+
+
+def distances(index, locs):
+    """Compute the distances between every pair of cities in the index; the
+    distance is NaN if the location of either city is unknown.
+    """
+    coords = np.array([locs.get(c, (np.nan, np.nan)) for c in index.codes],
+                      dtype=np.float64).reshape(len(index), 2)
+    lat, lon = coords[:, 0], coords[:, 1]
+    return haversine(lat[:, None], lon[:, None], lat[None, :], lon[None, :])
+
+
+def cache_key(index, locs_file):
+    """Key identifying the distance matrix of the cities in the index, computed
+    from the given locations file.
+    """
+    h = hashlib.sha1()
+    with open(locs_file, 'rb') as f:
+        h.update(f.read())
+    h.update(const.NEWLINE.join(index.codes).encode('utf-8'))
+    return h.hexdigest()
+
+
+def load_distances(index, locs_file, cache_dir=None):
+    """Return the distance matrix of the cities in the index, computing and
+    caching it if it is not already in the cache; the distances are computed
+    each time if the cache cannot be written.
+    """
+    cache_dir = cache_dir or utils.cache_dir()
+    fpath = os.path.join(cache_dir,
+                         "dist-%s.npy" % (cache_key(index, locs_file)))
+    if os.path.isfile(fpath):
+        return np.load(fpath)
+
+    dist = distances(index, utils.load_locs(locs_file))
+    tmp_path = "%s.%d.tmp" % (fpath, os.getpid())
+    try:
+        if not os.path.isdir(cache_dir):
+            os.makedirs(cache_dir)
+        with open(tmp_path, 'wb') as f:
+            np.save(f, dist)
+        os.replace(tmp_path, fpath)
+    except OSError:
+        # E.g., a read-only or invalid directory; the distances are not cached.
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+    return dist
+
+
+def inflation(rtts, dist, speed=300.0):
+    """Convert RTTs into inflation values, given the distances (in km) and the
+    speed (in km/ms); `rtts` may be a single matrix or a (time x source x
+    destination) cube.
+    """
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return np.round(rtts / ((2 * dist)/speed), const.PREC)
@@ -0,0 +1,190 @@
+#!/usr/bin/env python
+# -*- mode: python; coding: utf-8; fill-column: 80; -*-
+#
+# ingest.py
+# Copyright (c) 2026 The attmon contributors.
+#
+
+"""
+ingest.py
+Parse many snapshots, optionally in parallel using a pool of worker processes.
+"""
+
+__author__  = 'The attmon contributors'
+__version__ = '1.0'
+__license__ = 'MIT'
+
+
+from . import archive
+from . import dedup
+from . import pcache
+from . import profiling
+from . import rttmon
+from . import tables
+from . import utils
+from collections import OrderedDict
+from collections import namedtuple as nt
+import multiprocessing as mp
+
+
+# Metrics to analyze.
+DELAY = tables.DELAY.name
+LOSS  = tables.LOSS.name
+
+# Number of snapshots handed to a worker at a time.
+CHUNK_SIZE = 16
+
+# Number of parsed tables remembered, to skip parsing identical tables.
+MEMO_SIZE = 64
+
+# Parsed snapshot: the file path, the time stamp string (`HHMM-MMDDYYYY`), the
+#  time stamp (seconds since the epoch), the (lower-left triangle) matrix, and
+#  its statistics.
+Snapshot = nt('Snapshot', ('path', 'ts_dt', 'tstamp', 'matrix', 'stats'))
+
+# Parser shared by all snapshots parsed within a worker process.
+_worker_parser = None
+
+
+def load_distances(city_data, locs_file):
+    """Load the (cached) distances between all cities in the city data, as a
+    dense matrix.
+    """
+    # NumPy is required only for computing inflation values.
+    from . import dense
+    from . import geo
+    index = dense.city_index(city_data)
+    return dense.DenseMatrix(index, geo.load_distances(index, locs_file))
+
+
+def inflate(m, dist):
+    """Convert observed RTTs into inflation values using the distance matrix
+    (see `load_distances`); every cell of the matrix is kept, and cells without
+    RTTs have an inflation of 0.0, as in `rttmon.compute_inf`.
+    """
+    # NumPy is required only for computing inflation values.
+    from . import geo
+    import numpy as np
+    pos = dist.index.pos
+    srcs, dsts, rtts = [], [], []
+    for r, row in m.items():
+        i = pos[r]
+        for c, v in row.items():
+            srcs.append(i)
+            dsts.append(pos[c])
+            rtts.append(v)
+    rtts = np.array(rtts, np.float64)
+    rtts[rtts == rttmon.NO_RTT_VAL] = np.nan
+    infs = geo.inflation(rtts, dist.values[srcs, dsts])
+    # Cells without RTTs, or between cities without locations, have an
+    #  inflation of 0.0.
+    infs = np.where(np.isnan(infs), 0.0, infs).tolist()
+    it = iter(infs)
+    return {r: {c: next(it) for c in row} for r, row in m.items()}
+
+
+class SnapshotParser(object):
+    """Parse snapshots, reusing the results of the most recently parsed tables
+    for snapshots with identical tables (see `dedup` and `archive`), and of the
+    tables parsed in earlier runs (see `pcache`), if the directory of the cache
+    `cache_path` is specified; RTTs are converted to inflation values if the
+    distance matrix is provided.
+    """
+
+    def __init__(self, metric, city_data, dist=None, memo_size=MEMO_SIZE,
+                 cache_path=None):
+        self.metric = metric
+        self.table = tables.TABLES[metric]
+        self.city_data = city_data
+        self.dist = dist if metric == DELAY else None
+        self.memo_size = memo_size
+        # Parsed matrix and statistics, by the hash of the table.
+        self.memo = OrderedDict()
+        self.cache = (pcache.open_cache(city_data, cache_path) if cache_path
+                      else None)
+
+    def __call__(self, snap):
+        """Parse a snapshot, an entry returned by `utils.list_snapshots`.
+        """
+        fpath, ts_dt, tstamp = snap
+
+        region = None
+        dig = archive.snapshot_digest(fpath)
+        if dig is None:
+            region = dedup.extract(utils.load_content(fpath), self.table)
+            dig = dedup.digest(region)
+
+        if dig in self.memo:
+            self.memo.move_to_end(dig)
+            m, stats = self.memo[dig]
+            return Snapshot(fpath, ts_dt, tstamp, m, stats)
+
+        if region is None:
+            region = utils.load_content(fpath)
+        if self.cache is not None:
+            m, stats = self.cache.parse(region, dig, self.table)
+        else:
+            m, stats = tables.parse(region, self.city_data, self.table)
+        if self.dist is not None:
+            m = inflate(m, self.dist)
+
+        self.memo[dig] = (m, stats)
+        if len(self.memo) > self.memo_size:
+            self.memo.popitem(last=False)
+        return Snapshot(fpath, ts_dt, tstamp, m, stats)
+
+
+def parse_snapshot(snap, metric, city_data, dist=None):
+    """Parse a snapshot, an entry returned by `utils.list_snapshots`; RTTs are
+    converted to inflation values if the distance matrix is provided.
+    """
+    return SnapshotParser(metric, city_data, dist)(snap)
+
+
+def _init_worker(profiled, *args):
+    """Create the parser, with the city data (and distances), once per worker
+    process; the stages are timed in the worker if `profiled` (see
+    `profiling`).
+    """
+    global _worker_parser
+    _worker_parser = SnapshotParser(*args)
+    if profiled:
+        # Forked workers start with the times and counts of the parent.
+        profiling.enable()
+
+
+def _parse_worker(snap):
+    """Parse a snapshot in a worker process; return the parsed snapshot, and
+    the times and counts of the stages, if profiled.
+    """
+    return _worker_parser(snap), profiling.collect()
+
+
+def ingest(snaps, metric, city_data, dist=None, jobs=1, cache_path=None):
+    """Parse the snapshots using `jobs` worker processes, and yield the parsed
+    snapshots in the same (chronological) order as `snaps`; parsed matrices are
+    cached in `cache_path`, if specified.
+    """
+    if jobs <= 1:
+        parser = SnapshotParser(metric, city_data, dist, MEMO_SIZE, cache_path)
+        for snap in snaps:
+            yield parser(snap)
+        return
+
+    pool = mp.Pool(jobs,
+                   initializer=_init_worker,
+                   initargs=(profiling.enabled(), metric, city_data, dist,
+                             MEMO_SIZE, cache_path))
+    try:
+        # `imap` returns results in the order of submission, irrespective of
+        #  the order in which the workers finish.
+        for res, stages in pool.imap(_parse_worker, snaps, CHUNK_SIZE):
+            if stages:
+                profiling.merge(stages)
+            yield res
+        pool.close()
+    except:
+        pool.terminate()
+        raise
+    finally:
+        pool.join()
@@ -0,0 +1,218 @@
+#!/usr/bin/env python
+# -*- mode: python; coding: utf-8; fill-column: 80; -*-
+#
+# kmerge.py
+# Copyright (c) 2026 The attmon contributors.
+#
+
+"""
+kmerge.py
+Merge files of rows, each sorted by time stamp, into a single stream in time
+order using bounded memory and a bounded number of open files, and write rows
+to per-link files through buffered writers.
+"""
+
+__author__  = 'The attmon contributors'
+__version__ = '1.0'
+__license__ = 'MIT'
+
+
+from collections import OrderedDict
+import heapq
+import io
+import os
+import shutil
+import tempfile
+
+
+# Maximum number of files open at any time, for reading or for writing.
+MAX_OPEN = 64
+
+# Maximum number of rows buffered, across all links, before they are written.
+MAX_ROWS = 1 << 18
+
+# Size of the tail of a file read to find its last row.
+TAIL_SIZE = 4096
+
+
+def _lines(fpath):
+    with io.open(fpath, 'r', encoding='utf-8') as f:
+        for line in f:
+            if line.strip():
+                yield line
+
+
+def _span(fpath, key):
+    """Return the time stamps of the first and last rows of the file, or `None`
+    if the file is empty.
+    """
+    with io.open(fpath, 'rb') as f:
+        head = f.readline()
+        while head and not head.strip():
+            head = f.readline()
+        if not head:
+            return None
+        f.seek(0, os.SEEK_END)
+        f.seek(max(0, f.tell() - TAIL_SIZE))
+        tail = [l for l in f.read().splitlines() if l.strip()][-1]
+    return key(head.decode('utf-8')), key(tail.decode('utf-8'))
+
+
+class Chain(object):
+    """Files, with non-overlapping spans of time stamps, read one after another;
+    only one file is open at any time.
+    """
+
+    def __init__(self):
+        self.fpaths = []
+        self.last = None
+
+    def add(self, fpath, span):
+        self.fpaths.append(fpath)
+        self.last = span[1]
+
+    def rows(self, parse):
+        prev = None
+        for fpath in self.fpaths:
+            for line in _lines(fpath):
+                row = parse(line)
+                if prev is not None and row[0] < prev:
+                    raise ValueError("Rows not sorted by time in %s!" % (fpath))
+                prev = row[0]
+                yield row, line
+
+
+def chains(fpaths, key):
+    """Arrange files in as few chains as possible (in the order of the first
+    time stamp in each file).
+    """
+    spans = [(s, i, fpath)
+             for i, fpath in enumerate(fpaths)
+             for s in (_span(fpath, key),) if s]
+    spans.sort(key=lambda v: (v[0][0], v[1]))
+
+    result = []
+    # Chains, by the last time stamp.
+    heap = []
+    for span, _i, fpath in spans:
+        if heap and heap[0][0] <= span[0]:
+            _last, j = heapq.heappop(heap)
+        else:
+            j = len(result)
+            result.append(Chain())
+        result[j].add(fpath, span)
+        heapq.heappush(heap, (span[1], j))
+    return result
+
+
+def _merge(sources, parse):
+    """Merge the rows of the sources (chains) by time stamp; rows with the same
+    time stamp are yielded in the order of the sources.
+    """
+    iters = [c.rows(parse) for c in sources]
+    heap = []
+    for seq, it in enumerate(iters):
+        for row, line in it:
+            heap.append((row[0], seq, row, line))
+            break
+    heapq.heapify(heap)
+
+    while heap:
+        _key, seq, row, line = heap[0]
+        yield row, line
+        for row, line in iters[seq]:
+            heapq.heapreplace(heap, (row[0], seq, row, line))
+            break
+        else:
+            heapq.heappop(heap)
+
+
+def merge(fpaths, parse, max_open=MAX_OPEN, tmp_dir=None):
+    """Merge the rows of the files, each sorted by time stamp, and yield them in
+    time order as (row, line) tuples, where `row` (whose first element is the
+    time stamp) is the result of `parse` on the line.
+
+    At most `max_open` files are read at any time: files that do not overlap in
+    time are read one after another, and, if more than `max_open` files overlap,
+    groups of files are first merged into temporary files.
+    """
+    key = lambda line: parse(line)[0]
+    sources = chains(fpaths, key)
+    if len(sources) <= max_open:
+        for v in _merge(sources, parse):
+            yield v
+        return
+
+    tmp_dir = tempfile.mkdtemp(prefix='kmerge-', dir=tmp_dir)
+    try:
+        runs = []
+        for i in range(0, len(sources), max_open):
+            run = os.path.sep.join((tmp_dir, "run-%d" % (len(runs))))
+            with io.open(run, 'w', encoding='utf-8') as f:
+                for _row, line in _merge(sources[i:i + max_open], parse):
+                    f.write(line)
+            runs.append(run)
+        for v in merge(runs, parse, max_open, tmp_dir):
+            yield v
+    finally:
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+
+
+class LinkWriter(object):
+    """Write rows to per-link files, buffering up to `max_rows` rows in memory
+    and keeping at most `max_open` files open.
+    """
+
+    def __init__(self, out_path, mode='w', max_open=MAX_OPEN,
+                 max_rows=MAX_ROWS):
+        self.out_path = out_path
+        self.mode = mode
+        self.max_open = max_open
+        self.max_rows = max_rows
+        # Rows buffered, by file name.
+        self.bufs = {}
+        self.num_rows = 0
+        # Open files, in the order of use.
+        self.files = OrderedDict()
+        # Files opened (and, with mode `w`, truncated) earlier.
+        self.seen = set()
+
+    def write(self, fname, line):
+        buf = self.bufs.get(fname)
+        if buf is None:
+            buf = self.bufs[fname] = []
+        buf.append(line)
+        self.num_rows += 1
+        if self.num_rows >= self.max_rows:
+            self.flush()
+
+    def _file(self, fname):
+        f = self.files.pop(fname, None)
+        if f is None:
+            if len(self.files) >= self.max_open:
+                _fname, old = self.files.popitem(last=False)
+                old.close()
+            mode = 'a' if fname in self.seen else self.mode
+            f = io.open(os.path.sep.join((self.out_path, fname)), mode,
+                        encoding='utf-8')
+            self.seen.add(fname)
+        self.files[fname] = f
+        return f
+
+    def flush(self):
+        for fname, buf in self.bufs.items():
+            self._file(fname).write(u''.join(buf))
+        self.bufs = {}
+        self.num_rows = 0
+
+    def close(self):
+        self.flush()
+        for f in self.files.values():
+            f.close()
+        self.files.clear()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
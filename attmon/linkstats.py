@@ -0,0 +1,303 @@
+#!/usr/bin/env python
+# -*- mode: python; coding: utf-8; fill-column: 80; -*-
+#
+# linkstats.py
+# Copyright (c) 2026 The attmon contributors.
+#
+
+"""
+linkstats.py
+Streaming statistics of the delay or loss values observed on each link, which
+use constant memory per link, can be saved and updated as new data arrives, and
+can be merged across workers.
+"""
+
+__author__  = 'The attmon contributors'
+__version__ = '1.0'
+__license__ = 'MIT'
+
+
+from . import constants as const
+from . import utils
+from bisect import bisect_right
+from collections import defaultdict as defdict
+import json
+import math
+import os
+
+
+# Key of the (optional) metadata, on the first line of a file of statistics.
+META_KEY = 'meta'
+
+# Default size of the quantile sketch; quantiles are exact until the sketch
+#  holds more than about `SKETCH_K` values.
+SKETCH_K = 200
+
+# Ratio of the capacities of successive levels of the sketch.
+SKETCH_C = 2.0/3.0
+
+
+class QuantileSketch(object):
+    """Mergeable quantile sketch (KLL): a hierarchy of compactors, where a value
+    at level `h` stands for `2**h` values of the input.
+
+    Compaction is deterministic: the values kept at the next level alternate,
+    on successive compactions of a level, between those at even and odd
+    positions, and so the sketch of the same values is always the same.
+    """
+    __slots__ = ('k', 'levels', 'offsets', 'size', 'max_size')
+
+    def __init__(self, k=SKETCH_K):
+        self.k = k
+        self.levels = []
+        # Position of the first value kept on the next compaction of each level.
+        self.offsets = []
+        self.size = 0
+        self.max_size = 0
+        self._grow()
+
+    def _capacity(self, h):
+        depth = len(self.levels) - h - 1
+        return int(math.ceil(self.k * (SKETCH_C ** depth))) + 1
+
+    def _grow(self):
+        self.levels.append([])
+        self.offsets.append(0)
+        self.max_size = sum(self._capacity(h) for h in range(len(self.levels)))
+
+    def _compress(self):
+        for h, level in enumerate(self.levels):
+            if len(level) < self._capacity(h):
+                continue
+            if h + 1 == len(self.levels):
+                self._grow()
+
+            # Keep every other value at the next level; an odd value out
+            #  remains at this level.
+            level.sort()
+            odd = level.pop() if len(level) % 2 else None
+            self.levels[h + 1].extend(level[self.offsets[h]::2])
+            self.offsets[h] ^= 1
+            self.levels[h] = [odd] if odd is not None else []
+            self.size = sum(len(l) for l in self.levels)
+            return
+
+    def add(self, v):
+        self.levels[0].append(v)
+        self.size += 1
+        if self.size >= self.max_size:
+            self._compress()
+
+    def extend(self, vals):
+        """Add the values, in order; the sketch is the same as that of adding
+        them one at a time, but the values are added in bulk between
+        compactions.
+        """
+        vals = list(vals)
+        beg = 0
+        while beg < len(vals):
+            chunk = vals[beg:beg + max(self.max_size - self.size, 1)]
+            self.levels[0].extend(chunk)
+            self.size += len(chunk)
+            beg += len(chunk)
+            if self.size >= self.max_size:
+                self._compress()
+
+    def merge(self, other):
+        """Merge another sketch into this one.
+        """
+        self.merge_levels(other.levels)
+        while self.size >= self.max_size:
+            self._compress()
+
+    def quantile(self, q):
+        """Estimate the `q`-th quantile (0 <= q <= 1), interpolating linearly
+        between values (as `numpy.percentile` does).
+        """
+        items = sorted((v, 1 << h)
+                       for h, level in enumerate(self.levels)
+                       for v in level)
+        if not items:
+            return None
+
+        vals = [v for v, _w in items]
+        # Rank (0-based) of the last input value each sketch value stands for.
+        ranks = []
+        total = 0
+        for _v, w in items:
+            total += w
+            ranks.append(total - 1)
+
+        pos = q * (total - 1)
+        lo = int(math.floor(pos))
+        hi = min(lo + 1, total - 1)
+        vlo = vals[bisect_right(ranks, lo - 1)]
+        vhi = vals[bisect_right(ranks, hi - 1)]
+        return vlo + (vhi - vlo) * (pos - lo)
+
+    def to_list(self):
+        return [list(level) for level in self.levels]
+
+    def merge_levels(self, levels):
+        """Add the values, by level, of a (saved) sketch.
+        """
+        while len(self.levels) < len(levels):
+            self._grow()
+        for h, level in enumerate(levels):
+            self.levels[h].extend(level)
+        self.size = sum(len(l) for l in self.levels)
+
+
+class LinkStats(object):
+    """Running count, mean and variance (Welford's method), minimum, maximum,
+    number of values exceeding a threshold, and a quantile sketch of the values.
+    """
+    __slots__ = ('count', 'mean', 'm2', 'min', 'max', 'exceed', 'thresh',
+                 'sketch')
+
+    def __init__(self, thresh=0.0, k=SKETCH_K):
+        self.count = 0
+        self.mean = 0.0
+        # Sum of squared deviations from the mean.
+        self.m2 = 0.0
+        self.min = None
+        self.max = None
+        self.exceed = 0
+        self.thresh = thresh
+        self.sketch = QuantileSketch(k)
+
+    def add(self, v):
+        self.count += 1
+        delta = v - self.mean
+        self.mean += delta/self.count
+        self.m2 += delta * (v - self.mean)
+        if self.min is None or v < self.min:
+            self.min = v
+        if self.max is None or v > self.max:
+            self.max = v
+        if v > self.thresh:
+            self.exceed += 1
+        self.sketch.add(v)
+
+    def extend(self, vals):
+        """Add the values in bulk.
+        """
+        vals = list(vals)
+        if not vals:
+            return self
+        other = LinkStats(self.thresh, self.sketch.k)
+        other.count = len(vals)
+        other.mean = math.fsum(vals)/other.count
+        other.m2 = math.fsum((v - other.mean)**2 for v in vals)
+        other.min, other.max = min(vals), max(vals)
+        other.exceed = sum(1 for v in vals if v > self.thresh)
+        other.sketch.extend(vals)
+        return self.merge(other)
+
+    def merge(self, other):
+        """Merge the statistics computed (e.g., by another worker) on a separate
+        set of values of the same link.
+        """
+        if not other.count:
+            return self
+        if not self.count:
+            self.min, self.max = other.min, other.max
+        else:
+            self.min = min(self.min, other.min)
+            self.max = max(self.max, other.max)
+
+        count = self.count + other.count
+        delta = other.mean - self.mean
+        self.mean += delta * other.count/count
+        self.m2 += other.m2 + delta * delta * self.count * other.count/count
+        self.count = count
+        self.exceed += other.exceed
+        self.sketch.merge(other.sketch)
+        return self
+
+    def avg(self):
+        return self.mean
+
+    def std(self, ddof=1):
+        """Standard deviation; sample standard deviation by default, and
+        population standard deviation with `ddof` set to 0.
+        """
+        if self.count <= ddof:
+            return 0.0
+        return math.sqrt(self.m2/(self.count - ddof))
+
+    def exceed_pct(self):
+        """Percentage of values exceeding the threshold.
+        """
+        return 100.0*self.exceed/self.count
+
+    def percentile(self, p):
+        return self.sketch.quantile(p/100.0)
+
+    def to_dict(self):
+        return {'count': self.count, 'mean': self.mean, 'm2': self.m2,
+                'min': self.min, 'max': self.max, 'exceed': self.exceed,
+                'thresh': self.thresh, 'sketch': self.sketch.to_list()}
+
+    @classmethod
+    def from_dict(cls, d, k=SKETCH_K):
+        ls = cls(d['thresh'], k)
+        ls.count, ls.mean, ls.m2 = d['count'], d['mean'], d['m2']
+        ls.min, ls.max, ls.exceed = d['min'], d['max'], d['exceed']
+        ls.sketch.merge_levels(d['sketch'])
+        return ls
+
+
+def new_links(thresh=0.0):
+    """Running statistics of links, by (source, destination).
+    """
+    return defdict(lambda: LinkStats(thresh))
+
+
+def merge_links(links, other):
+    """Merge the statistics of links computed separately (e.g., by workers).
+    """
+    for src_dst, ls in other.items():
+        links[src_dst].merge(ls)
+    return links
+
+
+def load(fpath, thresh=0.0):
+    """Load the statistics of links from file, if it exists.
+    """
+    return read(fpath, thresh)[0]
+
+
+def read(fpath, thresh=0.0):
+    """Load the statistics of links, and the metadata saved with them (see
+    `save`), from file, if it exists.
+    """
+    links, meta = new_links(thresh), None
+    if not os.path.isfile(fpath):
+        return links, meta
+
+    for line in utils.f_rd(fpath):
+        d = json.loads(line)
+        if META_KEY in d:
+            meta = d[META_KEY]
+            continue
+        links[(d.pop('src'), d.pop('dst'))] = LinkStats.from_dict(d)
+    return links, meta
+
+
+def save(fpath, links, meta=None):
+    """Save the statistics of links to file, one link per line, preceded by the
+    metadata, if specified (e.g., what the statistics were computed from); the
+    file is replaced at once, so that the statistics and the metadata are
+    updated together, and readers never see the file partially written.
+    """
+    tmp_path = "%s.tmp" % (fpath)
+    with utils.f_wr(tmp_path) as out:
+        if meta is not None:
+            out.write(json.dumps({META_KEY: meta}, sort_keys=True) +
+                      const.NEWLINE)
+        for (src, dst), ls in sorted(links.items()):
+            d = ls.to_dict()
+            d['src'], d['dst'] = src, dst
+            out.write(json.dumps(d, sort_keys=True) + const.NEWLINE)
+    os.replace(tmp_path, fpath)
@@ -0,0 +1,104 @@
+#!/usr/bin/env python
+# -*- mode: python; coding: utf-8; fill-column: 80; -*-
+#
+# manifest.py
+# Copyright (c) 2026 The attmon contributors.
+#
+
+"""
+manifest.py
+Keep track of the (snapshot or data) files already processed, so that repeated
+runs process only new arrivals. A file modified after it was processed is not
+a new arrival: its data was already used, and the caller decides whether to
+process all files again or to skip the file.
+"""
+
+__author__  = 'The attmon contributors'
+__version__ = '1.0'
+__license__ = 'MIT'
+
+
+from . import constants as const
+from . import utils
+import io
+import os
+
+
+def signature(fpath):
+    """Return the size and modification time (in ns) of the file.
+    """
+    if not os.path.exists(fpath):
+        # Snapshots in an archive or a store (see `archive`) are never
+        #  modified.
+        return (0, 0)
+    st = os.stat(fpath)
+    return (st.st_size, st.st_mtime_ns)
+
+
+class Manifest(object):
+    """Record of processed files, identified by their names, sizes, and
+    modification times; the record is a text file, with one line per file. The
+    record may instead be kept elsewhere (e.g., with the results of processing
+    the files), and passed as `entries`.
+    """
+
+    def __init__(self, path, entries=None):
+        self.path = path
+        # File name to signature.
+        self.entries = {}
+        if entries is not None:
+            self.entries = {name: tuple(sig) for name, sig in entries.items()}
+        elif os.path.isfile(path):
+            for line in utils.f_rd(path):
+                name, size, mtime = line.rstrip(const.NEWLINE).split(const.TAB)
+                self.entries[name] = (int(size), int(mtime))
+
+    def is_processed(self, fpath):
+        """Check if the file, in its current state, was already processed.
+        """
+        return self.entries.get(os.path.basename(fpath)) == signature(fpath)
+
+    def is_modified(self, fpath):
+        """Check if the file was processed, but modified since.
+        """
+        sig = self.entries.get(os.path.basename(fpath))
+        return sig is not None and sig != signature(fpath)
+
+    def pending(self, fpaths):
+        """Return the files never processed; files modified since they were
+        processed are not included (see `modified`).
+        """
+        return [f for f in fpaths if os.path.basename(f) not in self.entries]
+
+    def modified(self, fpaths):
+        """Return the files modified since they were processed.
+        """
+        return [f for f in fpaths if self.is_modified(f)]
+
+    def _line(self, name):
+        return (const.TAB.join([name] + [str(v) for v in self.entries[name]]) +
+                const.NEWLINE)
+
+    def record(self, fpaths):
+        """Record the files as processed, without writing the record (see
+        `save`).
+        """
+        for fpath in fpaths:
+            self.entries[os.path.basename(fpath)] = signature(fpath)
+
+    def add(self, fpaths):
+        """Record the files as processed.
+        """
+        self.record(fpaths)
+        with io.open(self.path, 'a', encoding='utf-8') as out:
+            for fpath in fpaths:
+                out.write(self._line(os.path.basename(fpath)))
+
+    def save(self):
+        """Write the record of all files processed, replacing the file at once.
+        """
+        tmp_path = "%s.tmp" % (self.path)
+        with io.open(tmp_path, 'w', encoding='utf-8') as out:
+            for name in sorted(self.entries):
+                out.write(self._line(name))
+        os.replace(tmp_path, self.path)
@@ -0,0 +1,249 @@
+#!/usr/bin/env python
+# -*- mode: python; coding: utf-8; fill-column: 80; -*-
+#
+# merge.py
+# Copyright (c) 2026 The attmon contributors.
+#
+
+"""
+merge.py
+Merge the (time-stamped) delay or loss data files written by `attmon.py batch`,
+write the data for each link into a separate file, and summarize the links.
+"""
+
+__author__  = 'The attmon contributors'
+__version__ = '1.0'
+__license__ = 'MIT'
+
+
+from . import kmerge
+from . import linkstats
+from . import manifest
+from . import tables
+from . import utils
+import heapq
+import io
+import os
+import shutil
+import sys
+
+
+HYPHEN = u'-'
+
+# Extension of the file, next to the manifest, with the statistics of links.
+LINKS_EXT = '.links'
+
+# Extension of the file, next to the manifest, that exists while an
+#  incremental merge appends to the output.
+MERGING_EXT = '.merging'
+
+# Number of links reported in the summary, for each statistic.
+TOP_K = 5
+
+# Statistics reported in the summary of each metric, as (title, function of
+#  the running statistics of a link) tuples.
+SUMMARIES = {
+    tables.DELAY.name: (
+        ('highest average latency', lambda ls: ls.avg()),
+        ('highest standard deviation of latency', lambda ls: ls.std()),
+        ('maximum observed latency', lambda ls: ls.max),
+    ),
+    tables.LOSS.name: (
+        ('highest average loss', lambda ls: ls.avg()),
+        ('most frequent losses', lambda ls: ls.exceed_pct()),
+        ('maximum observed loss', lambda ls: ls.max),
+    ),
+}
+
+
+def row_parser(metric):
+    """Return the parser of rows of data of the metric; the parser returns the
+    time stamp, the link, and the value.
+    """
+    conv = tables.TABLES[metric].conv
+
+    def parse_row(line):
+        # Data format (time stamp in seconds since the epoch):
+        # 1500678900 US-AZ-PHOENIX US-CA-LOSANGELES 11
+        # 1500678900 US-AZ-PHOENIX US-CO-DENVER 37
+        # or, in older files, with the time stamp as month, day, year, hour,
+        #  and minute:
+        # 07 21 2017 23 15 US-AZ-PHOENIX US-CA-LOSANGELES 11
+
+        cols = line.split()
+        tstamp = int(cols[0]) if len(cols) == 4 else utils.to_epoch(cols[:5])
+        data = conv(cols[-1])
+        src_dst = tuple(cols[-3:-1])
+        return tstamp, src_dst, data
+
+    return parse_row
+
+
+def write_links(fpaths, out_path, link_stats, parse_row, mode='w'):
+    """Merge the data in the files, in time order, and write data on each link
+    to a separate file in the output directory, updating the statistics of the
+    links; with mode `a`, the data is appended to the existing files. Return
+    the last time stamp in the data, or `None` if there is no data.
+
+    The files are merged as streams, since each is sorted by time, so that
+    memory use does not grow with the number or size of the files.
+    """
+    tstamp = None
+    with kmerge.LinkWriter(out_path, mode) as out:
+        for (tstamp, src_dst, data), _line in kmerge.merge(fpaths, parse_row):
+            out.write(HYPHEN.join(src_dst), u"%d %s\n" % (tstamp, str(data)))
+            link_stats[src_dst].add(data)
+    return tstamp
+
+
+def first_tstamp(fpath, parse_row):
+    """Return the first time stamp in the data file, or `None` if it is empty.
+    """
+    with io.open(fpath, 'r', encoding='utf-8') as f:
+        for line in f:
+            if line.strip():
+                return parse_row(line)[0]
+    return None
+
+
+def must_remerge(mf, fpaths, parse_row, last_ts, marker):
+    """Check if all files must be merged again, rather than appending the files
+    not yet merged to the output: if a file was modified since it was merged,
+    if a new file has data not newer than the data already merged (appending it
+    would break the time order of the data of links), or if the last run was
+    interrupted (leaving `marker` behind).
+    """
+    # The data of a modified file is already in the output, and every link may
+    #  have data from the file.
+    modified = mf.modified(fpaths)
+    if modified:
+        sys.stderr.write(("warning: %d file(s) modified since merged " +
+                          "(e.g., %s); merging all files again\n") %
+                         (len(modified), os.path.basename(modified[0])))
+        return True
+
+    if last_ts is not None:
+        late = [f for f in mf.pending(fpaths)
+                for ts in (first_tstamp(f, parse_row),)
+                if ts is not None and ts <= last_ts]
+        if late:
+            sys.stderr.write(("warning: %d file(s) with data older than " +
+                              "the data merged (e.g., %s); merging all " +
+                              "files again\n") %
+                             (len(late), os.path.basename(late[0])))
+            return True
+
+    if os.path.exists(marker):
+        sys.stderr.write("warning: the last merge was interrupted; " +
+                         "merging all files again\n")
+        return True
+    return False
+
+
+def summarize(link_stats, metric, out):
+    """Summarize the data using simple statistics.
+    """
+    for title, stat in SUMMARIES[metric]:
+        vals = [(stat(ls), src_dst) for src_dst, ls in link_stats.items()]
+        # Only the top links are reported; select them without sorting all
+        #  links.
+        vals = heapq.nlargest(TOP_K, vals, key=lambda v: v[0])
+
+        out.write(u"*** links with %s\n" % (title))
+        for v, k in vals:
+            out.write(u"    %4.2f %20s => %s\n" % (v, k[0], k[1]))
+
+
+def main(args):
+    """Merge the data of `args.metric`.
+    """
+    if args.metric not in SUMMARIES:
+        raise ValueError("Unsupported Metric: %s" % (args.metric))
+
+    in_path = os.path.abspath(args.in_path)
+    out_path = os.path.abspath(args.out_path)
+
+    if not os.path.isdir(in_path):
+        raise ValueError("Invalid input path!")
+
+    fpaths = [os.path.sep.join((in_path, fname))
+              for fname in os.listdir(in_path)]
+
+    # Process only the files not merged in earlier runs.
+    mf = None
+    wipe = args.wipe
+    parse_row = row_parser(args.metric)
+    link_stats = linkstats.new_links()
+    last_ts = None
+    if args.manifest:
+        stats_file = args.manifest + LINKS_EXT
+        marker = args.manifest + MERGING_EXT
+        # The record of the files merged, and the last time stamp in them, are
+        #  saved with the statistics of links, so that the two always agree.
+        link_stats, meta = linkstats.read(stats_file)
+        mf = manifest.Manifest(args.manifest, meta['files'] if meta else None)
+        last_ts = meta['last_ts'] if meta else None
+        if not wipe:
+            wipe = must_remerge(mf, fpaths, parse_row, last_ts, marker)
+        if wipe:
+            for fpath in (args.manifest, stats_file):
+                if os.path.isfile(fpath):
+                    os.remove(fpath)
+            mf = manifest.Manifest(args.manifest)
+            link_stats, last_ts = linkstats.new_links(), None
+        fpaths = mf.pending(fpaths)
+
+    if os.path.isdir(out_path) and wipe:
+        shutil.rmtree(out_path)
+    if not os.path.isdir(out_path):
+        os.mkdir(out_path)
+
+    if mf:
+        # Left behind if the run is interrupted while appending to the output.
+        io.open(marker, 'w').close()
+    ts = write_links(fpaths, out_path, link_stats, parse_row,
+                     'a' if mf else 'w')
+
+    if mf:
+        mf.record(fpaths)
+        if ts is not None:
+            last_ts = ts if last_ts is None else max(last_ts, ts)
+        linkstats.save(stats_file, link_stats,
+                       {'files': mf.entries, 'last_ts': last_ts})
+        mf.save()
+        os.remove(marker)
+
+    sumf = args.sum_file
+    if not sumf:
+        sumf = sys.stdout
+    else:
+        sumf = io.open(sumf, 'w', encoding='utf-8')
+
+    with sumf:
+        summarize(link_stats, args.metric, sumf)
+
+
+def add_arguments(parser):
+    """Add the arguments of the merge, except the metric, to the command-line
+    parser.
+    """
+    parser.add_argument('in_path', metavar='in_path',
+                        type=str,
+                        help='Input path containing the data files')
+    parser.add_argument('out_path', metavar='out_path',
+                        type=str,
+                        help='Output path')
+    parser.add_argument('--wipe', dest='wipe',
+                        action='store_true',
+                        default=False,
+                        help='Wipe clean the output path prior to run')
+    parser.add_argument('--summary', dest='sum_file', metavar='summary_file',
+                        type=str,
+                        help='Output file for summaries')
+    parser.add_argument('--incremental', dest='manifest', metavar='manifest',
+                        type=str,
+                        help=('Merge only the files not recorded in ' +
+                              'the manifest, and append to the output; ' +
+                              'all files are merged again if any was ' +
+                              'modified since it was merged, or has data ' +
+                              'older than the data merged'))
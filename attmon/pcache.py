@@ -0,0 +1,284 @@
+#!/usr/bin/env python
+# -*- mode: python; coding: utf-8; fill-column: 80; -*-
+#
+# pcache.py
+# Copyright (c) 2026 The attmon contributors.
+#
+
+"""
+pcache.py
+On-disk cache of parsed matrices, so that a snapshot parsed once is not parsed
+again (e.g., when re-run with different output options). The cache is used
+only if enabled (see `--parse-cache`): a cold run pays for hashing and writing
+every entry, and gains only when the snapshots are parsed again.
+
+An entry is keyed by the hash of the snapshot's table of values (see `dedup`),
+the hash of the city data, and the version of the parser; it holds the matrix
+and its statistics in a compact binary form. The least recently used entries are
+evicted once the cache exceeds its size limit, set (in MiB) by the environment
+variable `ATTMON_PARSE_CACHE_SIZE`; a limit of 0 disables the cache. A cache
+that cannot be read or written (e.g., in a read-only directory) is skipped, and
+snapshots are parsed as without a cache.
+"""
+
+__author__  = 'The attmon contributors'
+__version__ = '1.0'
+__license__ = 'MIT'
+
+
+from . import dedup
+from . import stats
+from . import tables
+from . import utils
+import array
+import hashlib
+import json
+import os
+import struct
+import sys
+
+
+# Sub-directory, of the cache directory, holding the parsed matrices.
+CACHE_SUBDIR = 'parsed'
+
+# Size limit (in MiB) of the cache, unless overridden by the environment
+#  variable.
+MAX_SIZE = 64
+MAX_SIZE_ENV = 'ATTMON_PARSE_CACHE_SIZE'
+
+# Fraction of the size limit to which the cache is shrunk on eviction, so that
+#  entries are not evicted on every addition to a full cache.
+LOW_WATER = 0.75
+
+# Extension of the entries.
+ENTRY_EXT = '.bin'
+
+# Header of an entry: magic, length of the metadata (JSON), and the type codes
+#  of the indices and of the values.
+MAGIC = b'APC1'
+HEADER = struct.Struct('<4sIcc')
+
+# Type code of the values of each table.
+VAL_TYPES = {
+    tables.DELAY.name: 'q',
+    tables.LOSS.name: 'd',
+}
+
+# Type code of the indices (into the list of cities) of the matrix cells.
+IDX_TYPE = 'H'
+
+
+def city_digest(city_data):
+    """Hash of the city data (the mappings from abbreviations and names to city
+    codes).
+    """
+    abbrvs, cnames = city_data
+    s = json.dumps([sorted(abbrvs.items()), sorted(cnames.items())])
+    return hashlib.sha1(s.encode('utf-8')).hexdigest()
+
+
+def encode(m, st, table):
+    """Encode the (lower-left triangle) matrix and its statistics.
+    """
+    # City codes, in the order of first appearance, and index of each.
+    codes, pos = [], {}
+    rows = []
+    idx = array.array(IDX_TYPE)
+    vals = array.array(VAL_TYPES[table.name])
+    for src, row in m.items():
+        for c in (src,) + tuple(row):
+            if c not in pos:
+                pos[c] = len(codes)
+                codes.append(c)
+        rows.append((pos[src], len(row)))
+        idx.extend(pos[dst] for dst in row)
+        vals.extend(row.values())
+    if sys.byteorder != 'little':
+        idx.byteswap()
+        vals.byteswap()
+
+    meta = json.dumps({'codes': codes, 'rows': rows,
+                       'stats': list(st)}).encode('utf-8')
+    return b''.join((HEADER.pack(MAGIC, len(meta), IDX_TYPE.encode('ascii'),
+                                 VAL_TYPES[table.name].encode('ascii')),
+                     meta, idx.tobytes(), vals.tobytes()))
+
+
+def decode(buf):
+    """Decode the matrix and its statistics encoded by `encode`.
+    """
+    magic, meta_len, idx_type, val_type = HEADER.unpack_from(buf)
+    if magic != MAGIC:
+        raise ValueError('Unknown format of cache entry!')
+    pos = HEADER.size
+    meta = json.loads(buf[pos:pos + meta_len].decode('utf-8'))
+    pos += meta_len
+
+    idx = array.array(idx_type.decode('ascii'))
+    vals = array.array(val_type.decode('ascii'))
+    n = sum(count for _src, count in meta['rows'])
+    idx.frombytes(buf[pos:pos + n*idx.itemsize])
+    pos += n*idx.itemsize
+    vals.frombytes(buf[pos:pos + n*vals.itemsize])
+    if len(idx) != n or len(vals) != n:
+        raise ValueError('Truncated cache entry!')
+    if sys.byteorder != 'little':
+        idx.byteswap()
+        vals.byteswap()
+
+    # Codes are interned, as in the city registry (see `cities`).
+    codes = [sys.intern(c) for c in meta['codes']]
+    m, beg = {}, 0
+    for src, count in meta['rows']:
+        end = beg + count
+        m[codes[src]] = dict(zip([codes[i] for i in idx[beg:end]],
+                                 vals[beg:end]))
+        beg = end
+    return m, stats.Stats(*meta['stats'])
+
+
+class ParseCache(object):
+    """Parsed matrices, and their statistics, of snapshots parsed using the
+    city data, in the directory `path`; the least recently used entries are
+    evicted once the size of the cache exceeds `max_size` bytes.
+    """
+
+    def __init__(self, city_data, path=None, max_size=MAX_SIZE << 20):
+        self.city_data = city_data
+        self.city_dig = city_digest(city_data)
+        self.path = path or default_path()
+        self.max_size = max_size
+        # Size of the cache, computed on the first addition.
+        self.size = None
+
+    def key(self, dig, table):
+        """Key of the matrix of `table` in the snapshot whose table of values
+        has hash `dig`.
+        """
+        s = "%s:%s:%s:%d" % (dig, self.city_dig, table.name, tables.VERSION)
+        return hashlib.sha1(s.encode('utf-8')).hexdigest()
+
+    def _fpath(self, key):
+        return os.path.join(self.path, key + ENTRY_EXT)
+
+    def get(self, key):
+        """Return the matrix and its statistics, if in the cache.
+        """
+        fpath = self._fpath(key)
+        try:
+            with open(fpath, 'rb') as f:
+                buf = f.read()
+        except OSError:
+            return None
+        try:
+            # The modification time marks the last use, for eviction.
+            os.utime(fpath)
+        except OSError:
+            pass
+        try:
+            return decode(buf)
+        except (ValueError, KeyError, struct.error):
+            # Corrupt entry; it is replaced once the snapshot is parsed.
+            return None
+
+    def put(self, key, m, st, table):
+        """Add the matrix and its statistics to the cache; return whether it
+        was added.
+        """
+        buf = encode(m, st, table)
+        fpath = self._fpath(key)
+        tmp_path = "%s.%d.tmp" % (fpath, os.getpid())
+        try:
+            if not os.path.isdir(self.path):
+                os.makedirs(self.path, exist_ok=True)
+            with open(tmp_path, 'wb') as f:
+                f.write(buf)
+            os.replace(tmp_path, fpath)
+
+            if self.size is None:
+                self.size = sum(size for _mtime, size, _fpath in self.entries())
+            else:
+                self.size += len(buf)
+            if self.size > self.max_size:
+                self.evict(int(self.max_size * LOW_WATER))
+        except OSError:
+            # E.g., a read-only or invalid directory; the matrix is not cached.
+            try:
+                os.remove(tmp_path)
+            except OSError:
+                pass
+            return False
+        return True
+
+    def entries(self):
+        """Return the entries as (modification time, size, path) tuples.
+        """
+        entries = []
+        for fname in os.listdir(self.path):
+            if not fname.endswith(ENTRY_EXT):
+                continue
+            fpath = os.path.join(self.path, fname)
+            try:
+                st = os.stat(fpath)
+            except OSError:
+                # Evicted by another process.
+                continue
+            entries.append((st.st_mtime_ns, st.st_size, fpath))
+        return entries
+
+    def evict(self, size):
+        """Remove the least recently used entries until the size of the cache
+        is at most `size` bytes.
+        """
+        entries = sorted(self.entries())
+        total = sum(size for _mtime, size, _fpath in entries)
+        for _mtime, fsize, fpath in entries:
+            if total <= size:
+                break
+            try:
+                os.remove(fpath)
+            except OSError:
+                pass
+            total -= fsize
+        self.size = total
+
+    def parse(self, region, dig, table):
+        """Return the matrix of `table`, and its statistics, in the table of
+        values `region` with hash `dig`, parsing it only if not in the cache.
+        """
+        key = self.key(dig, table)
+        res = self.get(key)
+        if res is None:
+            res = tables.parse(region, self.city_data, table)
+            self.put(key, res[0], res[1], table)
+        return res
+
+
+def max_size():
+    """Size limit (in bytes) of the cache, set by the environment variable.
+    """
+    return int(float(os.environ.get(MAX_SIZE_ENV, MAX_SIZE)) * (1 << 20))
+
+
+def default_path():
+    """Return the default directory of the cache.
+    """
+    return os.path.join(utils.cache_dir(), CACHE_SUBDIR)
+
+
+def open_cache(city_data, path=None):
+    """Return the cache, in the directory `path` (default: `default_path()`),
+    of matrices parsed using the city data, or `None` if the cache is disabled.
+    """
+    size = max_size()
+    return ParseCache(city_data, path, max_size=size) if size > 0 else None
+
+
+def parse_page(page, city_data, table, cache=None):
+    """Parse the matrix of `table` on the page, and its statistics, using the
+    cache, if specified.
+    """
+    if cache is None:
+        return tables.parse(page, city_data, table)
+    region = dedup.extract(page, table)
+    return cache.parse(region, dedup.digest(region), table)
@@ -0,0 +1,270 @@
+#!/usr/bin/env python
+# -*- mode: python; coding: utf-8; fill-column: 80; -*-
+#
+# profiling.py
+# Copyright (c) 2026 The attmon contributors.
+#
+
+"""
+profiling.py
+Time the stages of the pipeline (reading, parsing, completing matrices,
+computing inflation, and writing), and count the files, rows, cells, and bytes
+each processes; lookups of parsed matrices in the cache (see `pcache`) count
+the hits.
+
+The functions of each stage are wrapped with timers only when profiling is
+enabled, so that profiling costs nothing otherwise. Stages are not nested;
+when snapshots are parsed by worker processes (see `ingest`), the stage times
+of the workers are added up, and may exceed the elapsed time of the run.
+"""
+
+__author__  = 'The attmon contributors'
+__version__ = '1.0'
+__license__ = 'MIT'
+
+
+import functools
+import importlib
+import io
+import resource
+import sys
+import time
+
+
+# Counters of the items processed in each stage.
+COUNTERS = ('files', 'rows', 'cells', 'bytes', 'hits')
+
+
+def _cells(m):
+    return sum(len(r) for r in m.values())
+
+
+# Stages timed, as (stage, module, function, counter) tuples; the counter
+#  returns the number of items processed by a call, by name, from the arguments
+#  and the result of the call. Functions of modules requiring NumPy are timed
+#  only if NumPy is available.
+HOOKS = (
+    # Pages are ASCII, and so characters are bytes.
+    ('load_content', 'attmon.utils', 'load_content',
+     lambda args, res: {'files': 1, 'bytes': len(res)}),
+    ('parse_cache', 'attmon.pcache', 'ParseCache.get',
+     lambda args, res: {'hits': int(res is not None),
+                        'rows': len(res[0]) if res else 0,
+                        'cells': _cells(res[0]) if res else 0}),
+    ('parse', 'attmon.tables', 'parse',
+     lambda args, res: {'bytes': len(args[0]), 'rows': len(res[0]),
+                        'cells': _cells(res[0])}),
+    ('complete_matrix', 'attmon.utils', 'complete_matrix',
+     lambda args, res: {'rows': len(args[0]), 'cells': _cells(args[0])}),
+    ('compute_inf', 'attmon.rttmon', 'compute_inf',
+     lambda args, res: {'rows': len(args[0]), 'cells': _cells(args[0])}),
+    ('compute_inf', 'attmon.ingest', 'inflate',
+     lambda args, res: {'rows': len(args[0]), 'cells': _cells(args[0])}),
+    ('write_adj_list', 'attmon.utils', 'write_adj_list',
+     lambda args, res: {'rows': len(args[0])}),
+    ('write_adj_list', 'attmon.utils', 'write_tstamped_adj_list',
+     lambda args, res: {'rows': len(args[0])}),
+    ('write_gp_data', 'attmon.utils', 'gen_gp_data',
+     lambda args, res: {'rows': len(args[0]), 'cells': _cells(args[0])}),
+    ('write_stats', 'attmon.utils', 'write_tstamped_stats',
+     lambda args, res: {'rows': 1}),
+    ('write_stats', 'attmon.linkstats', 'save',
+     lambda args, res: {'files': 1, 'rows': len(args[1])}),
+    ('write_columns', 'attmon.columnar', 'ColumnWriter.write',
+     lambda args, res: {'rows': len(args[2])}),
+    ('write_columns', 'attmon.columnar', 'ColumnWriter.close',
+     lambda args, res: {'files': 1}),
+    # Values are stored as 4-byte floats in the cube.
+    ('write_cube', 'attmon.cube', 'Cube.append',
+     lambda args, res: {'rows': 1, 'cells': args[2].values.size,
+                        'bytes': args[2].values.size * 4}),
+    ('write_links', 'attmon.kmerge', 'LinkWriter.flush',
+     lambda args, res: {'files': len(args[0].bufs),
+                        'rows': args[0].num_rows}),
+)
+
+# Functions whose items are counted before the call, since the call discards
+#  them (e.g., the rows buffered for writing).
+COUNT_BEFORE = ('LinkWriter.flush',)
+
+# Original functions, by (module, function), while profiling is enabled.
+_originals = {}
+
+# Time spent, and items processed, by stage.
+_stages = {}
+
+# Start of the run.
+_start = None
+
+
+def _timed(stage, fn, count, before=False):
+    @functools.wraps(fn)
+    def wrapper(*args, **kwargs):
+        counts = count(args, None) if before else None
+        t = time.perf_counter()
+        res = fn(*args, **kwargs)
+        elapsed = time.perf_counter() - t
+        rec = _stages.get(stage)
+        if rec is None:
+            rec = _stages[stage] = dict.fromkeys(COUNTERS, 0)
+            rec.update(calls=0, secs=0.0)
+        rec['calls'] += 1
+        rec['secs'] += elapsed
+        for k, v in (counts or count(args, res)).items():
+            rec[k] += v
+        return res
+    return wrapper
+
+
+def _resolve(mod_name, fn_name):
+    """Return the object (module or class) holding the function, and the name
+    of the function within it.
+    """
+    obj = importlib.import_module(mod_name)
+    parts = fn_name.split('.')
+    for part in parts[:-1]:
+        obj = getattr(obj, part)
+    return obj, parts[-1]
+
+
+def enabled():
+    return _start is not None
+
+
+def enable():
+    """Wrap the functions of all stages with timers (if not already wrapped),
+    and reset the times and counts.
+    """
+    global _start
+    if not _originals:
+        for stage, mod_name, fn_name, count in HOOKS:
+            try:
+                obj, name = _resolve(mod_name, fn_name)
+            except ImportError:
+                continue
+            fn = getattr(obj, name)
+            _originals[(mod_name, fn_name)] = (obj, name, fn)
+            setattr(obj, name, _timed(stage, fn, count,
+                                      fn_name in COUNT_BEFORE))
+    _stages.clear()
+    _start = time.perf_counter()
+
+
+def disable():
+    """Restore the original functions of all stages.
+    """
+    global _start
+    for obj, name, fn in _originals.values():
+        setattr(obj, name, fn)
+    _originals.clear()
+    _start = None
+
+
+def collect():
+    """Return, and reset, the times and counts of the stages; `None` if
+    profiling is disabled.
+    """
+    if not enabled():
+        return None
+    stages = {k: dict(v) for k, v in _stages.items()}
+    _stages.clear()
+    return stages
+
+
+def merge(stages):
+    """Add the times and counts of the stages, as returned by `collect` (e.g.,
+    in a worker process).
+    """
+    for stage, rec in stages.items():
+        if stage not in _stages:
+            _stages[stage] = dict(rec)
+            continue
+        for k, v in rec.items():
+            _stages[stage][k] += v
+
+
+def report():
+    """Return the elapsed time of the run, its peak memory, and the times and
+    counts of the stages.
+    """
+    # Linux reports the peak resident set size in kilobytes.
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+    return {'secs': time.perf_counter() - _start if enabled() else 0.0,
+            'peak_bytes': peak,
+            'stages': {k: dict(v) for k, v in _stages.items()}}
+
+
+def write_summary(rep, out):
+    """Write the report, as returned by `report`, as a table.
+    """
+    out.write("%-16s %8s %10s %7s %8s %10s %12s %14s %8s\n" %
+              ('stage', 'calls', 'time (s)', 'share', 'files', 'rows', 'cells',
+               'bytes', 'hits'))
+    total = rep['secs'] or 1.0
+    stages = sorted(rep['stages'].items(), key=lambda v: -v[1]['secs'])
+    for stage, rec in stages:
+        out.write("%-16s %8d %10.3f %6.1f%% %8d %10d %12d %14d %8d\n" %
+                  (stage, rec['calls'], rec['secs'], 100.0 * rec['secs']/total,
+                   rec['files'], rec['rows'], rec['cells'], rec['bytes'],
+                   rec['hits']))
+    # Time outside of the stages (e.g., merging rows), unless stages ran in
+    #  worker processes.
+    other = rep['secs'] - sum(rec['secs'] for rec in rep['stages'].values())
+    if other >= 0:
+        out.write("%-16s %8s %10.3f %6.1f%%\n" %
+                  ('(other)', '', other, 100.0 * other/total))
+    out.write("%-16s %8s %10.3f %7s  (peak memory: %.1f MiB)\n" %
+              ('total', '', rep['secs'], '', rep['peak_bytes']/2.0**20))
+
+
+def add_options(parser):
+    """Add the profiling options to the command-line parser.
+    """
+    parser.add_argument('--profile', dest='profile',
+                        action='store_true',
+                        default=False,
+                        help=('Time each stage, and count the files, rows, ' +
+                              'cells and bytes processed, and the hits of ' +
+                              'the parse cache; the summary is ' +
+                              'written to standard error'))
+    parser.add_argument('--profile-out', dest='profile_out',
+                        metavar='report_file',
+                        type=str,
+                        help=('Write the profile, as JSON, to the file ' +
+                              '(implies --profile)'))
+    parser.add_argument('--cprofile', dest='cprofile', metavar='stats_file',
+                        type=str,
+                        help=('Write the statistics of cProfile on the run ' +
+                              'to the file (see the module pstats)'))
+
+
+def run(args, fn, *fn_args):
+    """Call `fn` with `fn_args`, profiling the call as requested by the options
+    (see `add_options`) in `args`.
+    """
+    if not (args.profile or args.profile_out or args.cprofile):
+        return fn(*fn_args)
+
+    # Imported only if profiling, to keep the startup of the tools fast (see
+    #  `cli`).
+    import json
+
+    enable()
+    prof = None
+    if args.cprofile:
+        import cProfile
+        prof = cProfile.Profile()
+    try:
+        if prof is not None:
+            return prof.runcall(fn, *fn_args)
+        return fn(*fn_args)
+    finally:
+        rep = report()
+        disable()
+        if prof is not None:
+            prof.dump_stats(args.cprofile)
+        if args.profile_out:
+            with io.open(args.profile_out, 'w', encoding='utf-8') as f:
+                f.write(json.dumps(rep, sort_keys=True) + u'\n')
+        if args.profile:
+            write_summary(rep, sys.stderr)
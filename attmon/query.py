@@ -0,0 +1,364 @@
+#!/usr/bin/env python
+# -*- mode: python; coding: utf-8; fill-column: 80; -*-
+#
+# query.py
+# Copyright (c) 2026 The attmon contributors.
+#
+
+"""
+query.py
+Query the time series of a link, and the links with the highest average,
+standard deviation, or maximum of values over a time window, from a cube (see
+`cube`).
+
+Links are ranked using a summary kept alongside the cube: count, mean, sum of
+squared deviations, and maximum of the values of every link, by time bucket (of
+`BUCKET` seconds); only the snapshots in the buckets partially covered by the
+window are read. The summary also holds a link-major copy of the values: the
+values of each bucket, link by link, so that the values of a link in a bucket
+are contiguous. A link is read from the copy, if the summary exists, with one
+contiguous read per bucket; otherwise (and for snapshots appended since the
+summary was last updated), it is read from the cube, where its values are
+located by position (time stamps are searched, and the source and destination
+map to fixed offsets within each matrix), but are a matrix apart, so that one
+page is read per snapshot.
+
+The summary, like the cube, is a directory of raw arrays, one record per bucket,
+read back as memory-mapped arrays; it is brought up to date by rewriting only
+the last bucket and appending the new ones.
+"""
+
+__author__  = 'The attmon contributors'
+__version__ = '1.0'
+__license__ = 'MIT'
+
+
+from . import cube
+from . import utils
+import io
+import json
+import numpy as np
+import os
+
+
+# Length (in seconds) of the time buckets of the summary.
+BUCKET = 24 * 60 * 60
+
+# Directory, in the cube, holding the summary, and the file, in the summary,
+#  with the length of the buckets and the numbers of buckets and snapshots
+#  summarized.
+SUMMARY_DIR = 'summary'
+META_FILE = 'summary.json'
+
+# Arrays of the summary, as (name, type, whether there is a value per link)
+#  tuples: start of each bucket, position of its first snapshot, and the
+#  aggregates of the values of every link in the bucket.
+ARRAYS = (
+    ('starts', np.dtype('<i8'), False),
+    ('rows', np.dtype('<i8'), False),
+    ('count', np.dtype('<i8'), True),
+    ('mean', np.dtype('<f8'), True),
+    ('m2', np.dtype('<f8'), True),
+    ('max', np.dtype('<f8'), True),
+)
+
+# File, in the summary, with the link-major copy of the values; the values of
+#  the link at (flat) position `k` in bucket `b` start at offset
+#  `n * n * rows[b] + k * (rows[b + 1] - rows[b])`.
+SERIES_FILE = 'series'
+
+# Statistics by which links are ranked.
+AVG = 'avg'
+STD = 'std'
+MAX = 'max'
+RANK_BY = (AVG, STD, MAX)
+
+
+def aggregate(vals):
+    """Compute the count, mean, sum of squared deviations from the mean, and
+    maximum of the values of every link, in a (time x source x destination)
+    array; missing values (NaN) are ignored.
+    """
+    vals = np.asarray(vals, np.float64)
+    valid = ~np.isnan(vals)
+    count = valid.sum(axis=0)
+    mean = np.where(valid, vals, 0.0).sum(axis=0) / np.maximum(count, 1)
+    m2 = np.where(valid, (vals - mean)**2, 0.0).sum(axis=0)
+    vmax = np.where(valid, vals, -np.inf).max(axis=0, initial=-np.inf)
+    return count, mean, m2, vmax
+
+
+def combine(aggs):
+    """Combine aggregates, as returned by `aggregate`, computed on separate sets
+    of snapshots.
+    """
+    counts = np.array([a[0] for a in aggs])
+    means = np.array([a[1] for a in aggs])
+    count = counts.sum(axis=0)
+    mean = (counts * means).sum(axis=0) / np.maximum(count, 1)
+    m2 = (np.array([a[2] for a in aggs]).sum(axis=0) +
+          (counts * (means - mean)**2).sum(axis=0))
+    vmax = np.array([a[3] for a in aggs]).max(axis=0)
+    return count, mean, m2, vmax
+
+
+class Summary(object):
+    """Aggregates, and a link-major copy, of the values of every link, by time
+    bucket; the summary is brought up to date with the cube unless `update` is
+    unset.
+    """
+
+    def __init__(self, store, bucket=BUCKET, update=True):
+        self.store = store
+        self.bucket = bucket
+        self.path = os.path.sep.join((store.path, SUMMARY_DIR))
+        # Number of buckets, and of snapshots, summarized.
+        self.num = 0
+        self.covered = 0
+        for name, dtype, per_link in ARRAYS:
+            setattr(self, name, np.empty(self._shape(0, per_link), dtype))
+        self.series = np.empty(0, cube.VALUE_TYPE)
+        self.load()
+        if update:
+            self.update()
+
+    def _fpath(self, fname):
+        return os.path.sep.join((self.path, fname))
+
+    def _shape(self, num, per_link):
+        n = len(self.store.index)
+        return (num, n, n) if per_link else (num,)
+
+    def load(self):
+        """Map the arrays of the summary, if it exists and is consistent with
+        the cube; otherwise, the summary is rebuilt on update.
+        """
+        try:
+            with utils.f_rd(self._fpath(META_FILE)) as f:
+                meta = json.load(f)
+            if (meta['bucket'] != self.bucket or
+                    meta['covered'] > len(self.store)):
+                return
+            num = meta['buckets']
+            arrays = {}
+            for name, dtype, per_link in ARRAYS:
+                shape = self._shape(num, per_link)
+                fpath = self._fpath(name)
+                # An update was interrupted after the arrays were truncated.
+                size = dtype.itemsize * int(np.prod(shape))
+                if os.path.getsize(fpath) < size:
+                    return
+                arrays[name] = (np.memmap(fpath, dtype, 'r', shape=shape)
+                                if num else np.empty(shape, dtype))
+            n = len(self.store.index)
+            size = n * n * meta['covered']
+            fpath = self._fpath(SERIES_FILE)
+            if os.path.getsize(fpath) < size * cube.VALUE_TYPE.itemsize:
+                return
+            arrays['series'] = (np.memmap(fpath, cube.VALUE_TYPE, 'r',
+                                          shape=(size,))
+                                if size else np.empty(0, cube.VALUE_TYPE))
+        except (OSError, ValueError, KeyError):
+            return
+        for name, vals in arrays.items():
+            setattr(self, name, vals)
+        self.num, self.covered = num, meta['covered']
+
+    def update(self):
+        """Summarize the snapshots appended to the cube since the last update;
+        the last bucket, which may have been incomplete, is summarized again.
+        """
+        store = self.store
+        if self.covered == len(store):
+            return False
+
+        keep = max(self.num - 1, 0)
+        beg = int(self.rows[keep]) if keep < self.num else 0
+        tstamps = np.asarray(store.tstamps[beg:])
+        starts = np.unique(tstamps // self.bucket * self.bucket)
+        rows = beg + np.searchsorted(tstamps, starts, 'left')
+        ends = np.append(rows[1:], len(store))
+        aggs = [aggregate(store.values[r:e]) for r, e in zip(rows, ends)]
+
+        new = {'starts': starts, 'rows': rows}
+        for i, name in enumerate(('count', 'mean', 'm2', 'max')):
+            new[name] = np.array([a[i] for a in aggs])
+        new['spans'] = list(zip(rows, ends))
+        try:
+            self.save(keep, new, len(store))
+        except OSError:
+            # The cube is read-only; keep the summary in memory only.
+            for name, dtype, _per_link in ARRAYS:
+                setattr(self, name,
+                        np.concatenate((getattr(self, name)[:keep],
+                                        new[name].astype(dtype))))
+            n = len(store.index)
+            self.series = np.concatenate(
+                [self.series[:n * n * beg]] +
+                [self.block(r, e) for r, e in new['spans']])
+            self.num, self.covered = keep + len(starts), len(store)
+            return True
+        self.load()
+        return True
+
+    def block(self, beg, end):
+        """Return the values of the snapshots at positions `beg` through `end`
+        (exclusive), link by link.
+        """
+        vals = np.asarray(self.store.values[beg:end], cube.VALUE_TYPE)
+        return np.ascontiguousarray(np.moveaxis(vals, 0, -1)).ravel()
+
+    def save(self, keep, new, covered):
+        """Replace the buckets after the first `keep` with the new ones.
+        """
+        if not os.path.isdir(self.path):
+            os.makedirs(self.path)
+        for name, dtype, per_link in ARRAYS:
+            rec_size = dtype.itemsize * int(np.prod(self._shape(1, per_link)))
+            with io.open(self._fpath(name), 'ab') as f:
+                f.truncate(keep * rec_size)
+                f.write(np.ascontiguousarray(new[name], dtype).tobytes())
+        n = len(self.store.index)
+        with io.open(self._fpath(SERIES_FILE), 'ab') as f:
+            f.truncate(n * n * int(new['rows'][0]) * cube.VALUE_TYPE.itemsize)
+            for r, e in new['spans']:
+                f.write(self.block(r, e).tobytes())
+
+        # The arrays are consistent only once the metadata is replaced.
+        meta = {'bucket': self.bucket, 'buckets': keep + len(new['starts']),
+                'covered': covered}
+        tmp_path = "%s.%d.tmp" % (self._fpath(META_FILE), os.getpid())
+        with utils.f_wr(tmp_path) as f:
+            json.dump(meta, f, sort_keys=True)
+        os.replace(tmp_path, self._fpath(META_FILE))
+
+    def window(self, beg, end):
+        """Return the aggregates of the snapshots at positions `beg` through
+        `end` (exclusive), combining the buckets entirely within the range with
+        the aggregates of the remaining snapshots.
+        """
+        ends = np.append(self.rows[1:], self.covered)
+        full = np.flatnonzero((self.rows >= beg) & (ends <= end))
+        if not len(full):
+            return aggregate(self.store.values[beg:end])
+
+        b0, b1 = full[0], full[-1] + 1
+        aggs = [(self.count[b], self.mean[b], self.m2[b], self.max[b])
+                for b in range(b0, b1)]
+        if beg < self.rows[b0]:
+            aggs.append(aggregate(self.store.values[beg:self.rows[b0]]))
+        if ends[b1 - 1] < end:
+            aggs.append(aggregate(self.store.values[ends[b1 - 1]:end]))
+        return combine(aggs)
+
+
+    def link(self, src, dst, beg_ts=None, end_ts=None):
+        """Return the time stamps and values of a link, as `cube.Cube.link`;
+        the values of the snapshots summarized are read from the link-major
+        copy, and those of later snapshots from the cube.
+        """
+        store = self.store
+        pos = store.index.pos
+        n = len(store.index)
+        k = pos[src] * n + pos[dst]
+        beg, end = store.span(beg_ts, end_ts)
+        mid = max(beg, min(end, self.covered))
+
+        # Buckets overlapping the summarized part of the window, and the
+        #  snapshots of each in the window.
+        starts = np.asarray(self.rows)
+        ends = np.append(starts[1:], self.covered)
+        b0 = max(int(np.searchsorted(starts, beg, 'right')) - 1, 0)
+        b1 = int(np.searchsorted(starts, mid, 'left')) if beg < mid else b0
+        starts, ends = starts[b0:b1], ends[b0:b1]
+        firsts, lasts = np.maximum(starts, beg), np.minimum(ends, mid)
+        lens = lasts - firsts
+
+        # Offset of the first value of the link, in the window, in each bucket,
+        #  and of each value: that of its bucket, and its position within.
+        offs = n * n * starts + k * (ends - starts) + (firsts - starts)
+        offs = (np.repeat(offs - (np.cumsum(lens) - lens), lens) +
+                np.arange(lens.sum()))
+        vals = np.concatenate((self.series[offs],
+                               store.values[mid:end, pos[src], pos[dst]]))
+        return store.tstamps[beg:end], vals
+
+
+def city_code(store, city, reg=None):
+    """Return the code, in the cube, of the city given by its code or, with the
+    registry of cities `reg` (see `cities`), by its abbreviation or name (in any
+    case).
+    """
+    pos = store.index.pos
+    if city in pos:
+        return city
+    code = city.upper()
+    if reg is not None:
+        try:
+            code = reg.code(reg.lookup(city))
+        except KeyError:
+            pass
+    if code in pos:
+        return code
+    raise ValueError("Unknown city: %s" % (city))
+
+
+def link_series(store, src, dst, beg_ts=None, end_ts=None, reg=None,
+                summary=None):
+    """Return the time stamps and values of the link observed between `beg_ts`
+    and `end_ts` (both inclusive); snapshots without a value are skipped. Only
+    the lower-left triangle of each matrix is stored, and so the values of the
+    link in the other direction are returned if there are none in this one.
+    Cities are resolved as in `city_code`. The values are read from the
+    summary, if specified (see `Summary.link`).
+    """
+    src, dst = city_code(store, src, reg), city_code(store, dst, reg)
+    source = store if summary is None else summary
+    for a, b in ((src, dst), (dst, src)):
+        tstamps, vals = source.link(a, b, beg_ts, end_ts)
+        valid = ~np.isnan(vals)
+        if valid.any():
+            break
+    return np.asarray(tstamps)[valid], np.asarray(vals)[valid]
+
+
+def top_links(store, k=5, by=AVG, beg_ts=None, end_ts=None, summary=None):
+    """Return the `k` links with the highest average, standard deviation
+    (sample), or maximum of values between `beg_ts` and `end_ts`, as a list of
+    (value, (source, destination)) tuples in decreasing order of value.
+    """
+    if by not in RANK_BY:
+        raise ValueError("Unsupported statistic: %s" % (by))
+    if summary is None:
+        summary = Summary(store)
+    count, mean, m2, vmax = summary.window(*store.span(beg_ts, end_ts))
+
+    if by == AVG:
+        vals = mean
+    elif by == STD:
+        vals = np.where(count > 1, np.sqrt(m2 / np.maximum(count - 1, 1)), 0.0)
+    else:
+        vals = vmax
+    vals = np.where(count > 0, vals, -np.inf).ravel()
+
+    k = min(k, int((count > 0).sum()))
+    if not k:
+        return []
+    top = np.argpartition(-vals, k - 1)[:k]
+    # Ties are broken by the positions of the links.
+    top = top[np.lexsort((top, -vals[top]))]
+
+    n = len(store.index)
+    codes = store.index.codes
+    return [(float(vals[i]), (codes[i // n], codes[i % n])) for i in top]
+
+
+def open_cube(path, summary=False):
+    """Open a cube and, if `summary` is set, its (up-to-date) summary; if not,
+    the summary is still returned if it exists, as it was last updated.
+    """
+    store = cube.load(path)
+    if summary:
+        return store, Summary(store)
+    summary = Summary(store, update=False)
+    return store, summary if summary.num else None
@@ -17,90 +17,20 @@ __license__ = 'MIT'
 
 
 from . import constants as const
-from . import stats
+from . import tables
 from . import utils
 import io
 import math
 
 
 # Missing delay value.
-NO_RTT_VAL = float(const.NO_RTT)
-
-
-def proc_row(row):
-    """Process data in the current row.
-    """
-    if len(row) == 1:
-        return (None, None, row[-1])
-    return (row[0], row[1:-1], row[-1])
+NO_RTT_VAL = tables.missing_val(tables.DELAY)
 
 
 def parse(page, city_data):
     """Parse Web page and report the latency matrix on the page.
     """
-    # Mapping from abbreviations and city names to city codes.
-    abbrvs, cnames = city_data
-    # Flag indicating when to begin scanning.
-    scan = False
-    # Flag indicating when to begin processing table data.
-    proc = False
-    # Flag indicating the ID of the column we are parsing within a row.
-    col_num = 0
-
-    rtt_matrix = {}
-    # Column headers.
-    col_hdrs = []
-    # Current row.
-    curr_row = []
-
-    for line in (line.strip() for line in page.split(const.NEWLINE) if line):
-        if not scan and const.TAB_BEG_PAT.match(line):
-            scan = True
-        elif not scan:
-            continue
-
-        if not proc and const.DATA_BEG_PAT.match(line):
-            proc = True
-            continue
-        elif not proc:
-            continue
-
-        if const.ROW_BEG_PAT.match(line) and curr_row:
-                raise ValueError('Failed to detect a closing row tag!')
-
-        # Table data.
-        td_val = const.TD_VAL_PAT.match(line)
-        if td_val:
-            # Check for 'blank' cells!
-            val = td_val.group(1)
-            if not val:
-                if td_val.group(2).strip() != const.NO_VAL:
-                    raise ValueError('Unable to parse table data!')
-
-                val = const.NO_RTT
-
-            curr_row.append(val.strip())
-
-        if const.ROW_END_PAT.match(line):
-            src, rtts, hdr = proc_row(curr_row)
-
-            if not src and not rtts:
-                col_hdrs.append(abbrvs[hdr.upper()])
-            elif len(rtts) != len(col_hdrs):
-                raise ValueError('Unknown data format!')
-            else:
-                cc = cnames[src.upper()]
-                rtt_matrix[cc] = {dst:int(rtt)
-                                  for dst,rtt in zip(col_hdrs, rtts)}
-                col_hdrs.append(abbrvs[hdr.upper()])
-
-            curr_row = []
-
-
-        if proc and const.TAB_END_PAT.match(line):
-            break
-
-    return rtt_matrix, stats.compute(rtt_matrix, NO_RTT_VAL)
+    return tables.parse(page, city_data, tables.DELAY)
 
 
 def calc_dist(x, y):
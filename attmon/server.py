@@ -0,0 +1,449 @@
+#!/usr/bin/env python
+# -*- mode: python; coding: utf-8; fill-column: 80; -*-
+#
+# server.py
+# Copyright (c) 2026 The attmon contributors.
+#
+
+"""
+server.py
+Keep the most recent snapshot of each metric parsed in memory, and answer
+requests for its matrix, complete matrix, adjacency list, statistics, or the
+value of a link, over HTTP on localhost or a Unix socket.
+
+The data directories are watched for new snapshots (see `watch`), and the newest
+snapshot of each metric, if newer than the one in memory, is parsed in a worker
+thread; the directories are listed in full only at startup, or if events were
+lost. The
+responses for a snapshot are serialized once, on the first request, and reused
+until a newer snapshot arrives.
+
+Requests (GET), with responses in JSON:
+    /status                     time stamp and file of the snapshot of each
+                                metric
+    /<metric>                   statistics and adjacency list (source,
+                                destination, value)
+    /<metric>/stats             statistics (min., max., avg.)
+    /<metric>/matrix            cities, and the complete matrix of values
+                                (`null` for blank cells)
+    /<metric>/link/<src>/<dst>  value of the link, between cities given by
+                                code, abbreviation, or name (in any case)
+
+The matrix is sent as (little-endian) 64-bit floats in row-major order, with NaN
+for blank cells, if `format=binary` is in the query or
+`application/octet-stream` is accepted; the cities and the time stamp are sent
+in the `X-Attmon-Cities` and `X-Attmon-Tstamp` headers.
+"""
+
+__author__  = 'The attmon contributors'
+__version__ = '1.0'
+__license__ = 'MIT'
+
+
+from . import cities
+from . import ingest
+from . import tables
+from . import utils
+from . import watch
+import array
+import asyncio
+import http
+import json
+import os
+import sys
+import time
+import urllib.parse
+
+
+# Sub-directory, of the data directory, holding the snapshots of each metric
+#  (see `ext/collect.py`).
+SUBDIRS = {
+    ingest.DELAY: 'latency',
+    ingest.LOSS: 'loss',
+}
+
+# Interval (in seconds) between polls of the data directories, if inotify is
+#  unavailable.
+INTERVAL = watch.INTERVAL
+
+# Address and port to listen on for HTTP requests.
+HOST = '127.0.0.1'
+PORT = 8421
+
+# Maximum size of the request line and of each header.
+MAX_LINE = 8192
+
+# Time (in seconds) for which the rest of a rejected request is read, and
+#  discarded, before the connection is closed.
+LINGER = 2.0
+
+JSON_TYPE = 'application/json'
+BINARY_TYPE = 'application/octet-stream'
+
+CRLF = b'\r\n'
+COMMA = u','
+
+
+class HTTPError(Exception):
+
+    def __init__(self, status, msg):
+        super(HTTPError, self).__init__(msg)
+        self.status = status
+
+
+class Latest(object):
+    """Most recent snapshot of a metric, with its responses serialized once, on
+    the first request.
+    """
+
+    def __init__(self, metric, snap):
+        self.metric = metric
+        self.snap = snap
+        self.no_val = tables.missing_val(tables.TABLES[metric])
+        self.parsed_at = time.time()
+        # Responses, as (content type, headers, body) tuples, by request.
+        self.cache = {}
+
+    def _val(self, v):
+        return None if v is None or v == self.no_val else v
+
+    def info(self):
+        snap = self.snap
+        return {'metric': self.metric,
+                'tstamp': snap.tstamp,
+                'path': snap.path,
+                'parsed_at': round(self.parsed_at, 3)}
+
+    def stats(self):
+        d = self.info()
+        d.update(zip(('min', 'max', 'avg'), self.snap.stats))
+        return d
+
+    def summary(self):
+        d = self.stats()
+        d['links'] = [list(row) for row in utils.adj_list(self.snap.matrix,
+                                                          self.no_val)]
+        return d
+
+    def matrix(self):
+        """Return the cities, and the complete matrix of values as rows, with
+        `None` for blank cells.
+        """
+        full = utils.complete_matrix(self.snap.matrix, None)
+        cities = sorted(set(full) | set(c for r in full.values() for c in r))
+        rows = [[self._val(full[r].get(c)) if r in full else None
+                 for c in cities]
+                for r in cities]
+        return cities, rows
+
+    def link(self, src, dst):
+        m = self.snap.matrix
+        # Only the lower-left triangle of the matrix is parsed.
+        if src in m and dst in m[src]:
+            v = m[src][dst]
+        elif dst in m and src in m[dst]:
+            v = m[dst][src]
+        else:
+            raise HTTPError(404, "Unknown link: %s => %s" % (src, dst))
+        d = self.info()
+        d.update(src=src, dst=dst, value=self._val(v))
+        return d
+
+    def response(self, view, binary=False):
+        key = (view, binary)
+        if key in self.cache:
+            return self.cache[key]
+
+        headers = []
+        if view == 'matrix' and binary:
+            cities, rows = self.matrix()
+            vals = array.array('d', (float('nan') if v is None else v
+                                     for row in rows for v in row))
+            if sys.byteorder != 'little':
+                vals.byteswap()
+            headers = [('X-Attmon-Cities', COMMA.join(cities)),
+                       ('X-Attmon-Tstamp', str(self.snap.tstamp))]
+            res = (BINARY_TYPE, headers, vals.tobytes())
+        else:
+            if view == 'matrix':
+                cities, rows = self.matrix()
+                d = self.info()
+                d.update(cities=cities, values=rows)
+            else:
+                d = getattr(self, view)()
+            res = (JSON_TYPE, headers, to_json(d))
+        self.cache[key] = res
+        return res
+
+
+async def linger(reader, writer, timeout=LINGER):
+    """Signal the end of the responses, and discard the rest of the request
+    until the client closes the connection (or the timeout); closing the
+    connection with a request unread would reset it, and the client might never
+    read the response.
+    """
+    async def discard():
+        while await reader.read(1 << 16):
+            pass
+
+    try:
+        if writer.can_write_eof():
+            writer.write_eof()
+        await asyncio.wait_for(discard(), timeout)
+    except (ConnectionError, asyncio.TimeoutError):
+        pass
+
+
+def to_json(d):
+    return (json.dumps(d, sort_keys=True) + u'\n').encode('utf-8')
+
+
+class Server(object):
+    """Keep the most recent snapshot of each metric, in `in_paths` (directory
+    by metric), parsed, and answer requests for them; parsed matrices are cached
+    in `cache_path`, if specified.
+    """
+
+    def __init__(self, in_paths, city_data, dist=None, interval=INTERVAL,
+                 log=sys.stderr, cache_path=None):
+        self.in_paths = in_paths
+        self.cities = cities.registry(city_data)
+        self.parsers = {metric: ingest.SnapshotParser(metric, city_data, dist,
+                                                      cache_path=cache_path)
+                        for metric in in_paths}
+        self.interval = interval
+        self.log = log
+        self.started = time.time()
+        # Most recent snapshot, by metric.
+        self.latest = {}
+
+    def _log(self, msg):
+        self.log.write("%s %s\n" % (time.strftime('%Y-%m-%d %H:%M:%S'), msg))
+        self.log.flush()
+
+    def newest(self, metric, fnames=None):
+        """Return the newest snapshot of the metric, among the files `fnames`
+        (or all files) in its directory, as an entry returned by
+        `utils.list_snapshots`, if newer than the one in memory.
+        """
+        snaps = utils.list_snapshots(self.in_paths[metric], metric, fnames)
+        latest = self.latest.get(metric)
+        if snaps and (latest is None or snaps[-1][2] > latest.snap.tstamp):
+            return snaps[-1]
+        return None
+
+    def load(self, metric, snap):
+        """Parse the snapshot, an entry returned by `utils.list_snapshots`.
+        """
+        return Latest(metric, self.parsers[metric](snap))
+
+    def update(self, metric, latest):
+        self.latest[metric] = latest
+        self._log("%s: %s (min./max./avg. : %s, %s, %s)" %
+                  ((metric, latest.snap.path) + tuple(latest.snap.stats)))
+
+    async def refresh(self, fpaths=None):
+        """Parse the newest snapshot of each metric, among the files `fpaths`
+        (or all files in the data directories), if not already in memory;
+        snapshots are parsed in a worker thread, so that requests are answered
+        in the meantime.
+        """
+        loop = asyncio.get_event_loop()
+        for metric in sorted(self.in_paths):
+            fnames = None
+            if fpaths is not None:
+                fnames = [os.path.basename(fpath) for fpath in fpaths
+                          if os.path.dirname(fpath) == self.in_paths[metric]]
+                if not fnames:
+                    continue
+            try:
+                snap = await loop.run_in_executor(None, self.newest, metric,
+                                                  fnames)
+                if snap is None:
+                    continue
+                latest = await loop.run_in_executor(None, self.load, metric,
+                                                    snap)
+            except (IOError, OSError, KeyError, ValueError) as e:
+                # Try again with the next snapshot (e.g., if the file was
+                #  incomplete).
+                self._log("%s: failed to load the newest snapshot: %r" %
+                          (metric, e))
+                continue
+            self.update(metric, latest)
+
+    async def watch(self, poll=False):
+        """Load the newest snapshots, and then each new snapshot as soon as it
+        is written; with inotify, the event loop waits on its descriptor, and
+        otherwise the directories are polled every `interval` seconds.
+        """
+        loop = asyncio.get_event_loop()
+        w = watch.watcher(sorted(set(self.in_paths.values())), self.interval,
+                          poll)
+        fd = getattr(w, 'fd', None)
+        ready = asyncio.Event()
+        if fd is not None:
+            loop.add_reader(fd, ready.set)
+        try:
+            await self.refresh()
+            while True:
+                if fd is not None:
+                    await ready.wait()
+                    ready.clear()
+                else:
+                    await asyncio.sleep(self.interval)
+                # Neither waits, since events are pending or it is time to poll.
+                fpaths = w.wait(0)
+                if w.overflow:
+                    w.overflow = False
+                    await self.refresh()
+                elif fpaths:
+                    await self.refresh(fpaths)
+        finally:
+            if fd is not None:
+                loop.remove_reader(fd)
+            w.close()
+
+    def status(self):
+        d = {metric: latest.info() for metric, latest in self.latest.items()}
+        return {'uptime': round(time.time() - self.started, 3),
+                'snapshots': d}
+
+    def city(self, alias):
+        """Return the code of the city given by its code, abbreviation, or
+        name (in any case).
+        """
+        try:
+            return self.cities.code(self.cities.lookup(alias))
+        except KeyError:
+            raise HTTPError(404, "Unknown city: %s" % (alias))
+
+    def route(self, target, accept=''):
+        """Return the content type, the headers, and the body of the response
+        to a request for `target`.
+        """
+        url = urllib.parse.urlsplit(target)
+        query = urllib.parse.parse_qs(url.query)
+        binary = (query.get('format', [''])[-1] == 'binary' or
+                  BINARY_TYPE in accept)
+        parts = [urllib.parse.unquote(p) for p in url.path.split('/') if p]
+
+        if parts == ['status']:
+            return JSON_TYPE, [], to_json(self.status())
+
+        if not parts or parts[0] not in self.in_paths:
+            raise HTTPError(404, "Unknown resource: %s" % (url.path))
+        latest = self.latest.get(parts[0])
+        if latest is None:
+            raise HTTPError(503, "No snapshot of %s yet" % (parts[0]))
+
+        if len(parts) == 1:
+            return latest.response('summary')
+        if len(parts) == 2 and parts[1] in ('stats', 'matrix'):
+            return latest.response(parts[1], binary)
+        if len(parts) == 4 and parts[1] == 'link':
+            return JSON_TYPE, [], to_json(latest.link(self.city(parts[2]),
+                                                      self.city(parts[3])))
+        raise HTTPError(404, "Unknown resource: %s" % (url.path))
+
+    async def handle(self, reader, writer):
+        """Answer the requests on a (persistent) connection.
+        """
+        try:
+            while True:
+                try:
+                    req_line = await reader.readline()
+                except ValueError:
+                    # Longer than the limit of the stream.
+                    req_line = None
+                if req_line is None or len(req_line) > MAX_LINE:
+                    body = to_json({'error': 'Request line too long'})
+                    self.respond(writer, 414, JSON_TYPE, [], body, len(body),
+                                 False)
+                    await writer.drain()
+                    await linger(reader, writer)
+                    break
+                if not req_line.strip():
+                    break
+
+                hdrs = {}
+                while True:
+                    line = await reader.readline()
+                    if line in (CRLF, b'\n', b''):
+                        break
+                    name, _sep, val = line.decode('latin-1').partition(':')
+                    hdrs[name.strip().lower()] = val.strip()
+
+                parts = req_line.decode('latin-1').split()
+                method, target = parts[0], parts[1] if len(parts) > 1 else '/'
+                version = parts[2] if len(parts) > 2 else 'HTTP/1.0'
+                keep_alive = (hdrs.get('connection', '').lower() != 'close' and
+                              version != 'HTTP/1.0')
+
+                try:
+                    if method not in ('GET', 'HEAD'):
+                        raise HTTPError(405, "Unsupported method: %s" %
+                                        (method))
+                    status = 200
+                    ctype, headers, body = self.route(target,
+                                                      hdrs.get('accept', ''))
+                except HTTPError as e:
+                    status, ctype, headers = e.status, JSON_TYPE, []
+                    body = to_json({'error': str(e)})
+
+                self.respond(writer, status, ctype, headers,
+                             b'' if method == 'HEAD' else body, len(body),
+                             keep_alive)
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError, ValueError):
+            pass
+        finally:
+            writer.close()
+
+    def respond(self, writer, status, ctype, headers, body, length,
+                keep_alive):
+        lines = ["HTTP/1.1 %d %s" % (status, http.HTTPStatus(status).phrase),
+                 "Server: attmon/%s" % (__version__),
+                 "Content-Type: %s" % (ctype),
+                 "Content-Length: %d" % (length),
+                 "Connection: %s" % ('keep-alive' if keep_alive else 'close')]
+        lines += ["%s: %s" % (k, v) for k, v in headers]
+        writer.write(CRLF.join(l.encode('latin-1') for l in lines) +
+                     CRLF + CRLF + body)
+
+    async def run(self, host=HOST, port=PORT, socket_path=None, poll=False):
+        """Listen for requests over HTTP on `host` and `port`, and, if
+        `socket_path` is specified, on a Unix socket; either may be disabled
+        by passing `None`. With `poll`, the data directories are polled instead
+        of watched with inotify.
+        """
+        servers = []
+        if port is not None:
+            servers.append(await asyncio.start_server(self.handle, host, port))
+            self._log("listening on http://%s:%d/" % (host, port))
+        if socket_path:
+            if os.path.exists(socket_path):
+                os.remove(socket_path)
+            servers.append(await asyncio.start_unix_server(self.handle,
+                                                           socket_path))
+            self._log("listening on %s" % (socket_path))
+        try:
+            await self.watch(poll)
+        finally:
+            for server in servers:
+                server.close()
+            if socket_path and os.path.exists(socket_path):
+                os.remove(socket_path)
+
+
+def data_paths(data_path, metrics):
+    """Return the directory holding the snapshots of each metric: the
+    sub-directory of `data_path` named in `SUBDIRS`, if it exists, or
+    `data_path` itself.
+    """
+    paths = {}
+    for metric in metrics:
+        path = os.path.join(data_path, SUBDIRS[metric])
+        paths[metric] = path if os.path.isdir(path) else data_path
+    return paths
@@ -0,0 +1,202 @@
+#!/usr/bin/env python
+# -*- mode: python; coding: utf-8; fill-column: 80; -*-
+#
+# synth.py
+# Copyright (c) 2026 The attmon contributors.
+#
+
+"""
+synth.py
+Generate synthetic networks of an arbitrary number of cities, with city data
+and location files in the formats of `data/`, and snapshots of their delay and
+loss matrices as Web pages in the layout published by AT&T.
+"""
+
+__author__  = 'The attmon contributors'
+__version__ = '1.0'
+__license__ = 'MIT'
+
+
+from . import constants as const
+from . import rttmon
+from . import utils
+from collections import namedtuple as nt
+import os
+import random
+import string
+import time
+
+
+# City: code, abbreviation, name, and latitude-longitude coordinates.
+City = nt('City', ('code', 'abbrv', 'name', 'loc'))
+
+# Bounding box (latitudes and longitudes) of the cities.
+LAT_RANGE = (25.0, 48.0)
+LON_RANGE = (-123.0, -70.0)
+
+# Speed (in km/ms) of signals in fiber, and the range of inflation of delays
+#  over the speed-of-light delay.
+SPEED = 200.0
+INF_RANGE = (1.1, 2.5)
+
+# Fraction of blank cells (no measurements), and of links reporting loss.
+BLANK_FRAC = 0.02
+LOSS_FRAC = 0.05
+
+# Time between consecutive snapshots, in seconds.
+INTERVAL = 15 * 60
+
+# Cell attributes and text font of the tables on the published pages.
+FONT = '<FONT SIZE="-1" face="Arial, Helvetica, sans-serif">%s</FONT>'
+VAL_CELL = '\t\t<TD BGCOLOR="#66CC66" ALIGN=RIGHT>' + FONT + '</TD>\n'
+BLANK_CELL = '\t\t<TD BGCOLOR="#cccccc"ALIGN=RIGHT>' + const.NO_VAL + '</TD>\n'
+HDR_CELL = '\t\t<TD nowrap>' + FONT + '</TD>\n'
+
+PAGE_HEAD = """<HTML>
+<!-- network_%(metric)s.html - synthetic snapshot generated by attmon -->
+<HEAD>
+<TITLE>Global IP Network %(title)s</TITLE>
+</HEAD>
+<BODY>
+<table border="0" cellpadding="3" cellspacing="1" width="555">
+\t<TR>
+\t\t<TD ALIGN=BOTTOM><B><FONT face="Arial, Helvetica, sans-serif">CITY PAIRS</FONT></B></TD>
+"""
+
+PAGE_TAIL = """
+</table>
+<!-- %(timestamp)s -->
+</BODY>
+</HTML>
+"""
+
+TITLES = {
+    'delay': 'Latency',
+    'loss': 'Packet Loss',
+}
+
+
+def _abbrv(i):
+    """Return a (unique) three-letter abbreviation, e.g., `Abc`, for the `i`-th
+    city; up to 26**3 cities are supported.
+    """
+    letters = string.ascii_lowercase
+    a, rem = divmod(i, 26 * 26)
+    b, c = divmod(rem, 26)
+    return (letters[a] + letters[b] + letters[c]).capitalize()
+
+
+def gen_cities(num, seed=0):
+    """Generate `num` cities, at random locations.
+    """
+    if num > 26**3:
+        raise ValueError("Too many cities: %d" % (num))
+    rnd = random.Random(seed)
+    cities = []
+    for i in range(num):
+        name = "City%05d" % (i)
+        cities.append(City("XX-SY-%s" % (name.upper()), _abbrv(i), name,
+                           (round(rnd.uniform(*LAT_RANGE), 4),
+                            round(rnd.uniform(*LON_RANGE), 4))))
+    return cities
+
+
+def write_city_data(cities, fpath):
+    """Write city codes, abbreviations, and names to file (see
+    `utils.load_city_data`).
+    """
+    with utils.f_wr(fpath) as f:
+        for c in cities:
+            f.write(const.COMMA.join((c.code, c.abbrv.upper(),
+                                      c.name.upper())) + const.NEWLINE)
+
+
+def write_locs(cities, fpath):
+    """Write the latitude-longitude coordinates of cities to file (see
+    `utils.load_locs`).
+    """
+    with utils.f_wr(fpath) as f:
+        for c in cities:
+            f.write(c.code + const.TAB + "%s:%s" % c.loc + const.NEWLINE)
+
+
+class Network(object):
+    """Synthetic network: the delay of each link is the speed-of-light delay,
+    inflated by a random factor, and varies slightly between snapshots; a small
+    fraction of links report losses in each snapshot.
+    """
+
+    def __init__(self, cities, seed=0):
+        self.cities = cities
+        self.rnd = random.Random(seed)
+        # Base delay of each link (in the lower-left triangle of the matrix).
+        self.base = {}
+        for i, src in enumerate(cities):
+            for dst in cities[:i]:
+                dist = rttmon.calc_dist(src.loc, dst.loc)
+                self.base[(src.code, dst.code)] = max(
+                    1.0, 2 * dist/SPEED * self.rnd.uniform(*INF_RANGE))
+
+    def matrix(self, metric):
+        """Return the (lower-left triangle) matrix of values of a snapshot, as
+        rows of values by city; blank cells are `None`.
+        """
+        rnd = self.rnd
+        rows = []
+        for i, src in enumerate(self.cities):
+            row = []
+            for dst in self.cities[:i]:
+                if rnd.random() < BLANK_FRAC:
+                    row.append(None)
+                elif metric == 'delay':
+                    base = self.base[(src.code, dst.code)]
+                    row.append(str(int(round(base * rnd.uniform(0.95, 1.1)))))
+                elif rnd.random() < LOSS_FRAC:
+                    row.append("%.1f" % (rnd.uniform(0.1, 5.0)))
+                else:
+                    row.append('0.0')
+            rows.append(row)
+        return rows
+
+
+def render(cities, rows, metric, ts):
+    """Render the matrix of values as a Web page in the layout published by
+    AT&T; row `i` holds the name of the `i`-th city, the values to the cities
+    before it, and the abbreviation of the city (a header of the next column).
+    """
+    parts = [PAGE_HEAD % {'metric': metric, 'title': TITLES[metric]},
+             HDR_CELL % (cities[0].abbrv), '\t</TR>\n']
+    for city, row in list(zip(cities, rows))[1:]:
+        parts.append('\n\t<TR>\n')
+        parts.append(HDR_CELL % (city.name))
+        parts.extend(BLANK_CELL if v is None else VAL_CELL % (v) for v in row)
+        parts.append(HDR_CELL % (city.abbrv))
+        parts.append('\t</TR>\n')
+    parts.append(PAGE_TAIL % {'timestamp': time.strftime('%Y-%m-%d %H:%M UTC',
+                                                         time.gmtime(ts))})
+    return ''.join(parts)
+
+
+def snapshot_name(metric, ts):
+    """Return the name of the snapshot file of the metric taken at `ts` (seconds
+    since the epoch).
+    """
+    return "att-network-%s--%s.html" % (metric,
+                                        time.strftime('%H%M-%m%d%Y',
+                                                      time.gmtime(ts)))
+
+
+def gen_snapshots(net, out_path, metrics, beg_ts, num_snaps,
+                  interval=INTERVAL):
+    """Write `num_snaps` snapshots of each metric, `interval` seconds apart,
+    starting at `beg_ts`; return the number of files written.
+    """
+    num = 0
+    for i in range(num_snaps):
+        ts = beg_ts + i * interval
+        for metric in metrics:
+            fpath = os.path.sep.join((out_path, snapshot_name(metric, ts)))
+            with utils.f_wr(fpath) as f:
+                f.write(render(net.cities, net.matrix(metric), metric, ts))
+            num += 1
+    return num
@@ -0,0 +1,82 @@
+#!/usr/bin/env python
+# -*- mode: python; coding: utf-8; fill-column: 80; -*-
+#
+# tables.py
+# Copyright (c) 2026 The attmon contributors.
+#
+
+"""
+tables.py
+Parse the matrices of values (delay, loss, ...) published by AT&T.
+"""
+
+__author__  = 'The attmon contributors'
+__version__ = '1.0'
+__license__ = 'MIT'
+
+
+from . import cities
+from . import constants as const
+from . import stats
+from . import tokenizer
+from collections import namedtuple as nt
+
+
+# Description of a table: name, string used in place of blank cells, function
+#  to convert the cell values, and the pattern marking the start of the table.
+Table = nt('Table', ('name', 'no_val', 'conv', 'beg_pat'))
+
+# Network delay (in ms).
+DELAY = Table('delay', const.NO_RTT, int, const.DATA_BEG_PAT)
+
+# Network loss (in %).
+LOSS = Table('loss', const.NO_LOSS, float, const.DATA_BEG_PAT)
+
+# Supported tables, by name.
+TABLES = {t.name: t for t in (DELAY, LOSS)}
+
+# Version of the parser; it must be incremented whenever the parsed matrices or
+#  statistics change, so that cached results are invalidated (see `pcache`).
+VERSION = 1
+
+
+def missing_val(table):
+    """Return the value of blank cells in the table.
+    """
+    return float(table.no_val)
+
+
+def proc_row(row):
+    """Process data in the current row.
+    """
+    if len(row) == 1:
+        return (None, None, row[-1])
+    return (row[0], row[1:-1], row[-1])
+
+
+def parse(page, city_data, table):
+    """Parse Web page and report the matrix of values, described by `table`, on
+    the page.
+    """
+    # Mapping from abbreviations and city names, in any case, to city codes.
+    reg = cities.registry(city_data)
+    abbrv, city = reg.abbrv, reg.city
+    conv = table.conv
+
+    matrix = {}
+    # Column headers.
+    col_hdrs = []
+
+    for row in tokenizer.rows(page, table.no_val, table.beg_pat):
+        src, vals, hdr = proc_row(row)
+
+        if not src and not vals:
+            col_hdrs.append(abbrv(hdr))
+        elif len(vals) != len(col_hdrs):
+            raise ValueError('Unknown data format!')
+        else:
+            cc = city(src)
+            matrix[cc] = {dst:conv(v) for dst,v in zip(col_hdrs, vals)}
+            col_hdrs.append(abbrv(hdr))
+
+    return matrix, stats.compute(matrix, missing_val(table))
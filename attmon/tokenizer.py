@@ -0,0 +1,72 @@
+#!/usr/bin/env python
+# -*- mode: python; coding: utf-8; fill-column: 80; -*-
+#
+# tokenizer.py
+# Copyright (c) 2026 The attmon contributors.
+#
+
+"""
+tokenizer.py
+Extract the rows of the table of values (`CITY PAIRS`) from a Web page in a
+single pass over the page.
+"""
+
+__author__  = 'The attmon contributors'
+__version__ = '1.0'
+__license__ = 'MIT'
+
+
+from . import constants as const
+
+
+def _locate(page, beg_pat):
+    """Locate the text marking the beginning, and the tag closing the table of
+    values in the page.
+    """
+    beg = beg_pat.search(page)
+    if not beg:
+        raise ValueError('Unable to locate the table of values!')
+
+    return beg, const.TAB_END_PAT.search(page, beg.end())
+
+
+def table_span(page, beg_pat=const.DATA_BEG_PAT):
+    """Return the offsets of the beginning and the ending of the table of
+    values, which starts after the text matching `beg_pat`, in the page.
+    """
+    beg, end = _locate(page, beg_pat)
+    return beg.end(), (end.start() if end else len(page))
+
+
+def table_region(page, beg_pat=const.DATA_BEG_PAT):
+    """Return the offsets of the region of the page containing the table of
+    values, along with the text marking its beginning and its closing tag; the
+    region can be parsed on its own.
+    """
+    beg, end = _locate(page, beg_pat)
+    return beg.start(), (end.end() if end else len(page))
+
+
+def rows(page, no_val, beg_pat=const.DATA_BEG_PAT):
+    """Yield each row of the table of values in the page as a list of cell
+    values; blank cells are reported as `no_val`.
+    """
+    beg, end = table_span(page, beg_pat)
+
+    # Current row.
+    curr_row = []
+
+    for val, blank, row_beg, row_end in const.TOKEN_PAT.findall(page, beg, end):
+        if val:
+            curr_row.append(val.strip())
+        elif blank:
+            curr_row.append(no_val)
+        elif row_beg:
+            if curr_row:
+                raise ValueError('Failed to detect a closing row tag!')
+        elif row_end:
+            if curr_row:
+                yield curr_row
+            curr_row = []
+        else:
+            raise ValueError('Unable to parse table data!')
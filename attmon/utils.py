@@ -16,9 +16,24 @@ __version__ = '1.0'
 __license__ = 'MIT'
 
 
+from . import cities
 from . import constants as const
 from collections import defaultdict
+import calendar
+import errno
+import gzip
 import io
+import os
+import time
+
+
+# Directory for cached data, unless overridden by the environment variable.
+CACHE_DIR = os.path.join(os.path.expanduser('~'), '.cache', 'attmon')
+CACHE_DIR_ENV = 'ATTMON_CACHE_DIR'
+
+# Formats of the time stamps accepted by `parse_time` (in UTC).
+TIME_FMTS = ('%Y-%m-%dT%H:%M:%S', '%Y-%m-%dT%H:%M', '%Y-%m-%d %H:%M',
+             '%Y-%m-%d')
 
 
 # Utility `file open` calls.
@@ -27,14 +42,84 @@ f_rd = __open('r')
 f_wr = __open('w')
 
 
+def cache_dir():
+    """Return the path of the directory for cached data.
+    """
+    return os.environ.get(CACHE_DIR_ENV, CACHE_DIR)
+
+
 def load_content(page_file):
-    """Slurp content from the file.
+    """Slurp content from the file, decompressing gzip-compressed files;
+    snapshots in an archive or a store (see `archive`) are referred to by the
+    path of the archive or store and the name of the snapshot.
     """
-    return f_rd(page_file).read()
+    if os.path.isfile(page_file):
+        if page_file.endswith(const.GZ_EXT):
+            with gzip.open(page_file, 'rt', encoding='utf-8') as f:
+                return f.read()
+        return f_rd(page_file).read()
+
+    # Imported here, since `archive` depends on this module.
+    from . import archive
+    if archive.is_container(os.path.dirname(page_file)):
+        return archive.load_member(page_file)
+    raise FileNotFoundError(errno.ENOENT, os.strerror(errno.ENOENT), page_file)
+
+
+def snapshot_info(fname):
+    """Parse the name of a snapshot file and return the metric, the time stamp
+    string (`HHMM-MMDDYYYY`), and the time stamp in seconds since the epoch;
+    return `None` if the name does not match.
+    """
+    m = const.SNAPSHOT_PAT.match(os.path.basename(fname))
+    if not m:
+        return None
+    return (m.group('metric'), m.group('ts_dt'),
+            to_epoch(m.group('mon', 'day', 'yr', 'hr', 'min')))
+
+
+def to_epoch(tstamp):
+    """Convert a time stamp tuple, (month, day, year, hour, minute), as used in
+    the names of snapshot files (and in older data files), into seconds since
+    the epoch.
+    """
+    mon, day, yr, hh, mm = [int(v) for v in tstamp]
+    return calendar.timegm((yr, mon, day, hh, mm, 0))
+
+
+def parse_time(val):
+    """Parse a time stamp, either as seconds since the epoch or as a date (and
+    time) in UTC, and return seconds since the epoch.
+    """
+    if val.isdigit():
+        return int(val)
+    for fmt in TIME_FMTS:
+        try:
+            return calendar.timegm(time.strptime(val, fmt))
+        except ValueError:
+            continue
+    raise ValueError("Invalid time stamp: %s" % (val))
+
+
+def list_snapshots(in_path, metric, fnames=None):
+    """List snapshot files of a metric in the directory (or among `fnames`, if
+    specified), in chronological order.
+    """
+    snaps = []
+    for fname in (os.listdir(in_path) if fnames is None else fnames):
+        info = snapshot_info(fname)
+        if not info or info[0] != metric:
+            continue
+        _metric, ts_dt, tstamp = info
+        fpath = os.path.sep.join((in_path, fname))
+        snaps.append((fpath, ts_dt, tstamp))
+    snaps.sort(key=lambda v: v[2])
+    return snaps
 
 
 def load_city_data(locs_file):
-    """Load city codes, abbreviations, and names from file.
+    """Load city codes, abbreviations, and names from file, as a registry of
+    the cities (see `cities`).
     """
     # City abbreviation to city code.
     abbrv_to_code = {}
@@ -47,7 +132,7 @@ def load_city_data(locs_file):
             abbrv_to_code[abbrv] = code
         if cname:
             cname_to_code[cname] = code
-    return abbrv_to_code, cname_to_code
+    return cities.Registry(abbrv_to_code, cname_to_code)
 
 
 def load_locs(locs_file):
@@ -122,3 +207,20 @@ def write_adj_list(alist, stats, out, sep=const.COMMA):
     out.write(const.NEWLINE.join([sep.join(str(v) for v in row) for row in alist]))
     out.write(const.NEWLINE)
     out.write("#> min./max./avg. : %s, %s, %s\n" % tuple([str(v) for v in stats]))
+
+
+def write_tstamped_adj_list(alist, tstamp, out, sep=const.SPACE):
+    """Write the adjacency list to a file, with each row prefixed by the time
+    stamp (seconds since the epoch) of the snapshot.
+    """
+    timestamp = str(tstamp)
+    # Each row is a tuple containing the source, destination, and a loss or delay value.
+    for row in alist:
+        out.write(sep.join([timestamp] + [str(v) for v in row]) + const.NEWLINE)
+
+
+def write_tstamped_stats(stats, tstamp, out, sep=const.SPACE):
+    """Write the statistics of a snapshot as a single line prefixed by the time
+    stamp (seconds since the epoch) of the snapshot.
+    """
+    out.write(sep.join([str(tstamp)] + [str(v) for v in stats]) + const.NEWLINE)
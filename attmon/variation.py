@@ -0,0 +1,215 @@
+#!/usr/bin/env python
+# -*- mode: python; coding: utf-8; fill-column: 80; -*-
+#
+# variation.py
+# Copyright (c) 2026 The attmon contributors.
+#
+
+"""
+variation.py
+Read latency data from files, with each file corresponding to one backbone link
+(see `merge`), or from a cube, and compute basic statistics on the data to
+measure delay variations.
+"""
+
+__author__  = 'The attmon contributors'
+__version__ = '1.0'
+__license__ = 'MIT'
+
+
+from . import linkstats
+from . import utils
+import io
+import os
+
+
+FSLASH = u'/'
+HYPHEN = u'-'
+SPACE = u' '
+
+# Size (in bytes, as stored in the cube) of the values of the chunks of
+#  snapshots reduced at once.
+CHUNK_SIZE = 4 << 20
+
+
+def load_data(fpath, beg_ts, end_ts):
+    """Load latency data from file, and return the data as a list of
+    measurements.
+    """
+    for row in (line.strip() for line in io.open(fpath, 'r', encoding='utf-8')):
+        # Data format (time stamp in seconds since the epoch):
+        # 1498194120 30
+        # 1498194900 30
+        # or, in older files, with the time stamp as month, day, year, hour,
+        #  and minute:
+        # 6 23 2017 5 2 30
+
+        cols = row.split()
+        ts = int(cols[0]) if len(cols) == 2 else utils.to_epoch(cols[:5])
+        if ts < beg_ts or ts > end_ts:
+            continue
+
+        data = int(cols[-1])
+        yield (ts, data)
+
+
+def compute_stream_stats(ls):
+    """Compute simple statistics from the running statistics of measurements.
+    """
+    avg = ls.avg()
+    sdev = ls.std(ddof=0)
+    p25, p75, p5, p95 = [ls.percentile(p) for p in (25, 75, 5, 95)]
+    return tuple([round(v, 2) for v in (avg, sdev, p25, p75, p5, p95)])
+
+
+def analyze(in_path, *opts):
+    """Merge data in separate files and measure variations; the measurements are
+    streamed through running statistics, and never held in memory.
+    """
+    for fname in os.listdir(in_path):
+        fpath = os.path.sep.join((in_path, fname))
+        ls = linkstats.LinkStats()
+        min_ts, max_ts = None, None
+        for ts, data in load_data(fpath, *opts):
+            ls.add(data)
+            min_ts = ts if min_ts is None else min(min_ts, ts)
+            max_ts = ts if max_ts is None else max(max_ts, ts)
+        if not ls.count:
+            continue
+        yield (fname, min_ts, max_ts, compute_stream_stats(ls))
+
+
+def analyze_cube(cube_path, beg_ts, end_ts, chunk_size=CHUNK_SIZE):
+    """Measure variations using only the snapshots, in a cube, from the given
+    date range; the range is located by a search over the (memory-mapped) time
+    stamps, and the values in the range are read once, in chunks of at most
+    `chunk_size` bytes, each reduced along the time axis for all links at once
+    and merged into the running statistics of the links. The statistics are
+    those of `analyze` (e.g., percentiles estimated by the quantile sketch), and
+    so do not depend on whether the data is in a cube.
+    """
+    # NumPy is required only for the cube.
+    from . import cube
+    import numpy as np
+    store = cube.load(cube_path)
+    beg, end = store.span(beg_ts, end_ts)
+    tstamps = np.asarray(store.tstamps[beg:end])
+    codes = store.index.codes
+    n = len(codes)
+    num_rows = max(1, chunk_size // (n * n * store.values.itemsize))
+
+    # Running statistics of each link, merged as in `LinkStats.merge`.
+    count = np.zeros(n * n, np.int64)
+    mean = np.zeros(n * n)
+    m2 = np.zeros(n * n)
+    vmin = np.full(n * n, np.nan)
+    vmax = np.full(n * n, np.nan)
+    exceed = np.zeros(n * n, np.int64)
+    first = np.zeros(n * n, np.int64)
+    last = np.zeros(n * n, np.int64)
+    sketches = {}
+
+    for pos in range(beg, end, num_rows):
+        # Values of each link as a column.
+        vals = np.asarray(store.values[pos:min(pos + num_rows, end)])
+        vals = vals.reshape(len(vals), n * n).astype(np.float64)
+        valid = ~np.isnan(vals)
+        cnt = valid.sum(axis=0)
+        if not cnt.any():
+            continue
+        mu = np.where(valid, vals, 0.0).sum(axis=0) / np.maximum(cnt, 1)
+        dev = np.where(valid, vals - mu, 0.0)
+        dev *= dev
+        m2c = dev.sum(axis=0)
+        del dev
+
+        # Time stamps are sorted, and so the first and last valid values of a
+        #  link have its minimum and maximum time stamps.
+        off = pos - beg
+        first = np.where(count == 0, off + valid.argmax(axis=0), first)
+        last = np.where(cnt > 0, off + len(vals) - 1 -
+                        valid[::-1].argmax(axis=0), last)
+
+        total = count + cnt
+        delta = mu - mean
+        mean = np.where(count == 0, mu,
+                        mean + delta * cnt / np.maximum(total, 1))
+        m2 = np.where(count == 0, m2c,
+                      m2 + m2c + delta * delta * count * cnt /
+                      np.maximum(total, 1))
+        count = total
+        vmin = np.fmin(vmin, np.fmin.reduce(vals, axis=0))
+        vmax = np.fmax(vmax, np.fmax.reduce(vals, axis=0))
+        exceed += (vals > 0.0).sum(axis=0)
+
+        # Values of each link, in time order, added to its sketch.
+        cols, rows = np.nonzero(valid.T)
+        seen = vals.T[cols, rows]
+        bounds = np.flatnonzero(np.diff(cols)) + 1
+        for k, link_vals in zip(cols[np.r_[0, bounds]],
+                                np.split(seen, bounds)):
+            if k not in sketches:
+                sketches[k] = linkstats.QuantileSketch()
+            sketches[k].extend(link_vals.tolist())
+
+    for k in np.flatnonzero(count):
+        ls = linkstats.LinkStats.from_dict({
+            'count': int(count[k]), 'mean': float(mean[k]),
+            'm2': float(m2[k]), 'min': float(vmin[k]), 'max': float(vmax[k]),
+            'exceed': int(exceed[k]), 'thresh': 0.0, 'sketch': []})
+        ls.sketch = sketches[k]
+        yield (HYPHEN.join((codes[k // n], codes[k % n])),
+               tstamps[first[k]], tstamps[last[k]], compute_stream_stats(ls))
+
+
+def to_dt_tuple(dt_str):
+    """Convert date string to date-time tuple.
+    """
+    HH, MM = 0, 0
+    mon, day, yr = [int(v) for v in dt_str.split(FSLASH)]
+    return (mon, day, yr, HH, MM)
+
+
+def main(args):
+    """Compute the statistics of the latency data of each link.
+    """
+    in_path = os.path.abspath(args.in_path)
+    out_file = os.path.abspath(args.out_file)
+    beg_ts = utils.to_epoch(to_dt_tuple(args.beg_dt))
+    end_ts = utils.to_epoch(to_dt_tuple(args.end_dt))
+
+    if not os.path.isdir(in_path):
+        raise ValueError("Invalid input path!")
+
+    analyze_fn = analyze_cube if args.is_cube else analyze
+
+    with io.open(out_file, 'w', encoding='utf-8') as out:
+        for cols in analyze_fn(in_path, beg_ts, end_ts):
+            link_name, _min_ts, _max_ts, stats = cols
+            stats_info = SPACE.join((str(v) for v in stats))
+            line = SPACE.join((str(v) for v in (link_name, stats_info)))
+            out.write(u"%s\n" % (line))
+
+
+def add_arguments(parser):
+    """Add the arguments of the analysis to the command-line parser.
+    """
+    parser.add_argument('in_path', metavar='in_path',
+                        type=str,
+                        help='Input path containing latency data')
+    parser.add_argument('out_file', metavar='out_file',
+                        type=str,
+                        help='Output file path')
+    parser.add_argument('--beg', dest='beg_dt', metavar='beg_dt',
+                        type=str,
+                        default='6/30/2017',
+                        help='Beginning date')
+    parser.add_argument('--end', dest='end_dt', metavar='end_dt',
+                        type=str,
+                        default='7/30/2017',
+                        help='Ending date')
+    parser.add_argument('--cube', dest='is_cube',
+                        action='store_true',
+                        default=False,
+                        help=('Input path is a cube ' +
+                              '(see `attmon.py batch --cube`)'))
@@ -0,0 +1,382 @@
+#!/usr/bin/env python
+# -*- mode: python; coding: utf-8; fill-column: 80; -*-
+#
+# watch.py
+# Copyright (c) 2026 The attmon contributors.
+#
+
+"""
+watch.py
+Watch the data directories for new snapshot files, and ingest each as soon as
+it is completely written: append it to the cube of its metric, and update the
+running statistics of links.
+
+New files are reported by inotify (on Linux) once closed after writing or moved
+into a directory; elsewhere, or if inotify is unavailable, the directories are
+polled, and are listed only when modified, and a new file is reported once its
+size and modification time no longer change between polls.
+
+The statistics of links are saved with the time stamp of the last snapshot in
+them, and a snapshot already in the cube or the statistics is not added again;
+snapshots ingested before a crash, but after the state was last saved, are thus
+parsed again on restart, but not counted twice.
+"""
+
+__author__  = 'The attmon contributors'
+__version__ = '1.0'
+__license__ = 'MIT'
+
+
+from . import constants as const
+from . import ingest
+from . import linkstats
+from . import tables
+from . import utils
+import ctypes
+import ctypes.util
+import json
+import os
+import select
+import struct
+import sys
+import time
+
+
+# Interval (in seconds) between polls of the directories.
+INTERVAL = 2.0
+
+# Events of interest: file closed after writing, or moved into the directory.
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_TO = 0x00000080
+IN_Q_OVERFLOW = 0x00004000
+IN_NONBLOCK = 0o4000
+IN_CLOEXEC = 0o2000000
+
+# Header of an inotify event: watch descriptor, mask, cookie, length of name.
+EVENT_HDR = struct.Struct('iIII')
+
+# Size of the buffer for reading inotify events.
+BUF_SIZE = 64 * 1024
+
+# Number of snapshots ingested between saves of the statistics of links, and of
+#  the state, when several are reported at once (e.g., on catching up).
+FLUSH_COUNT = 100
+
+
+def is_snapshot(fname):
+    return const.SNAPSHOT_PAT.match(fname) is not None
+
+
+class InotifyWatcher(object):
+    """Report snapshot files closed after writing in, or moved into, the
+    directories, using inotify.
+    """
+
+    def __init__(self, paths):
+        libc = ctypes.CDLL(ctypes.util.find_library('c'), use_errno=True)
+        self.fd = libc.inotify_init1(IN_NONBLOCK | IN_CLOEXEC)
+        if self.fd < 0:
+            raise OSError(ctypes.get_errno(), 'inotify_init1 failed')
+        # Directory, by watch descriptor.
+        self.paths = {}
+        for path in paths:
+            wd = libc.inotify_add_watch(self.fd, os.fsencode(path),
+                                        IN_CLOSE_WRITE | IN_MOVED_TO)
+            if wd < 0:
+                err = ctypes.get_errno()
+                self.close()
+                raise OSError(err, "inotify_add_watch failed: %s" % (path))
+            self.paths[wd] = path
+        # Set if events were lost; the directories must then be listed.
+        self.overflow = False
+
+    def wait(self, timeout=None):
+        """Wait up to `timeout` seconds for files, and return the paths of the
+        files reported.
+        """
+        fpaths = []
+        ready, _w, _x = select.select([self.fd], [], [], timeout)
+        if not ready:
+            return fpaths
+        try:
+            buf = os.read(self.fd, BUF_SIZE)
+        except BlockingIOError:
+            return fpaths
+
+        pos = 0
+        while pos < len(buf):
+            wd, mask, _cookie, size = EVENT_HDR.unpack_from(buf, pos)
+            pos += EVENT_HDR.size
+            name = os.fsdecode(buf[pos:pos + size].rstrip(b'\0'))
+            pos += size
+            if mask & IN_Q_OVERFLOW:
+                self.overflow = True
+            elif wd in self.paths and is_snapshot(name):
+                fpaths.append(os.path.join(self.paths[wd], name))
+        return fpaths
+
+    def close(self):
+        if self.fd >= 0:
+            os.close(self.fd)
+            self.fd = -1
+
+
+class PollWatcher(object):
+    """Report snapshot files appearing in the directories by polling them; a
+    directory is listed only if it was modified since the last poll, and a file
+    is reported once its size and modification time are unchanged between two
+    polls.
+    """
+
+    def __init__(self, paths, interval=INTERVAL):
+        self.interval = interval
+        # Modification time of each directory, when last listed.
+        self.mtimes = {}
+        # Files seen when the directories were first listed, or reported.
+        self.seen = set()
+        # Files not yet completely written, with their size and modification
+        #  time at the last poll.
+        self.pending = {}
+        for path in paths:
+            self.mtimes[path] = os.stat(path).st_mtime_ns
+            self.seen.update(os.path.join(path, fname)
+                             for fname in os.listdir(path)
+                             if is_snapshot(fname))
+        self.overflow = False
+
+    def poll(self):
+        for path, mtime in self.mtimes.items():
+            st_mtime = os.stat(path).st_mtime_ns
+            if st_mtime == mtime:
+                continue
+            self.mtimes[path] = st_mtime
+            for fname in os.listdir(path):
+                fpath = os.path.join(path, fname)
+                if (is_snapshot(fname) and fpath not in self.seen and
+                    fpath not in self.pending):
+                    self.pending[fpath] = None
+
+        fpaths = []
+        for fpath, prev in list(self.pending.items()):
+            try:
+                st = os.stat(fpath)
+            except OSError:
+                # Removed (or renamed) before it was completely written.
+                del self.pending[fpath]
+                continue
+            sig = (st.st_size, st.st_mtime_ns)
+            if sig == prev and st.st_size:
+                del self.pending[fpath]
+                self.seen.add(fpath)
+                fpaths.append(fpath)
+            else:
+                self.pending[fpath] = sig
+        return fpaths
+
+    def wait(self, timeout=None):
+        """Poll the directories, waiting up to `timeout` seconds for files, and
+        return the paths of the files reported.
+        """
+        end = None if timeout is None else time.time() + timeout
+        while True:
+            fpaths = self.poll()
+            if fpaths:
+                return fpaths
+            left = self.interval if end is None else end - time.time()
+            if left <= 0:
+                return fpaths
+            time.sleep(min(self.interval, left))
+
+    def close(self):
+        pass
+
+
+def watcher(paths, interval=INTERVAL, poll=False):
+    """Return a watcher of the directories, using inotify if available (and
+    `poll` is not set), and polling every `interval` seconds otherwise.
+    """
+    if not poll and sys.platform.startswith('linux'):
+        try:
+            return InotifyWatcher(paths)
+        except (OSError, AttributeError, TypeError):
+            # No inotify (e.g., in the C library), or too many watches.
+            pass
+    return PollWatcher(paths, interval)
+
+
+class Ingester(object):
+    """Ingest the snapshots of a metric, in chronological order: append each
+    to a cube (if `cube_path` is specified), and update the running statistics
+    of links (saved to `links_file`, if specified, by `flush`); parsed matrices
+    are cached in `cache_path`, if specified.
+    """
+
+    def __init__(self, metric, city_data, dist=None, cube_path=None,
+                 links_file=None, last_ts=None, cache_path=None):
+        self.metric = metric
+        self.parser = ingest.SnapshotParser(metric, city_data, dist,
+                                            cache_path=cache_path)
+        self.no_val = tables.missing_val(tables.TABLES[metric])
+        self.last_ts = last_ts
+
+        self.store = None
+        if cube_path:
+            # NumPy is required only for the cube.
+            from . import cube
+            from . import dense
+            self.dense = dense
+            self.index = dense.city_index(city_data)
+            self.store = cube.open_or_create(cube_path, self.index)
+
+        self.links_file = links_file
+        self.links, meta = (linkstats.read(links_file) if links_file
+                            else (linkstats.new_links(), None))
+        # Time stamp of the last snapshot in the statistics of links.
+        self.links_ts = meta.get('last_ts') if meta else None
+        # Set if the statistics were updated since they were last saved.
+        self.dirty = False
+
+    def is_new(self, tstamp):
+        return self.last_ts is None or tstamp > self.last_ts
+
+    def add(self, snap):
+        """Ingest the snapshot, an entry returned by `utils.list_snapshots`;
+        return the parsed snapshot, or `None` if it is not newer than the last
+        snapshot ingested.
+        """
+        if not self.is_new(snap[2]):
+            return None
+        parsed = self.parser(snap)
+        m = parsed.matrix
+
+        if self.store is not None and (not len(self.store) or
+                                       parsed.tstamp > self.store.tstamps[-1]):
+            self.store.append(parsed.tstamp,
+                              self.dense.from_dict(m, self.index, self.no_val))
+
+        if self.links_ts is None or parsed.tstamp > self.links_ts:
+            links = self.links
+            for src in m:
+                for dst, v in m[src].items():
+                    if v != self.no_val:
+                        links[(src, dst)].add(v)
+            self.links_ts = parsed.tstamp
+            self.dirty = True
+
+        self.last_ts = parsed.tstamp
+        return parsed
+
+    def flush(self):
+        """Save the statistics of links, with the time stamp of the last
+        snapshot in them, if updated since they were last saved.
+        """
+        if self.links_file and self.dirty:
+            linkstats.save(self.links_file, self.links,
+                           {'last_ts': self.links_ts})
+        self.dirty = False
+
+
+class Follower(object):
+    """Ingest new snapshots of each metric, in `in_paths` (directory by
+    metric), as soon as they are written; the time stamp of the last snapshot
+    ingested of each metric is saved in `state_file`, after the statistics of
+    links, so that snapshots written while not running are ingested on restart.
+    """
+
+    def __init__(self, in_paths, ingesters, state_file, interval=INTERVAL,
+                 poll=False, log=sys.stderr):
+        self.in_paths = in_paths
+        self.ingesters = ingesters
+        self.state_file = state_file
+        self.interval = interval
+        self.poll = poll
+        self.log = log
+
+    def _log(self, msg):
+        self.log.write("%s %s\n" % (time.strftime('%Y-%m-%d %H:%M:%S'), msg))
+        self.log.flush()
+
+    def _save_state(self):
+        state = {metric: ing.last_ts for metric, ing in self.ingesters.items()}
+        tmp_path = "%s.tmp" % (self.state_file)
+        with utils.f_wr(tmp_path) as f:
+            json.dump(state, f, sort_keys=True)
+        os.replace(tmp_path, self.state_file)
+
+    def _flush(self, ing):
+        ing.flush()
+        self._save_state()
+
+    def ingest(self, fpaths, quiet=False):
+        """Ingest the snapshot files, in chronological order; with `quiet`,
+        snapshots not newer than the last snapshot ingested are skipped without
+        notice. The statistics of links, and the state, are saved every
+        `FLUSH_COUNT` snapshots, and once all are ingested.
+        """
+        for metric, ing in sorted(self.ingesters.items()):
+            snaps = utils.list_snapshots(self.in_paths[metric], metric,
+                                         [os.path.basename(fpath)
+                                          for fpath in fpaths
+                                          if os.path.dirname(fpath) ==
+                                          self.in_paths[metric]])
+            num_new = 0
+            for snap in snaps:
+                if not ing.is_new(snap[2]):
+                    if quiet:
+                        continue
+                    self._log("%s: %s: not newer than the last snapshot" %
+                              (metric, snap[0]))
+                    continue
+                try:
+                    parsed = ing.add(snap)
+                except (IOError, OSError, KeyError, ValueError) as e:
+                    self._log("%s: %s: invalid snapshot: %r" %
+                              (metric, snap[0], e))
+                    continue
+                self._log("%s: %s (min./max./avg. : %s, %s, %s)" %
+                          ((metric, parsed.path) + tuple(parsed.stats)))
+                num_new += 1
+                if num_new % FLUSH_COUNT == 0:
+                    self._flush(ing)
+            if num_new % FLUSH_COUNT:
+                self._flush(ing)
+
+    def catch_up(self):
+        """Ingest the snapshots written since the last snapshot ingested.
+        """
+        fpaths = [os.path.join(path, fname)
+                  for path in set(self.in_paths.values())
+                  for fname in os.listdir(path)]
+        self.ingest(fpaths, quiet=True)
+
+    def run(self, count=None):
+        """Ingest new snapshots as they are written, until `count` files are
+        reported or forever.
+        """
+        w = watcher(sorted(set(self.in_paths.values())), self.interval,
+                    self.poll)
+        self._log("watching %s (%s)" %
+                  (', '.join(sorted(self.in_paths.values())), type(w).__name__))
+        try:
+            # Files written before the watcher started are ingested first.
+            self.catch_up()
+            while count is None or count > 0:
+                fpaths = w.wait(self.interval)
+                if w.overflow:
+                    w.overflow = False
+                    self.catch_up()
+                if fpaths:
+                    self.ingest(fpaths)
+                    if count is not None:
+                        count -= len(fpaths)
+        finally:
+            w.close()
+
+
+def load_state(state_file):
+    """Load the time stamp of the last snapshot ingested of each metric.
+    """
+    if not os.path.isfile(state_file):
+        return {}
+    with utils.f_rd(state_file) as f:
+        return json.load(f)
@@ -0,0 +1,152 @@
+#!/usr/bin/env python
+# -*- mode: python; coding: utf-8; fill-column: 80; -*-
+#
+# bench-parse.py
+# Copyright (c) 2026 The attmon contributors.
+#
+
+"""
+bench-parse.py
+Compare the single-pass table tokenizer against the per-line regular expression
+cascade previously used to parse the delay and loss matrices.
+"""
+
+__author__  = 'The attmon contributors'
+__version__ = '1.0'
+__license__ = 'MIT'
+
+
+import argparse
+import glob
+import os
+import sys
+import timeit
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                                os.pardir))
+
+import attmon.constants as const
+import attmon.lossmon as lossmon
+import attmon.rttmon as rttmon
+import attmon.tables as tables
+import attmon.utils as utils
+
+
+def legacy_parse(page, city_data, no_val, conv):
+    """Parse Web page, one line at a time, and report the matrix on the page.
+    """
+    abbrvs, cnames = city_data
+    scan = False
+    proc = False
+
+    matrix = {}
+    col_hdrs = []
+    curr_row = []
+
+    for line in (line.strip() for line in page.split(const.NEWLINE) if line):
+        if not scan and const.TAB_BEG_PAT.match(line):
+            scan = True
+        elif not scan:
+            continue
+
+        if not proc and const.DATA_BEG_PAT.match(line):
+            proc = True
+            continue
+        elif not proc:
+            continue
+
+        if const.ROW_BEG_PAT.match(line) and curr_row:
+                raise ValueError('Failed to detect a closing row tag!')
+
+        td_val = const.TD_VAL_PAT.match(line)
+        if td_val:
+            val = td_val.group(1)
+            if not val:
+                if td_val.group(2).strip() != const.NO_VAL:
+                    raise ValueError('Unable to parse table data!')
+
+                val = no_val
+
+            curr_row.append(val.strip())
+
+        if const.ROW_END_PAT.match(line):
+            src, vals, hdr = tables.proc_row(curr_row)
+
+            if not src and not vals:
+                col_hdrs.append(abbrvs[hdr.upper()])
+            elif len(vals) != len(col_hdrs):
+                raise ValueError('Unknown data format!')
+            else:
+                cc = cnames[src.upper()]
+                matrix[cc] = {dst:conv(v) for dst,v in zip(col_hdrs, vals)}
+                col_hdrs.append(abbrvs[hdr.upper()])
+
+            curr_row = []
+
+        if proc and const.TAB_END_PAT.match(line):
+            break
+
+    return matrix
+
+
+# Current parser and the legacy parser's arguments, by metric.
+PARSERS = {
+    'delay': (rttmon.parse, (const.NO_RTT, int)),
+    'loss': (lossmon.parse, (const.NO_LOSS, float)),
+}
+
+
+def bench(fn, number, repeat):
+    """Report the best time (in microseconds) per call of `fn`.
+    """
+    return 1e6 * min(timeit.repeat(fn, number=number, repeat=repeat)) / number
+
+
+def main(args):
+    city_data = utils.load_city_data(args.city_file)
+
+    print("%-45s %12s %12s %8s" % ('file', 'legacy (us)', 'current (us)',
+                                   'speedup'))
+    for fpath in sorted(glob.glob(os.path.join(args.in_path, '*.html'))):
+        info = utils.snapshot_info(fpath)
+        if not info or info[0] not in PARSERS:
+            continue
+
+        page = utils.load_content(fpath)
+        parse_fn, legacy_args = PARSERS[info[0]]
+
+        m, _stats = parse_fn(page, city_data)
+        if m != legacy_parse(page, city_data, *legacy_args):
+            raise ValueError("Parsers disagree on %s!" % (fpath))
+
+        t_old = bench(lambda: legacy_parse(page, city_data, *legacy_args),
+                      args.number, args.repeat)
+        t_new = bench(lambda: parse_fn(page, city_data),
+                      args.number, args.repeat)
+        print("%-45s %12.1f %12.1f %7.1fx" % (os.path.basename(fpath),
+                                              t_old, t_new, t_old/t_new))
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(
+        description=('Benchmark the table tokenizer against ' +
+                     'the per-line parser on snapshot files.'))
+    parser.add_argument('in_path', metavar='in_path',
+                        type=str, nargs='?',
+                        default='test',
+                        help='Input path containing snapshot files')
+    parser.add_argument('--city-data', dest='city_file', metavar='city_file',
+                        type=str,
+                        default='data/city-code-abbrev-name.txt',
+                        help=('Text file containing ' +
+                              'city codes, abbreviations and names'))
+    parser.add_argument('--number', dest='number', metavar='N',
+                        type=int,
+                        default=200,
+                        help='Number of parses per measurement')
+    parser.add_argument('--repeat', dest='repeat', metavar='R',
+                        type=int,
+                        default=5,
+                        help='Number of measurements')
+    args = parser.parse_args()
+    main(args)
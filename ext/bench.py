@@ -0,0 +1,394 @@
+#!/usr/bin/env python
+# -*- mode: python; coding: utf-8; fill-column: 80; -*-
+#
+# bench.py
+# Copyright (c) 2026 The attmon contributors.
+#
+
+"""
+bench.py
+Benchmark the stages of the pipeline (parse, complete, statistics, inflation,
+and serialization), on the snapshot files in the test directory or on synthetic
+snapshots of a network of any size, and the batch, merge and statistics scripts,
+on a synthetic archive of snapshots, and the startup of each sub-command of
+attmon; report the time, throughput and peak memory of each, and compare them
+against the results of an earlier run.
+"""
+
+__author__  = 'The attmon contributors'
+__version__ = '1.0'
+__license__ = 'MIT'
+
+
+import argparse
+import fnmatch
+import functools
+import io
+import json
+import os
+import random
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+import timeit
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                                os.pardir))
+
+import attmon.constants as const
+import attmon.lossmon as lossmon
+import attmon.rttmon as rttmon
+import attmon.stats as stats
+import attmon.synth as synth
+import attmon.utils as utils
+
+
+BASE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir)
+EXT_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# Snapshot files used as templates of each metric.
+TEMPLATES = {
+    'delay': 'att-network-delay--0217-06232017.html',
+    'loss': 'att-network-loss--0100-07232017.html',
+}
+
+# Number of cities of the synthetic archive, unless specified.
+NUM_CITIES = 25
+
+# First (synthetic) snapshot: 2017-07-01 00:00 UTC.
+START_TS = 1498867200
+
+# Sub-commands of attmon whose startup (i.e., printing the usage) is timed.
+STARTUP_CMDS = ('parse', 'batch', 'merge', 'stats', 'plot', 'query', 'serve',
+                'watch')
+
+# Modules that no sub-command may import at startup.
+STARTUP_BANNED = ('numpy', 'pyarrow', 'multiprocessing')
+
+
+def gen_locs(city_data, fpath, seed=0):
+    """Write (random) latitude-longitude coordinates of the cities to file.
+    """
+    rnd = random.Random(seed)
+    abbrvs, cnames = city_data
+    codes = sorted(set(abbrvs.values()) | set(cnames.values()))
+    with utils.f_wr(fpath) as f:
+        for code in codes:
+            f.write(u"%s\t%.4f:%.4f\n" % (code, rnd.uniform(25, 48),
+                                          rnd.uniform(-123, -70)))
+
+
+def time_fn(fn, number, repeat):
+    """Return the best time (in seconds) per call of `fn`, and the peak memory
+    (in bytes) allocated during a call.
+    """
+    best = min(timeit.repeat(fn, number=number, repeat=repeat)) / number
+    tracemalloc.start()
+    fn()
+    _curr, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return best, peak
+
+
+def time_cmd(cmd, stderr=None):
+    """Run the command once, and return the time (in seconds) it took and its
+    peak memory (resident set size, in bytes).
+    """
+    t = time.perf_counter()
+    proc = subprocess.Popen(cmd, cwd=BASE_DIR, stdout=subprocess.DEVNULL,
+                            stderr=stderr)
+    _pid, status, usage = os.wait4(proc.pid, 0)
+    elapsed = time.perf_counter() - t
+    proc.returncode = os.waitstatus_to_exitcode(status)
+    if proc.returncode:
+        raise RuntimeError("Command failed: %s" % (' '.join(cmd)))
+    # Linux reports the peak resident set size in kilobytes.
+    return elapsed, usage.ru_maxrss * 1024
+
+
+def stage_benches(pages, city_data, locs_file):
+    """Benchmarks of the stages, on a snapshot of each metric, as (name,
+    function, number of items processed per call) tuples.
+    """
+    m, _stats = rttmon.parse(pages['delay'], city_data)
+    fm = rttmon.complete_matrix(m)
+    alist = utils.adj_list(m, rttmon.NO_RTT_VAL)
+    locs = utils.load_locs(locs_file)
+    num_cells = sum(len(r) for r in m.values())
+
+    def gen_gp_data():
+        utils.gen_gp_data(fm, _stats, io.StringIO())
+
+    return [
+        ('parse.delay', lambda: rttmon.parse(pages['delay'], city_data), 1),
+        ('parse.loss', lambda: lossmon.parse(pages['loss'], city_data), 1),
+        ('complete_matrix', lambda: rttmon.complete_matrix(m), num_cells),
+        ('stats.compute', lambda: stats.compute(m, rttmon.NO_RTT_VAL),
+         num_cells),
+        ('compute_inf',
+         lambda: rttmon.compute_inf({r: dict(v) for r, v in m.items()}, locs),
+         num_cells),
+        ('adj_list', lambda: utils.adj_list(m, rttmon.NO_RTT_VAL), num_cells),
+        ('gen_gp_data', gen_gp_data, num_cells),
+        ('write_adj_list',
+         lambda: utils.write_adj_list(alist, _stats, io.StringIO()),
+         len(alist)),
+    ]
+
+
+def script_benches(args, work_dir, city_file):
+    """Benchmarks of the scripts, on the synthetic archive, as (name, command,
+    number of snapshots processed) tuples; the commands are run in order, and
+    later commands read the output of earlier ones.
+    """
+    snaps = os.path.join(work_dir, 'snapshots')
+    out = lambda *names: os.path.join(work_dir, *names)
+    attmon_bin = os.path.join(BASE_DIR, 'attmon.py')
+    n = args.num_snaps
+    return [
+        ('batch.delay',
+         [sys.executable, attmon_bin, 'batch', 'delay', snaps, out('lat'),
+          '--stats', out('lat.stats'), '--city-data', city_file], n),
+        ('batch.loss',
+         [sys.executable, attmon_bin, 'batch', 'loss', snaps, out('loss'),
+          '--stats', out('loss.stats'), '--city-data', city_file], n),
+        # Parsed matrices are written to the cache (see `pcache`) by the first
+        #  run, and read from it by the second.
+        ('batch.delay.cold',
+         [sys.executable, attmon_bin, 'batch', 'delay', snaps,
+          out('lat-cold'), '--stats', out('lat-cold.stats'),
+          '--city-data', city_file, '--parse-cache'], n),
+        ('batch.delay.cached',
+         [sys.executable, attmon_bin, 'batch', 'delay', snaps,
+          out('lat-cached'), '--stats', out('lat-cached.stats'),
+          '--city-data', city_file, '--parse-cache'], n),
+        ('merge-latency',
+         [sys.executable, os.path.join(EXT_DIR, 'merge-latency.py'),
+          out('lat'), out('lat-links'), '--summary', out('lat.summary')], n),
+        ('merge-loss',
+         [sys.executable, os.path.join(EXT_DIR, 'merge-loss.py'),
+          out('loss'), out('loss-links'), '--summary', out('loss.summary')], n),
+        ('get-latency-stats',
+         [sys.executable, os.path.join(EXT_DIR, 'get-latency-stats.py'),
+          out('lat-links'), out('lat-links.stats'),
+          '--beg', '1/1/2017', '--end', '12/31/2017'], n),
+    ]
+
+
+def import_times(lines):
+    """Return the time (in seconds) spent importing modules after the start of
+    the interpreter, and the names of all modules imported, from the output of
+    `python -X importtime`.
+    """
+    total, names = 0, []
+    after_site = False
+    for line in lines:
+        if not line.startswith('import time:'):
+            continue
+        _self_us, cum_us, name = line[len('import time:'):].split('|')
+        if not cum_us.strip().isdigit():
+            continue
+        names.append(name.strip())
+        # Top-level imports are indented by a single space.
+        if after_site and not name.startswith('  '):
+            total += int(cum_us)
+        elif name.strip() == 'site':
+            after_site = True
+    return total / 1e6, names
+
+
+def startup_benches(work_dir):
+    """Benchmarks of the startup of the sub-commands of attmon, as (name,
+    function) tuples; the function returns the time (in seconds) and peak
+    memory of the process, the time spent importing modules, and the names of
+    the modules imported.
+    """
+    attmon_bin = os.path.join(BASE_DIR, 'attmon.py')
+    err_file = os.path.join(work_dir, 'importtime.txt')
+
+    def startup(cmd):
+        with io.open(err_file, 'w', encoding='utf-8') as err:
+            secs, peak = time_cmd([sys.executable, '-X', 'importtime',
+                                   attmon_bin, cmd, '--help'], err)
+        return (secs, peak) + import_times(utils.f_rd(err_file))
+
+    return [("startup.%s" % (cmd), functools.partial(startup, cmd))
+            for cmd in STARTUP_CMDS]
+
+
+def load_results(fpath):
+    """Load the results of the last run of each benchmark from file.
+    """
+    results = {}
+    for line in utils.f_rd(fpath):
+        r = json.loads(line)
+        results[r['name']] = r
+    return results
+
+
+def main(args):
+    baseline = load_results(args.baseline) if args.baseline else {}
+    selected = lambda name: any(fnmatch.fnmatch(name, p) for p in args.only)
+
+    work_dir = tempfile.mkdtemp(prefix='attmon-bench-')
+    # Start with an empty cache, in the work directory, in every run.
+    os.environ[utils.CACHE_DIR_ENV] = os.path.join(work_dir, 'cache')
+    try:
+        # Synthetic network, with its city data and locations.
+        cities = synth.gen_cities(args.num_cities or NUM_CITIES)
+        net = synth.Network(cities)
+        city_file = os.path.join(work_dir, 'city-data.txt')
+        synth.write_city_data(cities, city_file)
+        locs_file = os.path.join(work_dir, 'city-locs.txt')
+        synth.write_locs(cities, locs_file)
+
+        if args.num_cities:
+            city_data = utils.load_city_data(city_file)
+            pages = {metric: synth.render(cities, net.matrix(metric), metric,
+                                          START_TS)
+                     for metric in TEMPLATES}
+        else:
+            city_data = utils.load_city_data(args.city_file)
+            pages = {metric: utils.load_content(os.path.join(args.in_path,
+                                                             fname))
+                     for metric, fname in TEMPLATES.items()}
+            locs_file = os.path.join(work_dir, 'locs.txt')
+            gen_locs(city_data, locs_file)
+
+        results = []
+        for name, fn, num_items in stage_benches(pages, city_data, locs_file):
+            if not selected(name):
+                continue
+            secs, peak = time_fn(fn, args.number, args.repeat)
+            results.append({'name': name, 'secs': secs, 'peak_bytes': peak,
+                            'items_per_sec': num_items/secs})
+
+        if not args.skip_scripts:
+            os.mkdir(os.path.join(work_dir, 'snapshots'))
+            synth.gen_snapshots(net, os.path.join(work_dir, 'snapshots'),
+                                sorted(TEMPLATES), START_TS, args.num_snaps)
+            for name, cmd, num_items in script_benches(args, work_dir,
+                                                       city_file):
+                # Later scripts depend on the output of earlier ones.
+                secs, peak = time_cmd(cmd)
+                if not selected(name):
+                    continue
+                results.append({'name': name, 'secs': secs, 'peak_bytes': peak,
+                                'items_per_sec': num_items/secs})
+
+        over_budget = []
+        for name, fn in startup_benches(work_dir):
+            if not selected(name):
+                continue
+            secs, peak, import_secs, modules = fn()
+            results.append({'name': name, 'secs': secs, 'peak_bytes': peak,
+                            'items_per_sec': 1/secs,
+                            'import_secs': import_secs})
+            banned = [m for m in modules if m.split('.')[0] in STARTUP_BANNED]
+            if banned or import_secs * 1e3 > args.startup_budget:
+                over_budget.append("%s (%.1f ms%s)" %
+                                   (name, import_secs * 1e3,
+                                    '; imports ' + ', '.join(banned)
+                                    if banned else ''))
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+    regressions = []
+    print("%-20s %12s %14s %12s %9s" % ('benchmark', 'time (ms)', 'items/s',
+                                        'peak (KiB)', 'vs. base'))
+    for r in results:
+        base = baseline.get(r['name'])
+        ratio = r['secs']/base['secs'] if base else None
+        if ratio and ratio > args.tolerance:
+            regressions.append(r['name'])
+        print("%-20s %12.3f %14.1f %12.1f %9s" %
+              (r['name'], r['secs'] * 1e3, r['items_per_sec'],
+               r['peak_bytes']/1024.0,
+               "%.2fx" % (ratio) if ratio else '-'))
+
+    if args.save:
+        with io.open(args.save, 'a', encoding='utf-8') as f:
+            for r in results:
+                r.update({'label': args.label, 'num_snaps': args.num_snaps,
+                          'num_cities': args.num_cities or NUM_CITIES,
+                          'time': int(time.time())})
+                f.write(json.dumps(r, sort_keys=True) + const.NEWLINE)
+
+    if over_budget:
+        sys.stderr.write("Startup over the budget of %.1f ms: %s\n" %
+                         (args.startup_budget, ', '.join(over_budget)))
+    if regressions:
+        sys.stderr.write("Slower than the baseline by more than %.2fx: %s\n" %
+                         (args.tolerance, ', '.join(regressions)))
+    if over_budget or regressions:
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(
+        description=('Benchmark the stages of the pipeline, and the ' +
+                     'batch, merge and statistics scripts on a ' +
+                     'synthetic archive of snapshots.'))
+    parser.add_argument('in_path', metavar='in_path',
+                        type=str, nargs='?',
+                        default='test',
+                        help='Input path containing the template snapshots')
+    parser.add_argument('--city-data', dest='city_file', metavar='city_file',
+                        type=str,
+                        default='data/city-code-abbrev-name.txt',
+                        help=('Text file containing ' +
+                              'city codes, abbreviations and names'))
+    parser.add_argument('--snapshots', dest='num_snaps', metavar='N',
+                        type=int,
+                        default=96,
+                        help=('Number of synthetic snapshots of each ' +
+                              'metric (default: 96, i.e., a day)'))
+    parser.add_argument('--cities', dest='num_cities', metavar='M',
+                        type=int,
+                        help=('Number of cities of the synthetic network ' +
+                              '(default: %d); if specified, ' % (NUM_CITIES) +
+                              'the stages are also benchmarked on synthetic ' +
+                              'snapshots instead of the template snapshots'))
+    parser.add_argument('--number', dest='number', metavar='N',
+                        type=int,
+                        default=20,
+                        help='Number of calls per measurement of a stage')
+    parser.add_argument('--repeat', dest='repeat', metavar='R',
+                        type=int,
+                        default=5,
+                        help='Number of measurements of a stage')
+    parser.add_argument('--only', dest='only', metavar='pattern',
+                        type=str, nargs='+',
+                        default=['*'],
+                        help='Run only the benchmarks matching the patterns')
+    parser.add_argument('--skip-scripts', dest='skip_scripts',
+                        action='store_true',
+                        default=False,
+                        help='Benchmark only the stages, not the scripts')
+    parser.add_argument('--save', dest='save', metavar='results_file',
+                        type=str,
+                        help='Append the results, as JSON lines, to the file')
+    parser.add_argument('--label', dest='label', metavar='label',
+                        type=str,
+                        default='',
+                        help='Label (e.g., release) saved with the results')
+    parser.add_argument('--baseline', dest='baseline', metavar='results_file',
+                        type=str,
+                        help=('Compare against the last results saved ' +
+                              'in the file, and fail on regressions'))
+    parser.add_argument('--tolerance', dest='tolerance', metavar='ratio',
+                        type=float,
+                        default=1.25,
+                        help=('Slowdown, relative to the baseline, ' +
+                              'reported as a regression (default: 1.25)'))
+    parser.add_argument('--startup-budget', dest='startup_budget', metavar='ms',
+                        type=float,
+                        default=25.0,
+                        help=('Maximum time spent importing modules at the ' +
+                              'startup of a sub-command, excluding the ' +
+                              'start of the interpreter (default: 25)'))
+    args = parser.parse_args()
+    main(args)
@@ -0,0 +1,144 @@
+#!/usr/bin/env python
+# -*- mode: python; coding: utf-8; fill-column: 80; -*-
+#
+# collect.py
+# Copyright (c) 2026 The attmon contributors.
+#
+
+"""
+collect.py
+Gather delay and loss measurements from AT&T's Web site every 15 minutes, and
+parse them as they arrive (replaces `fetch-latency.sh` and `fetch-loss.sh`).
+"""
+
+__author__  = 'The attmon contributors'
+__version__ = '1.0'
+__license__ = 'MIT'
+
+
+import argparse
+import asyncio
+import os
+import sys
+
+SRC_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(SRC_DIR, os.pardir))
+
+import attmon.collector as collector
+import attmon.dedup as dedup
+import attmon.ingest as ingest
+import attmon.profiling as profiling
+import attmon.utils as utils
+
+
+# Output paths of the snapshots of each metric.
+DATA_DIR = os.path.join(SRC_DIR, os.pardir, 'data')
+OUT_PATHS = {
+    ingest.DELAY: os.path.join(DATA_DIR, 'latency'),
+    ingest.LOSS: os.path.join(DATA_DIR, 'loss'),
+}
+
+# File, in the output path, in which the validators of the pages are saved.
+STATE_FILE = '.collector.json'
+
+
+def cube_sink(cube_root, city_data):
+    """Return a function that appends each snapshot to the cube of its metric.
+    """
+    # NumPy is required only for the cube.
+    import attmon.cube as cube
+    import attmon.dense as dense
+    import attmon.tables as tables
+
+    index = dense.city_index(city_data)
+    cubes = {metric: cube.open_or_create(os.path.join(cube_root, metric), index)
+             for metric in collector.PAGES}
+
+    def sink(metric, snap):
+        no_val = tables.missing_val(tables.TABLES[metric])
+        cubes[metric].append(snap.tstamp,
+                             dense.from_dict(snap.matrix, index, no_val))
+    return sink
+
+
+def main(args):
+    city_data = utils.load_city_data(args.city_file)
+
+    out_paths = dict(OUT_PATHS)
+    if args.out_path:
+        out_paths = {m: os.path.join(args.out_path, os.path.basename(p))
+                     for m, p in OUT_PATHS.items()}
+    for path in out_paths.values():
+        if not os.path.isdir(path):
+            os.makedirs(path)
+
+    sinks = []
+    if args.cube_root:
+        sinks.append(cube_sink(args.cube_root, city_data))
+
+    # Create the event loop before the collector, which binds to it.
+    loop = asyncio.new_event_loop()
+    asyncio.set_event_loop(loop)
+
+    # The validators belong with the snapshots they describe.
+    state_file = args.state_file or os.path.join(args.out_path or DATA_DIR,
+                                                 STATE_FILE)
+    store = dedup.Store(args.store_path) if args.store_path else None
+
+    coll = collector.Collector(out_paths, city_data, state_file,
+                               base_url=args.base_url,
+                               sinks=sinks,
+                               timeout=args.timeout,
+                               store=store)
+    loop.run_until_complete(coll.run(args.interval, 1 if args.once else None))
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(
+        description=('Fetch the network delay and loss pages ' +
+                     'periodically, and parse them as they arrive.'))
+    parser.add_argument('--out', dest='out_path', metavar='out_path',
+                        type=str,
+                        help=('Output path; snapshots are written to ' +
+                              'its latency and loss sub-directories ' +
+                              '(default: data/)'))
+    parser.add_argument('--base-url', dest='base_url', metavar='URL',
+                        type=str,
+                        default=collector.BASE_URL,
+                        help='URL of the directory containing the pages')
+    parser.add_argument('--city-data', dest='city_file', metavar='city_file',
+                        type=str,
+                        default=os.path.join(DATA_DIR,
+                                             'city-code-abbrev-name.txt'),
+                        help=('Text file containing ' +
+                              'city codes, abbreviations and names'))
+    parser.add_argument('--cube-root', dest='cube_root', metavar='cube_root',
+                        type=str,
+                        help=('Path under which the snapshots are ' +
+                              'appended to one cube per metric'))
+    parser.add_argument('--store', dest='store_path', metavar='store_path',
+                        type=str,
+                        help=('Add snapshots to a store, which keeps ' +
+                              'identical tables of values only once, ' +
+                              'instead of writing them to files'))
+    parser.add_argument('--state', dest='state_file', metavar='state_file',
+                        type=str,
+                        help=('File in which the validators (ETag, ' +
+                              'Last-Modified) of the pages are saved ' +
+                              '(default: %s in the output path)' %
+                              (STATE_FILE)))
+    parser.add_argument('--interval', dest='interval', metavar='seconds',
+                        type=int,
+                        default=collector.INTERVAL,
+                        help='Interval between polls')
+    parser.add_argument('--timeout', dest='timeout', metavar='seconds',
+                        type=float,
+                        default=collector.TIMEOUT,
+                        help='Time allowed for fetching a page')
+    parser.add_argument('--once', dest='once',
+                        action='store_true',
+                        default=False,
+                        help='Poll once and exit (e.g., when run from cron)')
+    profiling.add_options(parser)
+    args = parser.parse_args()
+    profiling.run(args, main, args)
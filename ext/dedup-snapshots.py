@@ -0,0 +1,71 @@
+#!/usr/bin/env python
+# -*- mode: python; coding: utf-8; fill-column: 80; -*-
+#
+# dedup-snapshots.py
+# Copyright (c) 2026 The attmon contributors.
+#
+
+"""
+dedup-snapshots.py
+Add snapshots to a store that keeps each distinct table of values only once.
+"""
+
+__author__  = 'The attmon contributors'
+__version__ = '1.0'
+__license__ = 'MIT'
+
+
+import argparse
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                                os.pardir))
+
+import attmon.dedup as dedup
+import attmon.profiling as profiling
+import attmon.tables as tables
+import attmon.utils as utils
+
+
+def main(args):
+    in_path = os.path.abspath(args.in_path)
+    if not os.path.isdir(in_path):
+        raise ValueError("Invalid input path!")
+
+    store = dedup.Store(os.path.abspath(args.store_path))
+
+    num_snaps, num_new = 0, 0
+    for metric in sorted(tables.TABLES):
+        for fpath, _ts_dt, _tstamp in utils.list_snapshots(in_path, metric):
+            fname = os.path.basename(fpath)
+            if fname in store:
+                continue
+            _dig, is_new = store.add(fname, utils.load_content(fpath),
+                                     tables.TABLES[metric])
+            num_snaps += 1
+            num_new += is_new
+            if args.remove:
+                os.remove(fpath)
+
+    print("%d snapshots added, %d distinct tables stored" % (num_snaps,
+                                                              num_new))
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(
+        description=('Add snapshots to a store, ' +
+                     'keeping identical tables of values only once.'))
+    parser.add_argument('in_path', metavar='in_path',
+                        type=str,
+                        help='Input path containing snapshot files')
+    parser.add_argument('store_path', metavar='store_path',
+                        type=str,
+                        help='Path of the store')
+    parser.add_argument('--remove', dest='remove',
+                        action='store_true',
+                        default=False,
+                        help='Remove snapshot files once they are stored')
+    profiling.add_options(parser)
+    args = parser.parse_args()
+    profiling.run(args, main, args)
@@ -18,10 +18,11 @@ function crash() {
 CURL=`which curl`
 
 
-# Output directory path and file name.
+# Output directory path and file name; the file is named by the time, in UTC,
+#  of the fetch, as are the snapshots written by `ext/collect.py`.
 readonly SRC_DIR="$( cd "$( dirname "${BASH_SOURCE[0]}" )" && pwd )"
 readonly OUT_PATH="$SRC_DIR/../data/latency"
-readonly OUT_FILE="$OUT_PATH/att-network-delay--`date '+%H%M-%m%d%Y'`.html"
+readonly OUT_FILE="$OUT_PATH/att-network-delay--`date -u '+%H%M-%m%d%Y'`.html"
 
 # URL to fetch.
 readonly URL='http://ipnetwork.bgtmo.ip.att.net/pws/network_delay.html'
@@ -0,0 +1,109 @@
+#!/usr/bin/env python
+# -*- mode: python; coding: utf-8; fill-column: 80; -*-
+#
+# gen-snapshots.py
+# Copyright (c) 2026 The attmon contributors.
+#
+
+"""
+gen-snapshots.py
+Generate a synthetic network of any number of cities, its city data and
+location files, and snapshots of its delay and loss matrices over a span of
+time, for testing the tools at scale.
+"""
+
+__author__  = 'The attmon contributors'
+__version__ = '1.0'
+__license__ = 'MIT'
+
+
+import argparse
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                                os.pardir))
+
+import attmon.profiling as profiling
+import attmon.synth as synth
+import attmon.utils as utils
+
+
+def main(args):
+    out_path = os.path.abspath(args.out_path)
+    if not os.path.isdir(out_path):
+        os.makedirs(out_path)
+
+    beg_ts = utils.parse_time(args.beg_time)
+    if args.end_time:
+        end_ts = utils.parse_time(args.end_time)
+        num_snaps = (end_ts - beg_ts) // args.interval + 1
+    else:
+        num_snaps = args.num_snaps
+    if num_snaps < 1:
+        raise ValueError("Invalid time span!")
+
+    cities = synth.gen_cities(args.num_cities, args.seed)
+    city_file = args.city_file or os.path.join(out_path, 'city-data.txt')
+    locs_file = args.locs_file or os.path.join(out_path, 'city-locs.txt')
+    synth.write_city_data(cities, city_file)
+    synth.write_locs(cities, locs_file)
+
+    net = synth.Network(cities, args.seed)
+    num = synth.gen_snapshots(net, out_path, args.metrics, beg_ts, num_snaps,
+                              args.interval)
+    print("%d cities  => %s, %s" % (len(cities), city_file, locs_file))
+    print("%d snapshots  => %s" % (num, out_path))
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(
+        description=('Generate snapshots of a synthetic network, ' +
+                     'in the layout of the pages published by AT&T.'))
+    parser.add_argument('out_path', metavar='out_path',
+                        type=str,
+                        help='Output path for the snapshot files')
+    parser.add_argument('--cities', dest='num_cities', metavar='N',
+                        type=int,
+                        default=25,
+                        help='Number of cities (default: 25)')
+    parser.add_argument('--from', dest='beg_time', metavar='time',
+                        type=str,
+                        default='2017-07-01',
+                        help=('Time of the first snapshot, as seconds ' +
+                              'since the epoch, or YYYY-MM-DD[THH:MM[:SS]] ' +
+                              'in UTC (default: 2017-07-01)'))
+    parser.add_argument('--to', dest='end_time', metavar='time',
+                        type=str,
+                        help=('Time of the last snapshot; overrides ' +
+                              '--snapshots'))
+    parser.add_argument('--snapshots', dest='num_snaps', metavar='N',
+                        type=int,
+                        default=96,
+                        help='Number of snapshots of each metric (default: 96)')
+    parser.add_argument('--interval', dest='interval', metavar='secs',
+                        type=int,
+                        default=synth.INTERVAL,
+                        help=('Time between snapshots, in seconds ' +
+                              '(default: %d)' % (synth.INTERVAL)))
+    parser.add_argument('--metrics', dest='metrics', metavar='metric',
+                        type=str, nargs='+',
+                        choices=sorted(synth.TITLES),
+                        default=sorted(synth.TITLES),
+                        help="Metrics: 'delay' and/or 'loss' (default: both)")
+    parser.add_argument('--city-data', dest='city_file', metavar='city_file',
+                        type=str,
+                        help=('Output file for the city codes, abbreviations ' +
+                              'and names (default: <out_path>/city-data.txt)'))
+    parser.add_argument('--locs', dest='locs_file', metavar='city-locations',
+                        type=str,
+                        help=('Output file for the latitude-longitude ' +
+                              'coordinates of cities ' +
+                              '(default: <out_path>/city-locs.txt)'))
+    parser.add_argument('--seed', dest='seed', metavar='seed',
+                        type=int,
+                        default=0,
+                        help='Seed of the random number generator')
+    profiling.add_options(parser)
+    args = parser.parse_args()
+    profiling.run(args, main, args)
@@ -0,0 +1,83 @@
+#!/usr/bin/env python
+# -*- mode: python; coding: utf-8; fill-column: 80; -*-
+#
+# pack-snapshots.py
+# Copyright (c) 2026 The attmon contributors.
+#
+
+"""
+pack-snapshots.py
+Pack snapshots, compressed, into a single archive file.
+"""
+
+__author__  = 'The attmon contributors'
+__version__ = '1.0'
+__license__ = 'MIT'
+
+
+import argparse
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                                os.pardir))
+
+import attmon.archive as archive
+import attmon.constants as const
+import attmon.profiling as profiling
+import attmon.tables as tables
+import attmon.utils as utils
+
+
+def main(args):
+    in_path = os.path.abspath(args.in_path)
+    if not os.path.isdir(in_path):
+        raise ValueError("Invalid input path!")
+
+    arch = archive.Archive(os.path.abspath(args.archive_path))
+
+    num_snaps, num_new, num_bytes = 0, 0, 0
+    for metric in sorted(tables.TABLES):
+        table = tables.TABLES[metric] if args.tables_only else None
+        for fpath, _ts_dt, _tstamp in utils.list_snapshots(in_path, metric):
+            fname = os.path.basename(fpath)
+            # Compressed snapshots are stored under their original names.
+            if fname.endswith(const.GZ_EXT):
+                fname = fname[:-len(const.GZ_EXT)]
+            if fname in arch:
+                continue
+            _dig, is_new = arch.add(fname, utils.load_content(fpath), table)
+            num_snaps += 1
+            num_new += is_new
+            num_bytes += os.path.getsize(fpath)
+            if args.remove:
+                os.remove(fpath)
+
+    print("%d snapshots (%d bytes) added, %d distinct snapshots stored; " %
+          (num_snaps, num_bytes, num_new) +
+          "archive size: %d bytes" % (os.path.getsize(arch.path)))
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(
+        description=('Pack snapshots, compressed, into a single archive ' +
+                     'file, which attmon.py reads in place of a directory.'))
+    parser.add_argument('in_path', metavar='in_path',
+                        type=str,
+                        help='Input path containing snapshot files')
+    parser.add_argument('archive_path', metavar='archive_path',
+                        type=str,
+                        help=('Path of the archive; the index is written to ' +
+                              '<archive_path>%s' % (archive.INDEX_EXT)))
+    parser.add_argument('--tables-only', dest='tables_only',
+                        action='store_true',
+                        default=False,
+                        help=('Keep only the table of values of each ' +
+                              'snapshot, instead of the full page'))
+    parser.add_argument('--remove', dest='remove',
+                        action='store_true',
+                        default=False,
+                        help='Remove snapshot files once they are archived')
+    profiling.add_options(parser)
+    args = parser.parse_args()
+    profiling.run(args, main, args)
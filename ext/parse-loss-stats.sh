@@ -20,35 +20,13 @@ readonly CITY_DATA="$SRC_DIR/../data/city-code-abbrev-name.txt"
 
 
 function show_usage() {
-    echo "Usage: $0 <in-path> <out-file>" >& 2
+    echo "Usage: $0 <in-path> <out-file> [--incremental <manifest>]" >& 2
     exit 1
 }
 
-[ $# -ne 2 ] && show_usage
+[ $# -ne 2 ] && [ $# -ne 4 ] && show_usage
 
 readonly IN_PATH="$1"
 readonly OUT_FILE="$2"
 
-# Delete output file if it already exists.
-[ -e $OUT_FILE ] && [ -f $OUT_FILE ] && rm -f $OUT_FILE
-
-for data_file in $(ls $IN_PATH/att-network-loss*.html); do
-    ts_dt=$(basename $data_file | sed -E 's/^att-network-loss--(.*).html$/\1/')
-
-    dt=$(echo $ts_dt | cut -d'-' -f2)
-    mon=$(echo $dt | cut -c1-2)
-    day=$(echo $dt | cut -c3-4)
-    yr=$(echo $dt | cut -c5-8)
-
-    ts=$(echo $ts_dt | cut -d'-' -f1)
-    hr=$(echo $ts | cut -c1-2)
-    min=$(echo $ts | cut -c3-4)
-
-    echo -n "$mon $day $yr $hr $min" >> $OUT_FILE
-    # echo $hr $min $mon $day $yr
-    $ATTMON_BIN loss --city-data $CITY_DATA $data_file | \
-        grep '^#>'                                     | \
-        cut -d':' -f2-                                 | \
-        tr ',' ' '                                     | \
-        tr -s ' ' >> $OUT_FILE
-done
+$ATTMON_BIN batch loss --city-data $CITY_DATA --stats $OUT_FILE $IN_PATH "${@:3}"
@@ -0,0 +1,156 @@
+#!/usr/bin/env python
+# -*- mode: python; coding: utf-8; fill-column: 80; -*-
+#
+# test_batch.py
+# Copyright (c) 2026 The attmon contributors.
+#
+
+"""
+test_batch.py
+Tests of `attmon.py batch`: the time-stamped adjacency lists and statistics are
+those of `attmon.py parse`, snapshots parsed in earlier runs are skipped, and
+the output does not depend on the number of worker processes.
+"""
+
+__author__  = 'The attmon contributors'
+__version__ = '1.0'
+__license__ = 'MIT'
+
+
+import contextlib
+import io
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+
+TEST_DIR = os.path.dirname(os.path.abspath(__file__))
+BASE_DIR = os.path.dirname(TEST_DIR)
+sys.path.insert(0, BASE_DIR)
+
+from attmon import cli
+from attmon import ingest
+from attmon import synth
+from attmon import utils
+
+
+METRIC = 'delay'
+BEG_TS = 1498867200
+INTERVAL = 900
+
+
+def read_lines(fpath):
+    with io.open(fpath, 'r', encoding='utf-8') as f:
+        return f.read().splitlines()
+
+
+class TestBatch(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp(prefix='attmon-test-')
+        self.in_path = os.path.join(self.tmp_dir, 'snapshots')
+        os.makedirs(self.in_path)
+
+        cities = synth.gen_cities(6)
+        self.city_file = os.path.join(self.tmp_dir, 'city-data.txt')
+        synth.write_city_data(cities, self.city_file)
+        self.locs_file = os.path.join(self.tmp_dir, 'city-locs.txt')
+        synth.write_locs(cities, self.locs_file)
+        self.net = synth.Network(cities)
+        self.num_snaps = 0
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp_dir, ignore_errors=True)
+
+    def write(self, num):
+        synth.gen_snapshots(self.net, self.in_path, [METRIC],
+                            BEG_TS + self.num_snaps * INTERVAL, num, INTERVAL)
+        self.num_snaps += num
+
+    def batch(self, out_name, *opts):
+        out_path = os.path.join(self.tmp_dir, out_name)
+        with contextlib.redirect_stdout(io.StringIO()):
+            cli.main(['batch', METRIC, self.in_path, out_path,
+                      '--city-data', self.city_file,
+                      '--stats', out_path + '.stats'] + list(opts))
+        return out_path
+
+    def parse(self, fname):
+        """Return the rows and the statistics written by `attmon.py parse
+        --as-adj-list` for the snapshot.
+        """
+        out_file = os.path.join(self.tmp_dir, 'parse.txt')
+        cli.main(['parse', METRIC, os.path.join(self.in_path, fname),
+                  '--city-data', self.city_file, '--as-adj-list',
+                  '--out', out_file])
+        lines = read_lines(out_file)
+        stats = lines[-1].split(':')[1].split(',')
+        return ([l.split(',') for l in lines[:-1]],
+                [v.strip() for v in stats])
+
+    def test_output(self):
+        # One file per snapshot, named after its time stamp, with the rows of
+        #  the adjacency list prefixed by the time stamp (in seconds since the
+        #  epoch); one line of statistics per snapshot, in time order.
+        self.write(3)
+        out_path = self.batch('out')
+        fnames = sorted(os.listdir(self.in_path))
+        self.assertEqual(sorted(os.listdir(out_path)),
+                         sorted(utils.snapshot_info(f)[1] + '.txt'
+                                for f in fnames))
+
+        stats_lines = []
+        for fname in sorted(fnames, key=lambda f: utils.snapshot_info(f)[2]):
+            _metric, ts_dt, tstamp = utils.snapshot_info(fname)
+            rows, stats = self.parse(fname)
+            self.assertEqual(read_lines(os.path.join(out_path,
+                                                     ts_dt + '.txt')),
+                             [' '.join([str(tstamp)] + r) for r in rows])
+            stats_lines.append(' '.join([str(tstamp)] + stats))
+        self.assertEqual(read_lines(out_path + '.stats'), stats_lines)
+
+    def test_incremental(self):
+        # Snapshots recorded in the manifest are not parsed again, and the
+        #  statistics of new snapshots are appended.
+        manifest = os.path.join(self.tmp_dir, 'manifest')
+        self.write(2)
+        out_path = self.batch('out', '--incremental', manifest)
+        expected = read_lines(out_path + '.stats')
+
+        self.write(2)
+        shutil.rmtree(out_path)
+        self.batch('out', '--incremental', manifest)
+        new = [utils.snapshot_info(f)
+               for f in os.listdir(self.in_path)
+               if utils.snapshot_info(f)[2] >= BEG_TS + 2 * INTERVAL]
+        self.assertEqual(sorted(os.listdir(out_path)),
+                         sorted(ts_dt + '.txt' for _m, ts_dt, _ts in new))
+        incr = read_lines(out_path + '.stats')
+        self.assertEqual(incr[:2], expected)
+
+        # The same as parsing all snapshots at once.
+        full_path = self.batch('full')
+        self.assertEqual(incr, read_lines(full_path + '.stats'))
+
+    def test_jobs(self):
+        # Snapshots parsed by several worker processes, in chunks of
+        #  `ingest.CHUNK_SIZE`, are written in the same (time) order, and with
+        #  the same values, as those parsed serially.
+        self.write(ingest.CHUNK_SIZE * 3 + 1)
+        outputs = []
+        for jobs in (1, 3):
+            out_path = self.batch("out-%d" % (jobs), '--locs', self.locs_file,
+                                  '--jobs', str(jobs))
+            files = {}
+            for fname in os.listdir(out_path):
+                files[fname] = read_lines(os.path.join(out_path, fname))
+            outputs.append((files, read_lines(out_path + '.stats')))
+        self.assertEqual(len(outputs[0][0]), self.num_snaps)
+        self.assertEqual(outputs[0], outputs[1])
+        self.assertEqual([int(l.split()[0]) for l in outputs[1][1]],
+                         [BEG_TS + i * INTERVAL for i in range(self.num_snaps)])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,82 @@
+#!/usr/bin/env python
+# -*- mode: python; coding: utf-8; fill-column: 80; -*-
+#
+# test_cli.py
+# Copyright (c) 2026 The attmon contributors.
+#
+
+"""
+test_cli.py
+Tests of the startup of the sub-commands of `attmon.py`: none may import the
+heavy modules (required only by some of the options), and the time spent
+importing modules must be within the budget (see `ext/bench.py`).
+"""
+
+__author__  = 'The attmon contributors'
+__version__ = '1.0'
+__license__ = 'MIT'
+
+
+import os
+import subprocess
+import sys
+import unittest
+
+TEST_DIR = os.path.dirname(os.path.abspath(__file__))
+BASE_DIR = os.path.dirname(TEST_DIR)
+sys.path.insert(0, BASE_DIR)
+
+from attmon import cli
+
+
+# Modules that no sub-command may import at startup.
+BANNED = ('numpy', 'pyarrow', 'asyncio', 'multiprocessing')
+
+# Maximum time (in milliseconds) spent importing modules, after the start of
+#  the interpreter, as in `ext/bench.py --startup-budget`.
+BUDGET = 25.0
+
+# Number of runs of each sub-command; the fastest is compared to the budget.
+RUNS = 3
+
+
+def import_times(cmd):
+    """Return the time (in milliseconds) spent importing modules after the
+    start of the interpreter, and the names of all modules imported, to print
+    the help of the sub-command.
+    """
+    out = subprocess.run([sys.executable, '-X', 'importtime',
+                          os.path.join(BASE_DIR, 'attmon.py'), cmd, '--help'],
+                         stdout=subprocess.DEVNULL, stderr=subprocess.PIPE,
+                         check=True).stderr.decode('utf-8')
+    total, names = 0, []
+    after_site = False
+    for line in out.splitlines():
+        if not line.startswith('import time:'):
+            continue
+        _self_us, cum_us, name = line[len('import time:'):].split('|')
+        if not cum_us.strip().isdigit():
+            continue
+        names.append(name.strip())
+        # Top-level imports are indented by a single space.
+        if after_site and not name.startswith('  '):
+            total += int(cum_us)
+        elif name.strip() == 'site':
+            after_site = True
+    return total / 1e3, names
+
+
+class TestStartup(unittest.TestCase):
+
+    def test_imports(self):
+        for cmd, _fn, _add_args, _desc in cli.COMMANDS:
+            with self.subTest(cmd=cmd):
+                msecs, names = min(import_times(cmd) for _i in range(RUNS))
+                banned = sorted(set(n.split('.')[0] for n in names) &
+                                set(BANNED))
+                self.assertEqual(banned, [])
+                self.assertLessEqual(msecs, BUDGET)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,151 @@
+#!/usr/bin/env python
+# -*- mode: python; coding: utf-8; fill-column: 80; -*-
+#
+# test_collector.py
+# Copyright (c) 2026 The attmon contributors.
+#
+
+"""
+test_collector.py
+Tests of the collector (see `attmon.collector`) against a local stand-in for
+the server publishing the pages.
+"""
+
+__author__  = 'The attmon contributors'
+__version__ = '1.0'
+__license__ = 'MIT'
+
+
+import asyncio
+import io
+import os
+import shutil
+import sys
+import tempfile
+import threading
+import time
+import unittest
+from http import server
+
+TEST_DIR = os.path.dirname(os.path.abspath(__file__))
+BASE_DIR = os.path.dirname(TEST_DIR)
+sys.path.insert(0, BASE_DIR)
+
+from attmon import collector
+from attmon import utils
+
+
+CITY_FILE = os.path.join(BASE_DIR, 'data', 'city-code-abbrev-name.txt')
+DELAY_FILE = os.path.join(TEST_DIR, 'att-network-delay--0217-06232017.html')
+LOSS_FILE = os.path.join(TEST_DIR, 'att-network-loss--0100-07232017.html')
+
+LAST_MODIFIED = 'Fri, 23 Jun 2017 02:17:00 GMT'
+
+
+class PageHandler(server.BaseHTTPRequestHandler):
+    """Serve the snapshots in this directory as the pages, with a fixed
+    `Last-Modified`; count the requests, and the responses with no content.
+    """
+    protocol_version = 'HTTP/1.1'
+    pages = {}
+    counts = {}
+
+    def do_GET(self):
+        page = self.pages.get(os.path.basename(self.path))
+        if page is None:
+            self.send_error(404)
+            return
+        self.counts['requests'] = self.counts.get('requests', 0) + 1
+        if self.headers.get('If-Modified-Since') == LAST_MODIFIED:
+            self.counts['unchanged'] = self.counts.get('unchanged', 0) + 1
+            self.send_response(304)
+            self.end_headers()
+            return
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/html')
+        self.send_header('Content-Length', str(len(page)))
+        self.send_header('Last-Modified', LAST_MODIFIED)
+        self.end_headers()
+        self.wfile.write(page)
+
+    def log_message(self, *args):
+        pass
+
+
+class TestCollector(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp(prefix='attmon-test-')
+        PageHandler.counts = {}
+        PageHandler.pages = {}
+        for metric, fpath in ((collector.ingest.DELAY, DELAY_FILE),
+                              (collector.ingest.LOSS, LOSS_FILE)):
+            with io.open(fpath, 'rb') as f:
+                PageHandler.pages[collector.PAGES[metric]] = f.read()
+        self.httpd = server.ThreadingHTTPServer(('127.0.0.1', 0), PageHandler)
+        self.thread = threading.Thread(target=self.httpd.serve_forever)
+        self.thread.start()
+
+        self.tz = os.environ.get('TZ')
+        os.environ['TZ'] = 'America/New_York'
+        time.tzset()
+
+    def tearDown(self):
+        if self.tz is None:
+            del os.environ['TZ']
+        else:
+            os.environ['TZ'] = self.tz
+        time.tzset()
+        self.httpd.shutdown()
+        self.httpd.server_close()
+        self.thread.join()
+        shutil.rmtree(self.tmp_dir, ignore_errors=True)
+
+    def test_poll(self):
+        out_paths = {m: os.path.join(self.tmp_dir, m) for m in collector.PAGES}
+        for path in out_paths.values():
+            os.makedirs(path)
+        state_file = os.path.join(self.tmp_dir, 'state.json')
+        base_url = "http://127.0.0.1:%d/pws/" % (self.httpd.server_port)
+
+        # A sink failing (e.g., a cube rejecting a snapshot) does not discard
+        #  the snapshot.
+        sunk = []
+        def sink(metric, snap):
+            sunk.append(metric)
+            raise ValueError('Snapshot rejected!')
+
+        log = io.StringIO()
+        coll = collector.Collector(out_paths, utils.load_city_data(CITY_FILE),
+                                   state_file, base_url=base_url,
+                                   sinks=[sink], log=log)
+
+        async def poll_twice():
+            try:
+                return await coll.poll(), await coll.poll()
+            finally:
+                coll.pool.close()
+
+        self.start = time.time()
+        snaps, unchanged = asyncio.run(poll_twice())
+        self.assertEqual(sorted(s.path for s in snaps),
+                         sorted(os.path.join(out_paths[m], f)
+                                for m in out_paths
+                                for f in os.listdir(out_paths[m])))
+        self.assertEqual(sorted(sunk), sorted(collector.PAGES))
+        self.assertIn('sink failed', log.getvalue())
+        self.assertNotIn('invalid page', log.getvalue())
+
+        # Pages unchanged since the last poll are not downloaded again.
+        self.assertEqual(unchanged, [])
+        self.assertEqual(PageHandler.counts,
+                         {'requests': 4, 'unchanged': 2})
+
+        # Time stamps in the names of the files are in UTC, as read back by
+        #  `utils.snapshot_info`, whatever the local time zone.
+        for snap in snaps:
+            self.assertLess(abs(snap.tstamp - self.start), 120)
+
+
+if __name__ == '__main__':
+    unittest.main()
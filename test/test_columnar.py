@@ -0,0 +1,174 @@
+#!/usr/bin/env python
+# -*- mode: python; coding: utf-8; fill-column: 80; -*-
+#
+# test_columnar.py
+# Copyright (c) 2026 The attmon contributors.
+#
+
+"""
+test_columnar.py
+Tests of the columnar output formats (see `attmon.columnar`); the NumPy format
+requires NumPy, and the Arrow and Parquet formats PyArrow.
+"""
+
+__author__  = 'The attmon contributors'
+__version__ = '1.0'
+__license__ = 'MIT'
+
+
+import json
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+
+TEST_DIR = os.path.dirname(os.path.abspath(__file__))
+BASE_DIR = os.path.dirname(TEST_DIR)
+sys.path.insert(0, BASE_DIR)
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+try:
+    import pyarrow
+except ImportError:
+    pyarrow = None
+
+from attmon import utils
+
+
+CITY_FILE = os.path.join(BASE_DIR, 'data', 'city-code-abbrev-name.txt')
+LOCS_FILE = os.path.join(TEST_DIR, 'city-locs.txt')
+DELAY_FILE = os.path.join(TEST_DIR, 'att-network-delay--0217-06232017.html')
+LOSS_FILE = os.path.join(TEST_DIR, 'att-network-loss--0100-07232017.html')
+
+
+@unittest.skipIf(np is None, 'NumPy is not installed')
+class TestColumnWriter(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp(prefix='attmon-test-')
+        self.cache_dir = os.environ.get(utils.CACHE_DIR_ENV)
+        os.environ[utils.CACHE_DIR_ENV] = os.path.join(self.tmp_dir, 'cache')
+        self.city_data = utils.load_city_data(CITY_FILE)
+
+    def tearDown(self):
+        if self.cache_dir is None:
+            del os.environ[utils.CACHE_DIR_ENV]
+        else:
+            os.environ[utils.CACHE_DIR_ENV] = self.cache_dir
+        shutil.rmtree(self.tmp_dir, ignore_errors=True)
+
+    def write(self, fmt, metric, html_file, locs_file=None):
+        """Parse the snapshot, and write its links as in `attmon.py parse`;
+        return the output file and the (lower-left triangle) adjacency list.
+        """
+        from attmon import cli
+        from attmon import columnar
+        m, stats = cli.PARSERS[metric](html_file, self.city_data, locs_file)
+        alist = utils.adj_list(m, cli.missing_val(metric))
+        fpath = os.path.join(self.tmp_dir, "%s.%s" % (metric, fmt))
+        with columnar.ColumnWriter(fpath, fmt, metric,
+                                   bool(locs_file)) as w:
+            w.write(1498184220, alist, stats)
+        return fpath, alist
+
+    def check_npz(self, fpath, alist):
+        from attmon import columnar
+        cols, meta = columnar.load_npz(fpath)
+        cities = cols['cities']
+        self.assertEqual(cols['src'].dtype.kind, 'i')
+        self.assertEqual(cols['dst'].dtype.kind, 'i')
+        self.assertEqual([(cities[s], cities[d], v) for s, d, v in
+                          zip(cols['src'], cols['dst'], cols['value'])],
+                         [tuple(r) for r in alist])
+        return cols, meta
+
+    def test_npz(self):
+        for metric, html_file in (('delay', DELAY_FILE), ('loss', LOSS_FILE)):
+            fpath, alist = self.write('npz', metric, html_file)
+            _cols, meta = self.check_npz(fpath, alist)
+            self.assertEqual(meta['metric'], metric)
+            self.assertFalse(meta['inflated'])
+
+    def test_parse_npz(self):
+        # The links of the lower-left triangle are written, as in batch, and
+        #  not those of the complete matrix.
+        from attmon import cli
+        fpath, alist = self.write('npz', 'delay', DELAY_FILE)
+        out_file = os.path.join(self.tmp_dir, 'parse.npz')
+        cli.main(['parse', 'delay', DELAY_FILE, '--city-data', CITY_FILE,
+                  '--format', 'npz', '--out', out_file])
+        self.check_npz(out_file, alist)
+
+    def test_npz_inflation(self):
+        fpath, alist = self.write('npz', 'delay', DELAY_FILE, LOCS_FILE)
+        cols, meta = self.check_npz(fpath, alist)
+        self.assertTrue(meta['inflated'])
+        self.assertEqual(cols['value'].dtype, np.float64)
+        # Inflation values are not truncated.
+        self.assertTrue(any(v != int(v) for v in cols['value']))
+
+    @unittest.skipIf(pyarrow is None, 'PyArrow is not installed')
+    def test_arrow_parquet(self):
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        for fmt in ('arrow', 'parquet'):
+            for metric, html_file, locs_file in (
+                    ('delay', DELAY_FILE, None),
+                    ('delay', DELAY_FILE, LOCS_FILE),
+                    ('loss', LOSS_FILE, None)):
+                fpath, alist = self.write(fmt, metric, html_file, locs_file)
+                if fmt == 'arrow':
+                    with pa.OSFile(fpath, 'rb') as f:
+                        table = pa.ipc.open_file(f).read_all()
+                else:
+                    table = pq.read_table(fpath)
+
+                rows = list(zip(table.column('src').to_pylist(),
+                                table.column('dst').to_pylist(),
+                                table.column('value').to_pylist()))
+                self.assertEqual(rows, [tuple(r) for r in alist])
+                meta = json.loads(table.schema.metadata[b'attmon'])
+                self.assertEqual(meta['metric'], metric)
+                self.assertEqual(meta['inflated'], bool(locs_file))
+
+    def test_chunks(self):
+        # Output written in chunks (as they fill) is the same as that written
+        #  at once, and the statistics of every snapshot are kept.
+        from attmon import cli
+        from attmon import columnar
+        m, stats = cli.PARSERS['delay'](DELAY_FILE, self.city_data, None)
+        alist = utils.adj_list(m, cli.missing_val('delay'))
+        tstamps = [1498184220 + i * 900 for i in range(4)]
+        fmts = ('npz', 'arrow', 'parquet') if pyarrow else ('npz',)
+        for fmt in fmts:
+            outputs = []
+            for chunk_rows in (columnar.CHUNK_ROWS, len(alist) // 3):
+                fpath = os.path.join(self.tmp_dir,
+                                     "%d.%s" % (chunk_rows, fmt))
+                with columnar.ColumnWriter(fpath, fmt, 'delay',
+                                           chunk_rows=chunk_rows) as w:
+                    for ts in tstamps:
+                        w.write(ts, alist, stats)
+                data, meta = getattr(columnar, 'load_' + fmt)(fpath)
+                if fmt == 'npz':
+                    cities = data['cities']
+                    rows = [(t, cities[s], cities[d], v) for t, s, d, v in
+                            zip(data['timestamp'], data['src'], data['dst'],
+                                data['value'])]
+                else:
+                    rows = list(zip(*[data.column(c).to_pylist() for c in
+                                      ('timestamp', 'src', 'dst', 'value')]))
+                self.assertEqual([r[0] for r in meta['stats']], tstamps)
+                outputs.append((rows, meta))
+            with self.subTest(fmt=fmt):
+                self.assertEqual(len(outputs[0][0]), len(alist) * 4)
+                self.assertEqual(outputs[0], outputs[1])
+
+
+if __name__ == '__main__':
+    unittest.main()
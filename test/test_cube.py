@@ -0,0 +1,78 @@
+#!/usr/bin/env python
+# -*- mode: python; coding: utf-8; fill-column: 80; -*-
+#
+# test_cube.py
+# Copyright (c) 2026 The attmon contributors.
+#
+
+"""
+test_cube.py
+Tests of the cube of snapshots (see `attmon.cube`); requires NumPy.
+"""
+
+__author__  = 'The attmon contributors'
+__version__ = '1.0'
+__license__ = 'MIT'
+
+
+import io
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+
+TEST_DIR = os.path.dirname(os.path.abspath(__file__))
+BASE_DIR = os.path.dirname(TEST_DIR)
+sys.path.insert(0, BASE_DIR)
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+
+CODES = ('US-AZ-PHOENIX', 'US-CA-LOSANGELES', 'US-CO-DENVER')
+
+
+@unittest.skipIf(np is None, 'NumPy is not installed')
+class TestCube(unittest.TestCase):
+
+    def setUp(self):
+        from attmon import dense
+        self.tmp_dir = tempfile.mkdtemp(prefix='attmon-test-')
+        self.path = os.path.join(self.tmp_dir, 'cube')
+        self.index = dense.CityIndex(CODES)
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp_dir, ignore_errors=True)
+
+    def matrix(self, v):
+        from attmon import dense
+        n = len(self.index)
+        return dense.DenseMatrix(self.index, np.full((n, n), v, np.float64))
+
+    def test_partial_snapshot(self):
+        # A snapshot only partially written (e.g., by an interrupted run) is
+        #  ignored, and overwritten by the next snapshot.
+        from attmon import cube
+        store = cube.create(self.path, self.index)
+        store.append(1498867200, self.matrix(1))
+        with io.open(os.path.join(self.path, cube.VALUES_FILE), 'ab') as f:
+            f.write(b'\0' * 10)
+        with io.open(os.path.join(self.path, cube.TSTAMPS_FILE), 'ab') as f:
+            f.write(b'\0' * 3)
+
+        store = cube.load(self.path)
+        self.assertEqual(len(store), 1)
+        store.append(1498868100, self.matrix(2))
+        store.append(1498869000, self.matrix(3))
+
+        store = cube.load(self.path)
+        np.testing.assert_array_equal(store.tstamps,
+                                      [1498867200, 1498868100, 1498869000])
+        np.testing.assert_array_equal(store.values[:, 0, 0], [1, 2, 3])
+
+
+if __name__ == '__main__':
+    unittest.main()
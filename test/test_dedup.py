@@ -0,0 +1,90 @@
+#!/usr/bin/env python
+# -*- mode: python; coding: utf-8; fill-column: 80; -*-
+#
+# test_dedup.py
+# Copyright (c) 2026 The attmon contributors.
+#
+
+"""
+test_dedup.py
+Tests of the content-addressed store of snapshots (see `attmon.dedup`): tables
+are read back as stored, identical tables are stored once, and the snapshots
+parse the same from the store as from their files.
+"""
+
+__author__  = 'The attmon contributors'
+__version__ = '1.0'
+__license__ = 'MIT'
+
+
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+
+TEST_DIR = os.path.dirname(os.path.abspath(__file__))
+BASE_DIR = os.path.dirname(TEST_DIR)
+sys.path.insert(0, BASE_DIR)
+
+from attmon import dedup
+from attmon import tables
+from attmon import utils
+
+
+CITY_FILE = os.path.join(BASE_DIR, 'data', 'city-code-abbrev-name.txt')
+DELAY_FILE = os.path.join(TEST_DIR, 'att-network-delay--0217-06232017.html')
+LOSS_FILE = os.path.join(TEST_DIR, 'att-network-loss--0100-07232017.html')
+
+
+class TestStore(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp(prefix='attmon-test-')
+        self.store_path = os.path.join(self.tmp_dir, 'store')
+        self.city_data = utils.load_city_data(CITY_FILE)
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp_dir, ignore_errors=True)
+
+    def objects(self):
+        return sorted(fname for _d, _s, fnames in
+                      os.walk(os.path.join(self.store_path, dedup.OBJECTS_DIR))
+                      for fname in fnames)
+
+    def test_round_trip(self):
+        delay = utils.load_content(DELAY_FILE)
+        loss = utils.load_content(LOSS_FILE)
+        # The same table, in a page that differs outside of the table.
+        later = '<!-- polled again -->\n' + delay
+        snaps = (('att-network-delay--0217-06232017.html', delay,
+                  tables.DELAY),
+                 ('att-network-delay--0232-06232017.html', later,
+                  tables.DELAY),
+                 ('att-network-loss--0100-07232017.html', loss,
+                  tables.LOSS))
+
+        store = dedup.Store(self.store_path)
+        added = [store.add(name, page, table) for name, page, table in snaps]
+        self.assertEqual([is_new for _dig, is_new in added],
+                         [True, False, True])
+        self.assertEqual(added[0][0], added[1][0])
+        self.assertEqual(self.objects(), sorted(set(d for d, _n in added)))
+
+        # Read by another instance, as in a later run.
+        store = dedup.Store(self.store_path)
+        self.assertEqual(store.names, [name for name, _p, _t in snaps])
+        for (name, page, table), (dig, _is_new) in zip(snaps, added):
+            self.assertIn(name, store)
+            self.assertEqual(store.digest_of(name), dig)
+            region = store.load(name)
+            self.assertEqual(region, dedup.extract(page, table))
+            self.assertEqual(utils.load_content(os.path.join(self.store_path,
+                                                             name)),
+                             region)
+            self.assertEqual(tables.parse(region, self.city_data, table),
+                             tables.parse(page, self.city_data, table))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,93 @@
+#!/usr/bin/env python
+# -*- mode: python; coding: utf-8; fill-column: 80; -*-
+#
+# test_dense.py
+# Copyright (c) 2026 The attmon contributors.
+#
+
+"""
+test_dense.py
+Tests of the dense matrices (see `attmon.dense`), and of the inflation values
+computed on them, against the dictionaries of dictionaries parsed from the
+snapshots in this directory; requires NumPy.
+"""
+
+__author__  = 'The attmon contributors'
+__version__ = '1.0'
+__license__ = 'MIT'
+
+
+import copy
+import os
+import sys
+import unittest
+
+TEST_DIR = os.path.dirname(os.path.abspath(__file__))
+BASE_DIR = os.path.dirname(TEST_DIR)
+sys.path.insert(0, BASE_DIR)
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+from attmon import constants as const
+from attmon import tables
+from attmon import utils
+
+
+CITY_FILE = os.path.join(BASE_DIR, 'data', 'city-code-abbrev-name.txt')
+LOCS_FILE = os.path.join(TEST_DIR, 'city-locs.txt')
+DELAY_FILE = os.path.join(TEST_DIR, 'att-network-delay--0217-06232017.html')
+LOSS_FILE = os.path.join(TEST_DIR, 'att-network-loss--0100-07232017.html')
+
+
+@unittest.skipIf(np is None, 'NumPy is not installed')
+class TestDenseMatrix(unittest.TestCase):
+
+    def setUp(self):
+        self.city_data = utils.load_city_data(CITY_FILE)
+
+    def parse(self, fpath, table):
+        return tables.parse(utils.load_content(fpath), self.city_data, table)[0]
+
+    def test_round_trip(self):
+        from attmon import dense
+        index = dense.city_index(self.city_data)
+        for fpath, table in ((DELAY_FILE, tables.DELAY),
+                             (LOSS_FILE, tables.LOSS)):
+            m = self.parse(fpath, table)
+            no_val = tables.missing_val(table)
+            dm = dense.from_dict(m, index, no_val)
+            self.assertEqual(dm.values.shape, (len(index), len(index)))
+
+            # Blank cells are left out, unless every cell is kept.
+            self.assertEqual(dense.to_dict(dm),
+                             {r: {c: v for c, v in row.items() if v != no_val}
+                              for r, row in m.items()
+                              if any(v != no_val for v in row.values())})
+            self.assertEqual(dense.to_dict(dm, m, no_val), m)
+
+    def test_inflation(self):
+        # Inflation values are those of the original (pure Python) conversion,
+        #  with 0.0 for blank cells.
+        from attmon import ingest
+        from attmon import rttmon
+        m = self.parse(DELAY_FILE, tables.DELAY)
+        infs = ingest.inflate(m, ingest.load_distances(self.city_data,
+                                                       LOCS_FILE))
+        expected = rttmon.compute_inf(copy.deepcopy(m),
+                                      utils.load_locs(LOCS_FILE))
+        self.assertEqual(sorted(infs), sorted(m))
+        for r, row in m.items():
+            self.assertEqual(sorted(infs[r]), sorted(row))
+            for c, v in row.items():
+                if v == rttmon.NO_RTT_VAL:
+                    self.assertEqual(infs[r][c], 0.0)
+                else:
+                    self.assertAlmostEqual(infs[r][c], expected[r][c],
+                                           places=const.PREC)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,128 @@
+#!/usr/bin/env python
+# -*- mode: python; coding: utf-8; fill-column: 80; -*-
+#
+# test_linkstats.py
+# Copyright (c) 2026 The attmon contributors.
+#
+
+"""
+test_linkstats.py
+Tests of the streaming statistics of links (see `attmon.linkstats`), and of the
+statistics computed from them on files and on cubes (see `attmon.variation`).
+"""
+
+__author__  = 'The attmon contributors'
+__version__ = '1.0'
+__license__ = 'MIT'
+
+
+import io
+import os
+import random
+import shutil
+import sys
+import tempfile
+import unittest
+
+TEST_DIR = os.path.dirname(os.path.abspath(__file__))
+BASE_DIR = os.path.dirname(TEST_DIR)
+sys.path.insert(0, BASE_DIR)
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+from attmon import linkstats
+
+
+CODES = ('US-AZ-PHOENIX', 'US-CA-LOSANGELES', 'US-CO-DENVER')
+
+# Time stamp of the first snapshot, and interval (in seconds) between snapshots.
+BEG_TS = 1498867200
+INTERVAL = 15 * 60
+
+
+class TestQuantileSketch(unittest.TestCase):
+
+    def setUp(self):
+        rnd = random.Random(0)
+        self.vals = [rnd.randint(1, 500) for _i in range(20000)]
+
+    def test_deterministic(self):
+        sketches = []
+        for _i in range(2):
+            sketch = linkstats.QuantileSketch()
+            for v in self.vals:
+                sketch.add(v)
+            sketches.append(sketch)
+        self.assertEqual(sketches[0].to_list(), sketches[1].to_list())
+
+        # Values added in bulk result in the same sketch.
+        sketch = linkstats.QuantileSketch()
+        sketch.extend(self.vals[:1234])
+        sketch.extend(self.vals[1234:])
+        self.assertEqual(sketch.to_list(), sketches[0].to_list())
+
+    def test_extend(self):
+        ls, bulk = linkstats.LinkStats(100), linkstats.LinkStats(100)
+        for v in self.vals:
+            ls.add(v)
+        bulk.extend(self.vals)
+        self.assertEqual((bulk.count, bulk.min, bulk.max, bulk.exceed),
+                         (ls.count, ls.min, ls.max, ls.exceed))
+        self.assertAlmostEqual(bulk.avg(), ls.avg())
+        self.assertAlmostEqual(bulk.std(), ls.std())
+        self.assertEqual(bulk.sketch.to_list(), ls.sketch.to_list())
+
+
+@unittest.skipIf(np is None, 'NumPy is not installed')
+class TestVariation(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp(prefix='attmon-test-')
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp_dir, ignore_errors=True)
+
+    def test_cube_and_files(self):
+        # The statistics of each link are the same, whether computed on the
+        #  files of links (see `merge`) or on a cube with the same data.
+        from attmon import cube
+        from attmon import dense
+        from attmon import variation
+
+        index = dense.CityIndex(CODES)
+        n, num = len(index), 1000
+        rnd = np.random.RandomState(0)
+        vals = rnd.randint(1, 100, (num, n, n)).astype(np.float64)
+        vals[rnd.uniform(size=vals.shape) < 0.1] = np.nan
+
+        cube_path = os.path.join(self.tmp_dir, 'cube')
+        links_path = os.path.join(self.tmp_dir, 'links')
+        os.makedirs(links_path)
+        store = cube.create(cube_path, index)
+        for t in range(num):
+            store.append(BEG_TS + t * INTERVAL,
+                         dense.DenseMatrix(index, vals[t]))
+        for i, src in enumerate(CODES):
+            for j, dst in enumerate(CODES):
+                fpath = os.path.join(links_path, "%s-%s" % (src, dst))
+                with io.open(fpath, 'w', encoding='utf-8') as f:
+                    for t in range(num):
+                        if not np.isnan(vals[t, i, j]):
+                            f.write(u"%d %d\n" % (BEG_TS + t * INTERVAL,
+                                                  vals[t, i, j]))
+
+        end_ts = BEG_TS + (num - 1) * INTERVAL
+        expected = sorted(variation.analyze(links_path, BEG_TS, end_ts))
+        # In one chunk, and in chunks of 7 snapshots.
+        for chunk_size in (variation.CHUNK_SIZE, 7 * n * n * 4):
+            self.assertEqual(
+                sorted(variation.analyze_cube(cube_path, BEG_TS, end_ts,
+                                              chunk_size)),
+                expected)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,234 @@
+#!/usr/bin/env python
+# -*- mode: python; coding: utf-8; fill-column: 80; -*-
+#
+# test_merge.py
+# Copyright (c) 2026 The attmon contributors.
+#
+
+"""
+test_merge.py
+Tests of the (incremental) merge of the data files written by `attmon.py batch`
+(see `attmon.merge`), and of the merge of sorted files in bounded memory, with
+a bounded number of open files (see `attmon.kmerge`).
+"""
+
+__author__  = 'The attmon contributors'
+__version__ = '1.0'
+__license__ = 'MIT'
+
+
+import collections
+import io
+import os
+import random
+import shutil
+import sys
+import tempfile
+import unittest
+from unittest import mock
+
+TEST_DIR = os.path.dirname(os.path.abspath(__file__))
+BASE_DIR = os.path.dirname(TEST_DIR)
+sys.path.insert(0, BASE_DIR)
+
+from attmon import cli
+from attmon import kmerge
+from attmon import linkstats
+from attmon import merge
+
+
+LINKS = (('US-CA-LOSANGELES', 'US-AZ-PHOENIX'),
+         ('US-CO-DENVER', 'US-AZ-PHOENIX'))
+
+
+class TestMerge(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp(prefix='attmon-test-')
+        self.in_path = os.path.join(self.tmp_dir, 'in')
+        os.makedirs(self.in_path)
+        self.manifest = os.path.join(self.tmp_dir, 'manifest')
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp_dir, ignore_errors=True)
+
+    def write(self, name, tstamps, val, mtime=None):
+        fpath = os.path.join(self.in_path, name)
+        with io.open(fpath, 'w', encoding='utf-8') as f:
+            for ts in tstamps:
+                for src, dst in LINKS:
+                    f.write(u"%d %s %s %d\n" % (ts, src, dst, val))
+        if mtime is not None:
+            os.utime(fpath, (mtime, mtime))
+
+    def merge(self, out_name, incremental=True):
+        out_path = os.path.join(self.tmp_dir, out_name)
+        argv = ['merge', 'delay', self.in_path, out_path,
+                '--summary', os.devnull]
+        if incremental:
+            argv += ['--incremental', self.manifest]
+        cli.main(argv)
+
+        links = {}
+        for fname in sorted(os.listdir(out_path)):
+            with io.open(os.path.join(out_path, fname), 'r',
+                         encoding='utf-8') as f:
+                links[fname] = f.read()
+        return links
+
+    def test_modified_file(self):
+        self.write('0000-07012017.txt', (1498867200, 1498868100), 10, 1000)
+        self.merge('out')
+        self.write('0030-07012017.txt', (1498869000,), 20, 1000)
+        self.merge('out')
+
+        # A file modified since it was merged is not appended again; all files
+        #  are merged again instead.
+        self.write('0000-07012017.txt', (1498867200, 1498868100), 15, 2000)
+        links = self.merge('out')
+        self.assertEqual(links, self.merge('full', incremental=False))
+        stats = linkstats.load(self.manifest + merge.LINKS_EXT)
+        self.assertEqual(sorted(stats), sorted(LINKS))
+        for ls in stats.values():
+            self.assertEqual((ls.count, ls.min, ls.max), (3, 15, 20))
+
+    def test_late_file(self):
+        # A file with data older than the data merged is not appended, which
+        #  would break the time order of the data of links; all files are
+        #  merged again instead.
+        self.write('0030-07012017.txt', (1498869000,), 20)
+        self.merge('out')
+        self.write('0000-07012017.txt', (1498867200, 1498868100), 10)
+        links = self.merge('out')
+        self.assertEqual(links, self.merge('full', incremental=False))
+        for data in links.values():
+            tstamps = [int(l.split()[0]) for l in data.splitlines()]
+            self.assertEqual(tstamps, sorted(tstamps))
+        stats = linkstats.load(self.manifest + merge.LINKS_EXT)
+        for ls in stats.values():
+            self.assertEqual((ls.count, ls.min, ls.max), (3, 10, 20))
+
+    def test_interrupted(self):
+        # A run interrupted after appending to the output, but before saving
+        #  the statistics and the manifest, is not appended again.
+        self.write('0000-07012017.txt', (1498867200, 1498868100), 10)
+        self.merge('out')
+        self.write('0030-07012017.txt', (1498869000,), 20)
+        with mock.patch.object(merge.linkstats, 'save',
+                               side_effect=KeyboardInterrupt):
+            with self.assertRaises(KeyboardInterrupt):
+                self.merge('out')
+        links = self.merge('out')
+        self.assertEqual(links, self.merge('full', incremental=False))
+        stats = linkstats.load(self.manifest + merge.LINKS_EXT)
+        for ls in stats.values():
+            self.assertEqual((ls.count, ls.min, ls.max), (3, 10, 20))
+
+
+class OpenFiles(object):
+    """Stand-in for the `io` module of `kmerge` that counts the files open for
+    reading and for writing, and records the maximum of each.
+    """
+
+    def __init__(self):
+        self.num_open = collections.Counter()
+        self.peak = collections.Counter()
+
+    def open(self, fpath, mode='r', **kwargs):
+        f = io.open(fpath, mode, **kwargs)
+        kind = 'r' if 'r' in mode else 'w'
+        self.num_open[kind] += 1
+        self.peak[kind] = max(self.peak[kind], self.num_open[kind])
+        return TrackedFile(f, self, kind)
+
+
+class TrackedFile(object):
+
+    def __init__(self, f, files, kind):
+        self.f = f
+        self.files = files
+        self.kind = kind
+
+    def __getattr__(self, name):
+        return getattr(self.f, name)
+
+    def __iter__(self):
+        return iter(self.f)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    def close(self):
+        if not self.f.closed:
+            self.files.num_open[self.kind] -= 1
+            self.f.close()
+
+
+class TestKMerge(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp(prefix='attmon-test-')
+        self.rnd = random.Random(0)
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp_dir, ignore_errors=True)
+
+    def write(self, num_files, num_rows):
+        """Write files of rows sorted by time stamp, with overlapping spans and
+        repeated time stamps; return the paths of the files and the rows.
+        """
+        fpaths, rows = [], []
+        for i in range(num_files):
+            tstamps = sorted(self.rnd.randrange(1000) for _j in range(num_rows))
+            lines = [u"%d L%d %d\n" % (ts, self.rnd.randrange(5), i)
+                     for ts in tstamps]
+            fpath = os.path.join(self.tmp_dir, "in-%d.txt" % (i))
+            with io.open(fpath, 'w', encoding='utf-8') as f:
+                f.write(u''.join(lines))
+            fpaths.append(fpath)
+            rows.extend(lines)
+        return fpaths, rows
+
+    def test_order(self):
+        fpaths, rows = self.write(9, 50)
+        parse = lambda line: (int(line.split()[0]),)
+        for max_open in (kmerge.MAX_OPEN, 2):
+            with self.subTest(max_open=max_open):
+                files = OpenFiles()
+                with mock.patch.object(kmerge, 'io', files):
+                    merged = [line for _row, line in
+                              kmerge.merge(fpaths, parse, max_open,
+                                           self.tmp_dir)]
+                self.assertEqual(collections.Counter(merged),
+                                 collections.Counter(rows))
+                tstamps = [int(l.split()[0]) for l in merged]
+                self.assertEqual(tstamps, sorted(tstamps))
+                self.assertLessEqual(files.peak['r'], max_open)
+                self.assertEqual(files.num_open['r'], 0)
+        # Temporary files are removed.
+        self.assertEqual(sorted(os.listdir(self.tmp_dir)),
+                         sorted(os.path.basename(f) for f in fpaths))
+
+    def test_writer(self):
+        _fpaths, rows = self.write(1, 200)
+        out_path = os.path.join(self.tmp_dir, 'out')
+        os.makedirs(out_path)
+        files = OpenFiles()
+        with mock.patch.object(kmerge, 'io', files):
+            with kmerge.LinkWriter(out_path, max_open=2, max_rows=7) as w:
+                for line in rows:
+                    w.write(line.split()[1], line)
+        self.assertLessEqual(files.peak['w'], 2)
+        self.assertEqual(files.num_open['w'], 0)
+        for link in sorted(set(l.split()[1] for l in rows)):
+            with io.open(os.path.join(out_path, link), 'r',
+                         encoding='utf-8') as f:
+                self.assertEqual(f.read(), u''.join(
+                    l for l in rows if l.split()[1] == link))
+
+
+if __name__ == '__main__':
+    unittest.main()
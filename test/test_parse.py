@@ -0,0 +1,175 @@
+#!/usr/bin/env python
+# -*- mode: python; coding: utf-8; fill-column: 80; -*-
+#
+# test_parse.py
+# Copyright (c) 2026 The attmon contributors.
+#
+
+"""
+test_parse.py
+Regression tests of the output of `attmon.py parse` on the snapshots in this
+directory.
+"""
+
+__author__  = 'The attmon contributors'
+__version__ = '1.0'
+__license__ = 'MIT'
+
+
+import io
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from attmon import constants as const
+from attmon import pcache
+from attmon import tables
+from attmon import tokenizer
+from attmon import utils
+
+
+TEST_DIR = os.path.dirname(os.path.abspath(__file__))
+BASE_DIR = os.path.dirname(TEST_DIR)
+
+CITY_FILE = os.path.join(BASE_DIR, 'data', 'city-code-abbrev-name.txt')
+LOCS_FILE = os.path.join(TEST_DIR, 'city-locs.txt')
+DELAY_FILE = os.path.join(TEST_DIR, 'att-network-delay--0217-06232017.html')
+LOSS_FILE = os.path.join(TEST_DIR, 'att-network-loss--0100-07232017.html')
+# Output of the original (pure Python) implementation for the delay snapshot
+#  and locations, as a complete matrix of inflation values.
+INF_FILE = os.path.join(TEST_DIR, 'att-network-delay--0217-06232017.inf.txt')
+
+
+def run_attmon(args, cache_dir):
+    env = dict(os.environ, ATTMON_CACHE_DIR=cache_dir)
+    return subprocess.check_output([sys.executable,
+                                    os.path.join(BASE_DIR, 'attmon.py')] +
+                                   args, env=env).decode('utf-8')
+
+
+def legacy_rows(page, no_val):
+    """Yield each row of the table of values in the page, as found by the
+    per-line cascade of regular expressions of the original parsers.
+    """
+    scan = False
+    proc = False
+    curr_row = []
+
+    for line in (line.strip() for line in page.split(const.NEWLINE) if line):
+        if not scan and const.TAB_BEG_PAT.match(line):
+            scan = True
+        elif not scan:
+            continue
+
+        if not proc and const.DATA_BEG_PAT.match(line):
+            proc = True
+            continue
+        elif not proc:
+            continue
+
+        td_val = const.TD_VAL_PAT.match(line)
+        if td_val:
+            val = td_val.group(1)
+            if not val:
+                if td_val.group(2).strip() != const.NO_VAL:
+                    raise ValueError('Unable to parse table data!')
+                val = no_val
+            curr_row.append(val.strip())
+
+        if const.ROW_END_PAT.match(line):
+            if curr_row:
+                yield curr_row
+            curr_row = []
+
+        if const.TAB_END_PAT.match(line):
+            break
+
+
+class TestTokenizer(unittest.TestCase):
+
+    def test_rows(self):
+        for html_file, table in ((DELAY_FILE, tables.DELAY),
+                                 (LOSS_FILE, tables.LOSS)):
+            with self.subTest(html_file=os.path.basename(html_file)):
+                page = utils.load_content(html_file)
+                rows = list(tokenizer.rows(page, table.no_val,
+                                           table.beg_pat))
+                self.assertTrue(rows)
+                self.assertEqual(rows, list(legacy_rows(page, table.no_val)))
+
+
+class TestInflation(unittest.TestCase):
+
+    def setUp(self):
+        self.cache_dir = tempfile.mkdtemp(prefix='attmon-test-')
+
+    def tearDown(self):
+        shutil.rmtree(self.cache_dir, ignore_errors=True)
+
+    def test_gnuplot_matrix(self):
+        with io.open(INF_FILE, 'r', encoding='utf-8') as f:
+            expected = f.read()
+        # Parsed without the cache, then once without and once with cached
+        #  results (see `pcache`).
+        out = run_attmon(['delay', DELAY_FILE, '--city-data', CITY_FILE,
+                          '--locs', LOCS_FILE], self.cache_dir)
+        self.assertEqual(out, expected)
+        self.assertNotIn(pcache.CACHE_SUBDIR, os.listdir(self.cache_dir))
+        for _i in range(2):
+            out = run_attmon(['delay', DELAY_FILE, '--city-data', CITY_FILE,
+                              '--locs', LOCS_FILE, '--parse-cache'],
+                             self.cache_dir)
+            self.assertEqual(out, expected)
+        self.assertIn(pcache.CACHE_SUBDIR, os.listdir(self.cache_dir))
+
+        # Every row has a value for every city in the header; the statistics
+        #  follow the rows, as a comment.
+        lines = [l for l in out.splitlines() if not l.startswith('#')]
+        num_cols = len(lines[0].split(','))
+        for line in lines[1:]:
+            self.assertEqual(len(line.split(',')), num_cols)
+
+    def test_invalid_cache_dir(self):
+        # A cache that cannot be written is skipped.
+        with io.open(INF_FILE, 'r', encoding='utf-8') as f:
+            expected = f.read()
+        cache_file = os.path.join(self.cache_dir, 'file')
+        io.open(cache_file, 'w').close()
+        out = run_attmon(['delay', DELAY_FILE, '--city-data', CITY_FILE,
+                          '--locs', LOCS_FILE, '--parse-cache', cache_file],
+                         self.cache_dir)
+        self.assertEqual(out, expected)
+
+
+class TestParseCache(unittest.TestCase):
+
+    def setUp(self):
+        self.cache_dir = tempfile.mkdtemp(prefix='attmon-test-')
+        self.city_data = utils.load_city_data(CITY_FILE)
+
+    def tearDown(self):
+        shutil.rmtree(self.cache_dir, ignore_errors=True)
+
+    def test_warm_hit(self):
+        # A matrix read from the cache is the same as one parsed afresh.
+        page = utils.load_content(DELAY_FILE)
+        for table in (tables.DELAY, tables.LOSS):
+            cold = tables.parse(page, self.city_data, table)
+            cache = pcache.ParseCache(self.city_data, self.cache_dir)
+            self.assertEqual(pcache.parse_page(page, self.city_data, table,
+                                               cache), cold)
+            # Read by another instance, as in a later run.
+            cache = pcache.ParseCache(self.city_data, self.cache_dir)
+            self.assertEqual(len(cache.entries()), 1)
+            cache.put = None
+            self.assertEqual(pcache.parse_page(page, self.city_data, table,
+                                               cache), cold)
+            shutil.rmtree(self.cache_dir)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,124 @@
+#!/usr/bin/env python
+# -*- mode: python; coding: utf-8; fill-column: 80; -*-
+#
+# test_profiling.py
+# Copyright (c) 2026 The attmon contributors.
+#
+
+"""
+test_profiling.py
+Tests of the instrumentation of the stages of the pipeline (see
+`attmon.profiling`): the stages are timed and counted only with `--profile`,
+including those run by worker processes.
+"""
+
+__author__  = 'The attmon contributors'
+__version__ = '1.0'
+__license__ = 'MIT'
+
+
+import argparse
+import contextlib
+import io
+import json
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+
+TEST_DIR = os.path.dirname(os.path.abspath(__file__))
+BASE_DIR = os.path.dirname(TEST_DIR)
+sys.path.insert(0, BASE_DIR)
+
+from attmon import cli
+from attmon import ingest
+from attmon import profiling
+from attmon import synth
+from attmon import tables
+from attmon import utils
+
+
+CITY_FILE = os.path.join(BASE_DIR, 'data', 'city-code-abbrev-name.txt')
+DELAY_FILE = os.path.join(TEST_DIR, 'att-network-delay--0217-06232017.html')
+
+
+class TestProfiling(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp(prefix='attmon-test-')
+        self.report_file = os.path.join(self.tmp_dir, 'profile.json')
+
+    def tearDown(self):
+        profiling.disable()
+        shutil.rmtree(self.tmp_dir, ignore_errors=True)
+
+    def run_cli(self, argv):
+        """Run `attmon.py`, and return what it wrote to standard error.
+        """
+        err = io.StringIO()
+        with contextlib.redirect_stderr(err), \
+             contextlib.redirect_stdout(io.StringIO()):
+            cli.main(argv)
+        return err.getvalue()
+
+    def test_run(self):
+        # The functions of the stages are wrapped only during a profiled run.
+        parse = tables.parse
+        state = []
+        fn = lambda: state.append((profiling.enabled(), tables.parse))
+        parser = argparse.ArgumentParser()
+        profiling.add_options(parser)
+
+        profiling.run(parser.parse_args([]), fn)
+        self.assertEqual(state.pop(), (False, parse))
+        self.assertIsNone(profiling.collect())
+
+        with contextlib.redirect_stderr(io.StringIO()):
+            profiling.run(parser.parse_args(['--profile']), fn)
+        enabled, wrapped = state.pop()
+        self.assertTrue(enabled)
+        self.assertIsNot(wrapped, parse)
+        self.assertFalse(profiling.enabled())
+        self.assertIs(tables.parse, parse)
+
+    def test_parse(self):
+        argv = ['parse', 'delay', DELAY_FILE, '--city-data', CITY_FILE,
+                '--out', os.path.join(self.tmp_dir, 'out.txt')]
+        self.assertEqual(self.run_cli(argv), '')
+        self.assertFalse(os.path.exists(self.report_file))
+
+        self.assertIn('load_content', self.run_cli(argv + ['--profile']))
+        self.run_cli(argv + ['--profile-out', self.report_file])
+        with io.open(self.report_file, 'r', encoding='utf-8') as f:
+            stages = json.load(f)['stages']
+        size = len(utils.load_content(DELAY_FILE))
+        self.assertEqual((stages['load_content']['files'],
+                          stages['load_content']['bytes']), (1, size))
+        self.assertEqual((stages['parse']['calls'], stages['parse']['bytes']),
+                         (1, size))
+        self.assertEqual(stages['write_gp_data']['calls'], 1)
+
+    def test_jobs(self):
+        # The stages run by worker processes are added up.
+        in_path = os.path.join(self.tmp_dir, 'snapshots')
+        os.makedirs(in_path)
+        cities = synth.gen_cities(6)
+        city_file = os.path.join(self.tmp_dir, 'city-data.txt')
+        synth.write_city_data(cities, city_file)
+        num_snaps = ingest.CHUNK_SIZE + 1
+        synth.gen_snapshots(synth.Network(cities), in_path, ['delay'],
+                            1498867200, num_snaps)
+        self.run_cli(['batch', 'delay', in_path,
+                      os.path.join(self.tmp_dir, 'out'),
+                      '--city-data', city_file, '--jobs', '2',
+                      '--profile-out', self.report_file])
+        with io.open(self.report_file, 'r', encoding='utf-8') as f:
+            stages = json.load(f)['stages']
+        self.assertEqual(stages['load_content']['files'], num_snaps)
+        self.assertEqual(stages['parse']['calls'], num_snaps)
+        self.assertEqual(stages['write_adj_list']['calls'], num_snaps)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,160 @@
+#!/usr/bin/env python
+# -*- mode: python; coding: utf-8; fill-column: 80; -*-
+#
+# test_query.py
+# Copyright (c) 2026 The attmon contributors.
+#
+
+"""
+test_query.py
+Tests of the queries of links over a cube (see `attmon.query`); requires NumPy.
+"""
+
+__author__  = 'The attmon contributors'
+__version__ = '1.0'
+__license__ = 'MIT'
+
+
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+import warnings
+
+TEST_DIR = os.path.dirname(os.path.abspath(__file__))
+BASE_DIR = os.path.dirname(TEST_DIR)
+sys.path.insert(0, BASE_DIR)
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+
+CODES = ('US-AZ-PHOENIX', 'US-CA-LOSANGELES', 'US-CO-DENVER', 'US-GA-ATLANTA')
+
+# Interval (in seconds) between snapshots.
+INTERVAL = 15 * 60
+
+
+@unittest.skipIf(np is None, 'NumPy is not installed')
+class TestQuery(unittest.TestCase):
+
+    def setUp(self):
+        from attmon import cube
+        from attmon import dense
+        self.tmp_dir = tempfile.mkdtemp(prefix='attmon-test-')
+        self.index = dense.CityIndex(CODES)
+        self.rnd = np.random.RandomState(0)
+        self.store = cube.create(os.path.join(self.tmp_dir, 'cube'),
+                                 self.index)
+        self.append(0, 300)
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp_dir, ignore_errors=True)
+
+    def append(self, beg, end):
+        """Append snapshots `beg` through `end` (exclusive), each with values
+        only in the lower-left triangle of its matrix.
+        """
+        from attmon import dense
+        n = len(self.index)
+        for i in range(beg, end):
+            # Values are distinct, so that no links tie in the rankings.
+            vals = np.tril(self.rnd.uniform(1, 100, (n, n)), -1)
+            vals[vals == 0] = np.nan
+            self.store.append(1498867200 + i * INTERVAL,
+                              dense.DenseMatrix(self.index, vals))
+
+    def test_link_series(self):
+        from attmon import query
+        # Only the lower-left triangle has values (e.g., Los Angeles, Phoenix).
+        beg_ts, end_ts = 1498867200 + 10 * INTERVAL, 1498867200 + 20 * INTERVAL
+        ts, vals = query.link_series(self.store, CODES[1], CODES[0],
+                                     beg_ts, end_ts)
+        self.assertEqual(len(ts), 11)
+        np.testing.assert_array_equal(vals, self.store.values[10:21, 1, 0])
+
+        # Direction and case of the cities do not matter.
+        for src, dst in ((CODES[0], CODES[1]),
+                         (CODES[1].lower(), CODES[0].title())):
+            ts2, vals2 = query.link_series(self.store, src, dst, beg_ts,
+                                           end_ts)
+            np.testing.assert_array_equal(ts2, ts)
+            np.testing.assert_array_equal(vals2, vals)
+
+        with self.assertRaises(ValueError):
+            query.link_series(self.store, 'US-XX-NOWHERE', CODES[0])
+
+        # Cities may be given by abbreviation or name, with the city data.
+        from attmon import cities
+        reg = cities.Registry({'PHX': CODES[0], 'LAX': CODES[1]},
+                              {'LOS ANGELES': CODES[1]})
+        for src, dst in (('los angeles', 'phx'), ('Lax', CODES[0])):
+            ts2, vals2 = query.link_series(self.store, src, dst, beg_ts,
+                                           end_ts, reg)
+            np.testing.assert_array_equal(vals2, vals)
+        with self.assertRaises(ValueError):
+            query.link_series(self.store, 'DEN', 'PHX', reg=reg)
+
+        # The summary is not needed, and so not created, for a link.
+        self.assertFalse(os.path.exists(os.path.join(self.store.path,
+                                                     query.SUMMARY_DIR)))
+
+    def test_link_series_summary(self):
+        # A link is read from the link-major copy in the summary, and from the
+        #  cube for snapshots appended since the summary was last updated.
+        from attmon import query
+        query.Summary(self.store)
+        self.append(300, 350)
+        store, summary = query.open_cube(self.store.path)
+        self.assertEqual((summary.covered, len(store)), (300, 350))
+
+        at = lambda i: 1498867200 + i * INTERVAL
+        for beg_ts, end_ts in ((None, None), (at(10), at(20)),
+                               (at(90), at(320)), (at(320), None)):
+            for src, dst in ((CODES[1], CODES[0]), (CODES[3], CODES[2]),
+                             (CODES[0], CODES[3])):
+                ts, vals = query.link_series(store, src, dst, beg_ts, end_ts)
+                ts2, vals2 = query.link_series(store, src, dst, beg_ts,
+                                               end_ts, summary=summary)
+                np.testing.assert_array_equal(ts2, ts)
+                np.testing.assert_array_equal(vals2, vals)
+
+    def check_top(self, beg_ts=None, end_ts=None):
+        from attmon import query
+        beg, end = self.store.span(beg_ts, end_ts)
+        vals = np.asarray(self.store.values[beg:end], np.float64)
+        n = len(self.index)
+        for by, fn in ((query.AVG, np.nanmean),
+                       (query.STD, lambda v, axis: np.nanstd(v, axis, ddof=1)),
+                       (query.MAX, np.nanmax)):
+            top = query.top_links(self.store, 3, by, beg_ts, end_ts)
+            # Links without values (e.g., in the upper-right triangle).
+            with warnings.catch_warnings():
+                warnings.simplefilter('ignore', RuntimeWarning)
+                expected = fn(vals, axis=0).ravel()
+            expected = np.where(np.isnan(expected), -np.inf, expected)
+            order = np.lexsort((np.arange(n * n), -expected))[:3]
+            self.assertEqual([l for _v, l in top],
+                             [(CODES[i // n], CODES[i % n]) for i in order])
+            np.testing.assert_allclose([v for v, _l in top], expected[order])
+
+    def test_top_links_incremental(self):
+        from attmon import query
+        self.check_top(1498867200 + 50 * INTERVAL)
+        summary = query.Summary(self.store)
+        num = summary.num
+
+        # Only the last bucket is summarized again, and new ones appended.
+        self.append(300, 500)
+        self.store.refresh()
+        self.assertTrue(query.Summary(self.store).covered == len(self.store))
+        self.assertGreater(query.Summary(self.store).num, num)
+        self.check_top(1498867200 + 50 * INTERVAL)
+        self.check_top(None, 1498867200 + 420 * INTERVAL)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,73 @@
+#!/usr/bin/env python
+# -*- mode: python; coding: utf-8; fill-column: 80; -*-
+#
+# test_server.py
+# Copyright (c) 2026 The attmon contributors.
+#
+
+"""
+test_server.py
+Tests of the server of the most recent snapshots (see `attmon.server`).
+"""
+
+__author__  = 'The attmon contributors'
+__version__ = '1.0'
+__license__ = 'MIT'
+
+
+import asyncio
+import os
+import sys
+import unittest
+
+TEST_DIR = os.path.dirname(os.path.abspath(__file__))
+BASE_DIR = os.path.dirname(TEST_DIR)
+sys.path.insert(0, BASE_DIR)
+
+from attmon import server
+from attmon import utils
+
+
+CITY_FILE = os.path.join(BASE_DIR, 'data', 'city-code-abbrev-name.txt')
+
+
+class TestServer(unittest.TestCase):
+
+    def setUp(self):
+        self.srv = server.Server({}, utils.load_city_data(CITY_FILE))
+
+    def request(self, req):
+        """Send the raw request, and return the status line of the response.
+        """
+        async def send():
+            listener = await asyncio.start_server(self.srv.handle,
+                                                  '127.0.0.1', 0)
+            port = listener.sockets[0].getsockname()[1]
+            try:
+                reader, writer = await asyncio.open_connection('127.0.0.1',
+                                                               port)
+                writer.write(req)
+                await writer.drain()
+                resp = await reader.read()
+                writer.close()
+                return resp.split(b'\r\n', 1)[0]
+            finally:
+                listener.close()
+                await listener.wait_closed()
+        return asyncio.run(send())
+
+    def test_status(self):
+        self.assertEqual(self.request(b'GET /status HTTP/1.1\r\n' +
+                                      b'Connection: close\r\n\r\n'),
+                         b'HTTP/1.1 200 OK')
+
+    def test_long_request_line(self):
+        # Longer than the limit of the server, and than that of the stream.
+        for size in (server.MAX_LINE, 1 << 17):
+            self.assertEqual(self.request(b'GET /' + b'a' * size +
+                                          b' HTTP/1.1\r\n\r\n'),
+                             b'HTTP/1.1 414 URI Too Long')
+
+
+if __name__ == '__main__':
+    unittest.main()
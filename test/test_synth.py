@@ -0,0 +1,91 @@
+#!/usr/bin/env python
+# -*- mode: python; coding: utf-8; fill-column: 80; -*-
+#
+# test_synth.py
+# Copyright (c) 2026 The attmon contributors.
+#
+
+"""
+test_synth.py
+Tests of the synthetic snapshots (see `attmon.synth`): the matrices generated,
+for more cities than in AT&T's network, are those parsed from the snapshots.
+"""
+
+__author__  = 'The attmon contributors'
+__version__ = '1.0'
+__license__ = 'MIT'
+
+
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+
+TEST_DIR = os.path.dirname(os.path.abspath(__file__))
+BASE_DIR = os.path.dirname(TEST_DIR)
+sys.path.insert(0, BASE_DIR)
+
+from attmon import synth
+from attmon import tables
+from attmon import utils
+
+
+# Number of cities; abbreviations go past `Aaz`.
+NUM_CITIES = 60
+BEG_TS = 1498867200
+INTERVAL = 900
+
+
+class TestSynth(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp(prefix='attmon-test-')
+        self.cities = synth.gen_cities(NUM_CITIES)
+        city_file = os.path.join(self.tmp_dir, 'city-data.txt')
+        synth.write_city_data(self.cities, city_file)
+        self.city_data = utils.load_city_data(city_file)
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp_dir, ignore_errors=True)
+
+    def expected(self, rows, table):
+        """Matrix of the (lower-left triangle) rows of values, as parsed.
+        """
+        no_val = table.conv(table.no_val)
+        matrix = {}
+        for src, row in list(zip(self.cities, rows))[1:]:
+            matrix[src.code] = {dst.code: no_val if v is None else
+                                table.conv(v)
+                                for dst, v in zip(self.cities, row)}
+        return matrix
+
+    def test_round_trip(self):
+        net = synth.Network(self.cities)
+        for table in (tables.DELAY, tables.LOSS):
+            with self.subTest(metric=table.name):
+                rows = net.matrix(table.name)
+                page = synth.render(self.cities, rows, table.name, BEG_TS)
+                m, _stats = tables.parse(page, self.city_data, table)
+                self.assertEqual(len(m), NUM_CITIES - 1)
+                self.assertEqual(m, self.expected(rows, table))
+
+    def test_snapshots(self):
+        # Snapshots are named after their time stamps, in UTC.
+        net = synth.Network(self.cities)
+        metrics = [t.name for t in (tables.DELAY, tables.LOSS)]
+        self.assertEqual(synth.gen_snapshots(net, self.tmp_dir, metrics,
+                                             BEG_TS, 3, INTERVAL), 6)
+        for metric in metrics:
+            snaps = utils.list_snapshots(self.tmp_dir, metric)
+            self.assertEqual([tstamp for _f, _ts_dt, tstamp in snaps],
+                             [BEG_TS + i * INTERVAL for i in range(3)])
+            for fpath, _ts_dt, _tstamp in snaps:
+                m, _stats = tables.parse(utils.load_content(fpath),
+                                         self.city_data,
+                                         tables.TABLES[metric])
+                self.assertEqual(len(m), NUM_CITIES - 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,97 @@
+#!/usr/bin/env python
+# -*- mode: python; coding: utf-8; fill-column: 80; -*-
+#
+# test_utils.py
+# Copyright (c) 2026 The attmon contributors.
+#
+
+"""
+test_utils.py
+Tests of the utilities (see `attmon.utils`).
+"""
+
+__author__  = 'The attmon contributors'
+__version__ = '1.0'
+__license__ = 'MIT'
+
+
+import datetime
+import os
+import shutil
+import sys
+import tempfile
+import time
+import unittest
+
+TEST_DIR = os.path.dirname(os.path.abspath(__file__))
+BASE_DIR = os.path.dirname(TEST_DIR)
+sys.path.insert(0, BASE_DIR)
+
+from attmon import archive
+from attmon import utils
+
+
+DELAY_FILE = os.path.join(TEST_DIR, 'att-network-delay--0217-06232017.html')
+
+
+class TestLoadContent(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp(prefix='attmon-test-')
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp_dir, ignore_errors=True)
+
+    def test_archive(self):
+        page = utils.load_content(DELAY_FILE)
+        name = os.path.basename(DELAY_FILE)
+        ar_path = os.path.join(self.tmp_dir, 'snapshots.ar')
+        ar = archive.Archive(ar_path)
+        ar.add(name, page)
+        ar.close()
+        self.assertEqual(utils.load_content(os.path.join(ar_path, name)), page)
+
+    def test_missing_file(self):
+        # The missing file, and not its directory, is reported.
+        fpath = os.path.join(self.tmp_dir,
+                             'att-network-delay--0000-01012017.html')
+        with self.assertRaises(FileNotFoundError) as ctx:
+            utils.load_content(fpath)
+        self.assertEqual(ctx.exception.filename, fpath)
+
+
+class TestEpoch(unittest.TestCase):
+
+    def setUp(self):
+        self.tz = os.environ.get('TZ')
+
+    def tearDown(self):
+        if self.tz is None:
+            os.environ.pop('TZ', None)
+        else:
+            os.environ['TZ'] = self.tz
+        time.tzset()
+
+    def test_to_epoch(self):
+        # Time stamps in the names of snapshot files are in UTC, whatever the
+        #  local time zone (see `ext/fetch-*.sh`).
+        utc = datetime.datetime(2017, 6, 23, 2, 17,
+                                tzinfo=datetime.timezone.utc)
+        expected = int(utc.timestamp())
+        for tz in ('UTC', 'America/Los_Angeles', 'Asia/Kolkata'):
+            with self.subTest(tz=tz):
+                os.environ['TZ'] = tz
+                time.tzset()
+                self.assertEqual(utils.to_epoch(('06', '23', '2017',
+                                                 '02', '17')), expected)
+                self.assertEqual(utils.to_epoch((6, 23, 2017, 2, 17)),
+                                 expected)
+                self.assertEqual(utils.snapshot_info(DELAY_FILE),
+                                 ('delay', '0217-06232017', expected))
+                self.assertEqual(utils.parse_time('2017-06-23T02:17'),
+                                 expected)
+                self.assertEqual(utils.parse_time(str(expected)), expected)
+
+
+if __name__ == '__main__':
+    unittest.main()
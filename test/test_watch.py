@@ -0,0 +1,130 @@
+#!/usr/bin/env python
+# -*- mode: python; coding: utf-8; fill-column: 80; -*-
+#
+# test_watch.py
+# Copyright (c) 2026 The attmon contributors.
+#
+
+"""
+test_watch.py
+Tests of the ingestion of new snapshots (see `attmon.watch`): snapshots written
+while not running are ingested on restart, and snapshots ingested before a
+crash are not counted twice.
+"""
+
+__author__  = 'The attmon contributors'
+__version__ = '1.0'
+__license__ = 'MIT'
+
+
+import io
+import os
+import shutil
+import sys
+import tempfile
+import threading
+import time
+import unittest
+
+TEST_DIR = os.path.dirname(os.path.abspath(__file__))
+BASE_DIR = os.path.dirname(TEST_DIR)
+sys.path.insert(0, BASE_DIR)
+
+from attmon import ingest
+from attmon import linkstats
+from attmon import synth
+from attmon import tables
+from attmon import utils
+from attmon import watch
+
+
+METRIC = 'delay'
+BEG_TS = 1498867200
+INTERVAL = 900
+
+
+class TestFollower(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp(prefix='attmon-test-')
+        self.in_path = os.path.join(self.tmp_dir, 'snapshots')
+        os.makedirs(self.in_path)
+        self.links_file = os.path.join(self.tmp_dir, METRIC + '.links')
+        self.state_file = os.path.join(self.tmp_dir, 'state.json')
+
+        cities = synth.gen_cities(6)
+        city_file = os.path.join(self.tmp_dir, 'city-data.txt')
+        synth.write_city_data(cities, city_file)
+        self.city_data = utils.load_city_data(city_file)
+        self.net = synth.Network(cities)
+        self.num_snaps = 0
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp_dir, ignore_errors=True)
+
+    def write(self, num):
+        synth.gen_snapshots(self.net, self.in_path, [METRIC],
+                            BEG_TS + self.num_snaps * INTERVAL, num, INTERVAL)
+        self.num_snaps += num
+
+    def follower(self):
+        state = watch.load_state(self.state_file)
+        ing = watch.Ingester(METRIC, self.city_data, None, None,
+                             self.links_file, state.get(METRIC))
+        return watch.Follower({METRIC: self.in_path}, {METRIC: ing},
+                              self.state_file, 0.01, True, io.StringIO())
+
+    def expected(self):
+        """Statistics of links of all snapshots written, each counted once.
+        """
+        no_val = tables.missing_val(tables.TABLES[METRIC])
+        links = linkstats.new_links()
+        snaps = utils.list_snapshots(self.in_path, METRIC,
+                                     os.listdir(self.in_path))
+        for snap in ingest.ingest(snaps, METRIC, self.city_data):
+            for src in snap.matrix:
+                for dst, v in snap.matrix[src].items():
+                    if v != no_val:
+                        links[(src, dst)].add(v)
+        return {k: ls.to_dict() for k, ls in links.items()}
+
+    def saved(self):
+        links, meta = linkstats.read(self.links_file)
+        return {k: ls.to_dict() for k, ls in links.items()}, meta['last_ts']
+
+    def test_catch_up_and_restart(self):
+        last_ts = lambda: BEG_TS + (self.num_snaps - 1) * INTERVAL
+
+        # Snapshots written before the start are ingested first.
+        self.write(3)
+        self.follower().run(count=0)
+        self.assertEqual(self.saved(), (self.expected(), last_ts()))
+        self.assertEqual(watch.load_state(self.state_file), {METRIC: last_ts()})
+
+        # A snapshot written while running is reported by the watcher.
+        follower = self.follower()
+        th = threading.Thread(target=follower.run, args=(1,), daemon=True)
+        th.start()
+        while th.is_alive() and 'watching' not in follower.log.getvalue():
+            time.sleep(0.01)
+        self.write(1)
+        th.join(10)
+        self.assertFalse(th.is_alive())
+        self.assertEqual(self.saved(), (self.expected(), last_ts()))
+
+        # Crash after the statistics were saved, but not the state: the
+        #  snapshot is parsed again on restart, but not counted twice.
+        with io.open(self.state_file, 'rb') as f:
+            state = f.read()
+        self.write(1)
+        self.follower().run(count=0)
+        with io.open(self.state_file, 'wb') as f:
+            f.write(state)
+        self.write(2)
+        self.follower().run(count=0)
+        self.assertEqual(self.saved(), (self.expected(), last_ts()))
+        self.assertEqual(watch.load_state(self.state_file), {METRIC: last_ts()})
+
+
+if __name__ == '__main__':
+    unittest.main()